@@ -1,11 +1,25 @@
+import instrumentacao
+
 class Node:
-    def __init__(self, key):
+    __slots__ = ("key", "value", "left", "right", "height", "size")
+
+    def __init__(self, key, value=None):
         self.key = key
+        self.value = value # Usado por SortedMap; AVLTree guarda só as chaves
         self.left = None
         self.right = None
         self.height = 1 # Inicialmente, o nó tem altura 1
+        self.size = 1 # Número de nós da subárvore (estatísticas de ordem)
 
 class AVLTree:
+    # Implementação iterativa: inserção, remoção e busca descem com um laço e
+    # guardam o caminho (pilha explícita) para o rebalanceamento, sem recursão
+    # em Python. O retrace sobe pelo caminho e para assim que a altura de uma
+    # subárvore deixa de mudar (os ancestrais não são afetados).
+    # Cada nó guarda o tamanho da sua subárvore: os tamanhos do caminho são
+    # ajustados antes do retrace e as rotações os recalculam, o que dá rank,
+    # select e contagem de intervalos em O(log n).
+
     def __init__(self):
         self.root = None
     
@@ -28,11 +42,14 @@ class AVLTree:
         node.height = 1 + max(self._get_height(node.left), 
                               self._get_height(node.right))
         
-    # --- Rotações para Balanceamento ---
     # --- Rotações ---
+    # Alturas calculadas em linha: estas funções estão no caminho crítico
     
     def _rotate_left(self, z):
         """Rotação Simples à Esquerda (Left-Left)"""
+        c = instrumentacao.ativo
+        if c is not None:
+            c["rotacoes"] += 1
         y = z.right
         T2 = y.left
         
@@ -41,13 +58,21 @@ class AVLTree:
         z.right = T2
         
         # Atualiza as alturas (a ordem é importante: z antes de y)
-        self._update_height(z)
-        self._update_height(y)
+        hl = z.left.height if z.left is not None else 0
+        hr = T2.height if T2 is not None else 0
+        z.height = 1 + (hl if hl > hr else hr)
+        hr = y.right.height if y.right is not None else 0
+        y.height = 1 + (z.height if z.height > hr else hr)
+        y.size = z.size # A subárvore tem os mesmos nós
+        z.size = 1 + (z.left.size if z.left is not None else 0) + (T2.size if T2 is not None else 0)
         
         return y # Retorna a nova raiz da subárvore
 
     def _rotate_right(self, y):
         """Rotação Simples à Direita (Right-Right)"""
+        c = instrumentacao.ativo
+        if c is not None:
+            c["rotacoes"] += 1
         x = y.left
         T2 = x.right
         
@@ -56,62 +81,111 @@ class AVLTree:
         y.left = T2
         
         # Atualiza as alturas (a ordem é importante: y antes de x)
-        self._update_height(y)
-        self._update_height(x)
+        hl = T2.height if T2 is not None else 0
+        hr = y.right.height if y.right is not None else 0
+        y.height = 1 + (hl if hl > hr else hr)
+        hl = x.left.height if x.left is not None else 0
+        x.height = 1 + (hl if hl > y.height else y.height)
+        x.size = y.size # A subárvore tem os mesmos nós
+        y.size = 1 + (T2.size if T2 is not None else 0) + (y.right.size if y.right is not None else 0)
         
         return x # Retorna a nova raiz da subárvore
     
     # --- Balanceamento Geral ---
     
-    def _balance_tree(self, root, key):
+    def _balance_tree(self, root, balance):
         """
-        Verifica o Fator de Balanceamento (Fb) e executa as rotações 
-        (simples ou duplas) necessárias.
+        Executa as rotações (simples ou duplas) para um nó com Fb = balance
+        fora de [-1, 1]. O caso é decidido pelo Fb do filho mais alto, o que
+        vale tanto para a inserção quanto para a remoção.
         """
-        self._update_height(root)
-        balance = self._get_balance(root)
+        if balance > 1:
+            left = root.left
+            hl = left.left.height if left.left is not None else 0
+            hr = left.right.height if left.right is not None else 0
+            if hl < hr: # Caso Left-Right: Rotação Simples à Esquerda no filho
+                root.left = self._rotate_left(left)
+            return self._rotate_right(root) # Caso Left-Left (ou segunda rotação do Left-Right)
 
-        # 1. Caso Left-Left (Fb > 1 e a chave inserida está na subárvore esquerda do filho esquerdo)
-        if balance > 1 and key < root.left.key:
-            return self._rotate_right(root)
+        right = root.right
+        hl = right.left.height if right.left is not None else 0
+        hr = right.right.height if right.right is not None else 0
+        if hl > hr: # Caso Right-Left: Rotação Simples à Direita no filho
+            root.right = self._rotate_right(right)
+        return self._rotate_left(root) # Caso Right-Right (ou segunda rotação do Right-Left)
 
-        # 2. Caso Right-Right (Fb < -1 e a chave inserida está na subárvore direita do filho direito)
-        if balance < -1 and key > root.right.key:
-            return self._rotate_left(root)
+    def _retrace(self, path, insertion):
+        """Sobe pelo caminho (do nó mais profundo à raiz) atualizando alturas e rebalanceando.
 
-        # 3. Caso Left-Right (Fb > 1 e a chave inserida está na subárvore direita do filho esquerdo)
-        if balance > 1 and key > root.left.key:
-            root.left = self._rotate_left(root.left) # Rotação Simples à Esquerda no filho
-            return self._rotate_right(root)          # Rotação Simples à Direita na raiz
+        Para cedo quando a altura de uma subárvore não muda. Na inserção, uma
+        rotação sempre devolve a subárvore à altura anterior, então também para.
+        Retorna a (possivelmente nova) raiz do caminho, path[0].
+        """
+        for i in range(len(path) - 1, -1, -1):
+            node = path[i]
+            hl = node.left.height if node.left is not None else 0
+            hr = node.right.height if node.right is not None else 0
+            old_height = node.height
+            balance = hl - hr
+            if -1 <= balance <= 1:
+                node.height = 1 + (hl if hl > hr else hr)
+                if node.height == old_height:
+                    return path[0]
+                continue
 
-        # 4. Caso Right-Left (Fb < -1 e a chave inserida está na subárvore esquerda do filho direito)
-        if balance < -1 and key < root.right.key:
-            root.right = self._rotate_right(root.right) # Rotação Simples à Direita no filho
-            return self._rotate_left(root)              # Rotação Simples à Esquerda na raiz
+            subtree = self._balance_tree(node, balance)
+            if i == 0:
+                return subtree
+            if path[i - 1].left is node:
+                path[i - 1].left = subtree
+            else:
+                path[i - 1].right = subtree
+            if insertion or subtree.height == old_height:
+                return path[0]
+        return path[0]
+
+    def _registrar_caminho(self, path):
+        c = instrumentacao.ativo
+        if c is not None:
+            c["nos_visitados"] += len(path)
+            instrumentacao.registrar_maximo(c, "profundidade_max", len(path))
 
-        return root
-    
     # --- Inserção com Balanceamento ---
     def insert(self, key):
         """Insere um nó e garante que a AVL permaneça balanceada."""
-        self.root = self._insert_node(self.root, key)
-        
-    def _insert_node(self, root, key):
-        # 1. Caso base: Inserção de uma BST normal
-        if not root:
-            return Node(key)
-        
-        if key < root.key:
-            root.left = self._insert_node(root.left, key)
-        elif key > root.key:
-            root.right = self._insert_node(root.right, key)
-        else:
-            # Chaves duplicadas não são permitidas em uma BST padrão (ou AVL)
-            return root
-        
+        self._insert_key(key)
+
+    def _insert_key(self, key):
+        """Insere `key` (se ainda não existir) e retorna o nó que a contém."""
+        node = self.root
+        if node is None:
+            self.root = Node(key)
+            return self.root
+
+        # 1. Descida iterativa (BST), guardando o caminho
+        path = []
+        while True:
+            path.append(node)
+            if key < node.key:
+                if node.left is None:
+                    new = node.left = Node(key)
+                    break
+                node = node.left
+            elif key > node.key:
+                if node.right is None:
+                    new = node.right = Node(key)
+                    break
+                node = node.right
+            else:
+                # Chaves duplicadas não são permitidas em uma BST padrão (ou AVL)
+                return node
+
         # 2. Balanceamento
-        return self._balance_tree(root, key)
-    
+        for ancestor in path:
+            ancestor.size += 1
+        self._registrar_caminho(path)
+        self.root = self._retrace(path, True)
+        return new
 
     # --- Busca ---
     def search(self, key):
@@ -119,14 +193,18 @@ class AVLTree:
         return self._search_node(self.root, key)
 
     def _search_node(self, root, key):
-        if root is None or root.key == key:
-            return root # Retorna o nó (ou None se não encontrado)
-        
-        if key < root.key:
-            return self._search_node(root.left, key)
-        else:
-            return self._search_node(root.right, key)
-        
+        node = root
+        while node is not None:
+            if key < node.key:
+                node = node.left
+            elif key > node.key:
+                node = node.right
+            else:
+                return node
+        return None # Não encontrado
+
+    def __contains__(self, key):
+        return self._search_node(self.root, key) is not None
 
     # --- Remoção com Balanceamento ---
     def get_min_value_node(self, node):
@@ -138,75 +216,407 @@ class AVLTree:
 
     def delete(self, key):
         """Remove um nó e garante que a AVL permaneça balanceada."""
-        self.root = self._delete_node(self.root, key)
+        # 1. Encontra o nó, guardando o caminho até ele
+        path = []
+        node = self.root
+        while node is not None:
+            if key < node.key:
+                path.append(node)
+                node = node.left
+            elif key > node.key:
+                path.append(node)
+                node = node.right
+            else:
+                break
+        if node is None:
+            return # Chave não existe
 
-    def _delete_node(self, root, key):
-        # 1. BST Delete: Encontra e remove o nó
-        if not root:
-            return root
-        
-        if key < root.key:
-            root.left = self._delete_node(root.left, key)
-        elif key > root.key:
-            root.right = self._delete_node(root.right, key)
-        else: # O nó com a chave correspondente foi encontrado
-            
-            # Caso 1 ou 2: Nó com 0 ou 1 filho
-            if root.left is None:
-                temp = root.right
-                root = None
-                return temp
-            elif root.right is None:
-                temp = root.left
-                root = None
-                return temp
-                
-            # Caso 3: Nó com 2 filhos
-            temp = self.get_min_value_node(root.right) # Encontra o sucessor in-order (menor na subárvore direita)
-            root.key = temp.key # Copia a chave do sucessor para este nó
-            
-            # Deleta o sucessor in-order
-            root.right = self._delete_node(root.right, temp.key)
-
-        if root is None:
-            return root
-        
-        # 2. Balanceamento após a remoção (mesma lógica usada na inserção)
-        self._update_height(root)
-        balance = self._get_balance(root)
+        # Caso 3: Nó com 2 filhos -> copia o sucessor in-order e remove o sucessor
+        if node.left is not None and node.right is not None:
+            path.append(node)
+            successor = node.right
+            while successor.left is not None:
+                path.append(successor)
+                successor = successor.left
+            node.key = successor.key
+            node.value = successor.value
+            node = successor
 
-        # Rebalanceamento: é um pouco diferente da inserção, pois o desbalanceamento
-        # pode ocorrer após a remoção de *qualquer* subárvore.
+        # Caso 1 ou 2: Nó com 0 ou 1 filho
+        child = node.left if node.left is not None else node.right
+        if not path:
+            self.root = child
+            return
+        if path[-1].left is node:
+            path[-1].left = child
+        else:
+            path[-1].right = child
 
-        # Left-Left Case
-        if balance > 1 and self._get_balance(root.left) >= 0:
-            return self._rotate_right(root)
+        # 2. Balanceamento após a remoção
+        for ancestor in path:
+            ancestor.size -= 1
+        self._registrar_caminho(path)
+        self.root = self._retrace(path, False)
 
-        # Left-Right Case
-        if balance > 1 and self._get_balance(root.left) < 0:
-            root.left = self._rotate_left(root.left)
-            return self._rotate_right(root)
+    def __iter__(self):
+        """Itera sobre as chaves em ordem (inorder), com pilha explícita."""
+        stack = []
+        node = self.root
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node.key
+            node = node.right
+    
+    # --- Construção em Lote, Junção e Divisão ---
+    # join/split trabalham sobre nós e reaproveitam os nós existentes: as
+    # árvores passadas como argumento são consumidas (ficam vazias).
 
-        # Right-Right Case
-        if balance < -1 and self._get_balance(root.right) <= 0:
-            return self._rotate_left(root)
+    @classmethod
+    def from_sorted(cls, keys):
+        """Constrói uma árvore perfeitamente balanceada a partir de chaves ordenadas, em O(n).
 
-        # Right-Left Case
-        if balance < -1 and self._get_balance(root.right) > 0:
-            root.right = self._rotate_right(root.right)
-            return self._rotate_left(root)
+        Chaves repetidas (adjacentes) são ignoradas; levanta ValueError se a
+        sequência não estiver em ordem crescente.
+        """
+        unique = []
+        for key in keys:
+            if unique and not unique[-1] < key:
+                if key < unique[-1]:
+                    raise ValueError("from_sorted exige chaves em ordem crescente.")
+                continue # Duplicada
+            unique.append(key)
+        tree = cls()
+        tree.root = tree._build_balanced(unique, 0, len(unique))
+        return tree
+
+    def _build_balanced(self, keys, lo, hi, values=None):
+        """Subárvore com keys[lo:hi] (e values[lo:hi]), raiz no meio (recursão de profundidade log2 n)."""
+        if lo >= hi:
+            return None
+        mid = (lo + hi) // 2
+        node = Node(keys[mid], None if values is None else values[mid])
+        node.left = self._build_balanced(keys, lo, mid, values)
+        node.right = self._build_balanced(keys, mid + 1, hi, values)
+        node.height = (hi - lo).bit_length() # Altura de uma árvore dividida ao meio com hi - lo nós
+        node.size = hi - lo
+        return node
+
+    def _join_nodes(self, left, middle, right):
+        """Junta as subárvores left < middle.key < right e retorna a raiz, em O(|h(left) - h(right)| + 1)."""
+        hl = left.height if left is not None else 0
+        hr = right.height if right is not None else 0
+        if hl > hr + 1:
+            # Desce pela espinha direita de left até uma subárvore com altura <= hr + 1
+            path = []
+            node = left
+            while node is not None and node.height > hr + 1:
+                path.append(node)
+                node = node.right
+            path[-1].right = self._join_nodes(node, middle, right)
+            added = 1 + (right.size if right is not None else 0)
+            for ancestor in path:
+                ancestor.size += added
+            return self._retrace(path, False)
+        if hr > hl + 1:
+            path = []
+            node = right
+            while node is not None and node.height > hl + 1:
+                path.append(node)
+                node = node.left
+            path[-1].left = self._join_nodes(left, middle, node)
+            added = 1 + (left.size if left is not None else 0)
+            for ancestor in path:
+                ancestor.size += added
+            return self._retrace(path, False)
+        # Alturas compatíveis: middle vira a raiz
+        middle.left = left
+        middle.right = right
+        middle.height = 1 + (hl if hl > hr else hr)
+        middle.size = 1 + (left.size if left is not None else 0) + (right.size if right is not None else 0)
+        return middle
+
+    def _join2_nodes(self, left, right):
+        """Junta left < right sem chave do meio: usa o maior nó de left como meio."""
+        if left is None:
+            return right
+        if right is None:
+            return left
+        path = []
+        node = left
+        while node.right is not None:
+            path.append(node)
+            node = node.right
+        if path:
+            path[-1].right = node.left
+            for ancestor in path:
+                ancestor.size -= 1
+            left = self._retrace(path, False)
+        else:
+            left = node.left
+        return self._join_nodes(left, node, right)
+
+    def _split_nodes(self, root, key):
+        """Divide em (nós < key, nó com key ou None, nós > key), em O(log n)."""
+        path = []
+        node = root
+        while node is not None:
+            if key < node.key:
+                path.append(node)
+                node = node.left
+            elif key > node.key:
+                path.append(node)
+                node = node.right
+            else:
+                break
+        if node is None:
+            left = right = None
+        else:
+            left, right = node.left, node.right
+        # Sobe pelo caminho juntando cada ancestral ao lado correspondente
+        for ancestor in reversed(path):
+            if key < ancestor.key:
+                right = self._join_nodes(right, ancestor, ancestor.right)
+            else:
+                left = self._join_nodes(ancestor.left, ancestor, left)
+        return left, node, right
+
+    def join(self, key, other):
+        """Concatena esta árvore, a chave `key` e `other`, em O(log n).
+
+        Exige todas as chaves desta árvore < key < todas as chaves de `other`;
+        `other` é consumida (fica vazia).
+        """
+        if (self.root is not None and not self.get_max_value_node(self.root).key < key) or \
+                (other.root is not None and not key < self.get_min_value_node(other.root).key):
+            raise ValueError("join exige chaves desta árvore < key < chaves de other.")
+        self.root = self._join_nodes(self.root, Node(key), other.root)
+        other.root = None
+
+    def _empty_like(self):
+        """Árvore vazia do mesmo tipo (e configuração) desta."""
+        return type(self)()
+
+    def split(self, key):
+        """Divide a árvore em (menores, contém_key, maiores), em O(log n).
+
+        Retorna duas novas AVLTree e um bool; esta árvore é consumida (fica vazia).
+        """
+        left, node, right = self._split_nodes(self.root, key)
+        self.root = None
+        smaller, larger = self._empty_like(), self._empty_like()
+        smaller.root, larger.root = left, right
+        return smaller, node is not None, larger
+
+    def insert_many(self, keys):
+        """Insere um lote de chaves, ordenando-o antes.
+
+        Em uma árvore vazia constrói em O(m) com from_sorted. Senão insere em
+        ordem: descidas consecutivas passam pelos mesmos nós (mais baratas que
+        em ordem aleatória) e, em CPython, isso é mais rápido que a união por
+        join/split (`python benchmark_arvores.py lote`).
+        """
+        batch = sorted(keys)
+        if self.root is None:
+            self.root = type(self).from_sorted(batch).root
+            return
+        for key in batch:
+            self.insert(key)
+
+    # --- Operações de Conjunto (sobre join/split) ---
+    # O(m log(n/m + 1)) para árvores de tamanhos m <= n. Recursão de
+    # profundidade O(log n) (altura das árvores). O resultado fica nesta
+    # árvore; `other` é consumida (fica vazia).
+
+    def union(self, other):
+        """Esta árvore passa a conter as chaves das duas."""
+        self.root = self._union_nodes(self.root, other.root)
+        other.root = None
+
+    def intersection(self, other):
+        """Esta árvore passa a conter só as chaves presentes nas duas."""
+        self.root = self._intersection_nodes(self.root, other.root)
+        other.root = None
+
+    def difference(self, other):
+        """Remove desta árvore as chaves presentes em `other`."""
+        self.root = self._difference_nodes(self.root, other.root)
+        other.root = None
+
+    def _union_nodes(self, t1, t2):
+        if t1 is None:
+            return t2
+        if t2 is None:
+            return t1
+        left1, right1 = t1.left, t1.right
+        left2, _, right2 = self._split_nodes(t2, t1.key)
+        return self._join_nodes(self._union_nodes(left1, left2), t1, self._union_nodes(right1, right2))
+
+    def _intersection_nodes(self, t1, t2):
+        if t1 is None or t2 is None:
+            return None
+        left1, right1 = t1.left, t1.right
+        left2, found, right2 = self._split_nodes(t2, t1.key)
+        left = self._intersection_nodes(left1, left2)
+        right = self._intersection_nodes(right1, right2)
+        if found is not None:
+            return self._join_nodes(left, t1, right)
+        return self._join2_nodes(left, right)
+
+    def _difference_nodes(self, t1, t2):
+        if t1 is None or t2 is None:
+            return t1
+        left2, right2 = t2.left, t2.right
+        left1, _, right1 = self._split_nodes(t1, t2.key)
+        return self._join2_nodes(self._difference_nodes(left1, left2), self._difference_nodes(right1, right2))
+
+    def get_max_value_node(self, node):
+        """Nó com o maior valor na subárvore."""
+        current = node
+        while current.right is not None:
+            current = current.right
+        return current
+
+    # --- Estatísticas de Ordem e Consultas de Intervalo ---
+
+    def __len__(self):
+        return self.root.size if self.root is not None else 0
+
+    def rank(self, key):
+        """Número de chaves menores que `key` (posição em que key está ou entraria), O(log n)."""
+        return self._count_below(key, False)
+
+    def _count_below(self, key, inclusive):
+        """Chaves < key (ou <= key, se inclusive)."""
+        count = 0
+        node = self.root
+        while node is not None:
+            if key < node.key or (not inclusive and not node.key < key):
+                node = node.left
+            else:
+                count += 1 + (node.left.size if node.left is not None else 0)
+                node = node.right
+        return count
+
+    def select(self, i):
+        """A i-ésima menor chave (a partir de 0; aceita índices negativos), O(log n)."""
+        n = len(self)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError("índice fora do intervalo da árvore")
+        node = self.root
+        while True:
+            left_size = node.left.size if node.left is not None else 0
+            if i < left_size:
+                node = node.left
+            elif i == left_size:
+                return node.key
+            else:
+                i -= left_size + 1
+                node = node.right
+
+    def count_range(self, lo, hi):
+        """Quantidade de chaves em [lo, hi] (intervalo fechado), O(log n)."""
+        if hi < lo:
+            return 0
+        return self._count_below(hi, True) - self._count_below(lo, False)
+
+    def floor(self, key):
+        """Maior chave <= key, ou None."""
+        best = None
+        node = self.root
+        while node is not None:
+            if key < node.key:
+                node = node.left
+            else:
+                best = node.key
+                if not node.key < key:
+                    return best # Igual
+                node = node.right
+        return best
+
+    def ceiling(self, key):
+        """Menor chave >= key, ou None."""
+        best = None
+        node = self.root
+        while node is not None:
+            if node.key < key:
+                node = node.right
+            else:
+                best = node.key
+                if not key < node.key:
+                    return best # Igual
+                node = node.left
+        return best
+
+    def iter_range(self, lo=None, hi=None):
+        """Gera, em ordem e sob demanda, as chaves em [lo, hi] (None = sem limite).
+
+        O(log n) para achar a primeira chave e O(1) amortizado por chave
+        gerada; a pilha tem no máximo a altura da árvore.
+        """
+        for node in self._iter_nodes(lo, hi):
+            yield node.key
+
+    def _iter_nodes(self, lo=None, hi=None, reverse=False):
+        """Nós com chave em [lo, hi], em ordem crescente (ou decrescente, com reverse=True)."""
+        if reverse:
+            yield from self._iter_nodes_reverse(lo, hi)
+            return
+        stack = []
+        node = self.root
+        while node is not None: # Desce até a primeira chave >= lo
+            if lo is not None and node.key < lo:
+                node = node.right
+            else:
+                stack.append(node)
+                node = node.left
+        while stack:
+            node = stack.pop()
+            if hi is not None and hi < node.key:
+                return
+            yield node
+            node = node.right
+            while node is not None:
+                stack.append(node)
+                node = node.left
+
+    def _iter_nodes_reverse(self, lo, hi):
+        """Espelho de _iter_nodes: da maior chave <= hi até lo."""
+        stack = []
+        node = self.root
+        while node is not None: # Desce até a última chave <= hi
+            if hi is not None and hi < node.key:
+                node = node.left
+            else:
+                stack.append(node)
+                node = node.right
+        while stack:
+            node = stack.pop()
+            if lo is not None and node.key < lo:
+                return
+            yield node
+            node = node.left
+            while node is not None:
+                stack.append(node)
+                node = node.right
 
-        return root
-    
-    
     # --- Impressão da Árvore ---
     def inorder_traversal(self, root):
         """Imprime a árvore Inorder: Left -> Root -> Right."""
-        if root:
-            self.inorder_traversal(root.left)
-            fb = self._get_balance(root)
-            print(f"[{root.key}] (H:{root.height}, Fb:{fb})", end=" ")
-            self.inorder_traversal(root.right)
+        stack = []
+        node = root
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            fb = self._get_balance(node)
+            print(f"[{node.key}] (H:{node.height}, Fb:{fb})", end=" ")
+            node = node.right
 
     def print_tree(self):
         """Função para iniciar a impressão."""
@@ -215,6 +625,171 @@ class AVLTree:
         print("\n-------------------------------------------")
 
     # --- Validação da Propriedade AVL ---
+    def validate(self):
+        """Confere ordem das chaves, alturas e |Fb| <= 1 em todos os nós (AssertionError se violar)."""
+        previous = None
+        stack = []
+        node = self.root
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            if previous is not None and not previous < node.key:
+                raise AssertionError(f"Chaves fora de ordem: {previous!r} antes de {node.key!r}.")
+            previous = node.key
+            node = node.right
+        # Alturas e balanceamento, em pós-ordem (filhos antes dos pais)
+        order = []
+        stack = [self.root] if self.root is not None else []
+        while stack:
+            node = stack.pop()
+            order.append(node)
+            stack.extend(child for child in (node.left, node.right) if child is not None)
+        for node in reversed(order):
+            hl = self._get_height(node.left)
+            hr = self._get_height(node.right)
+            if node.height != 1 + max(hl, hr) or abs(hl - hr) > 1:
+                raise AssertionError(f"Nó {node.key!r} desbalanceado ou com altura errada.")
+            size = 1 + (node.left.size if node.left else 0) + (node.right.size if node.right else 0)
+            if node.size != size:
+                raise AssertionError(f"Nó {node.key!r} com tamanho de subárvore errado.")
+        return True
+
+# --- MAPA ORDENADO (chave -> valor) ---
+class SortedMap(AVLTree):
+    """Mapa ordenado sobre a AVL: m[k] = v, m[k], del m[k], get e keys/values/items em ordem.
+
+    Com multi=True cada chave guarda a lista dos seus valores na ordem de
+    inserção (m[k] = v acrescenta, m[k] retorna a lista). Com key=, add(valor)
+    e discard(valor) indexam cada valor por key(valor) — as funções de
+    `criterios` em ordenacao.py servem diretamente. Inserção e remoção em
+    O(log n), mais O(d) para achar um valor entre os d valores da mesma chave.
+
+    len(m) conta as chaves distintas; rank, select, count_range, floor,
+    ceiling e iter_range (herdados) também trabalham sobre as chaves.
+    """
+
+    def __init__(self, items=None, key=None, multi=False):
+        super().__init__()
+        self.key = key
+        self.multi = multi
+        if items is not None:
+            for k, value in (items.items() if hasattr(items, "items") else items):
+                self[k] = value
+
+    def _empty_like(self):
+        return type(self)(key=self.key, multi=self.multi)
+
+    @classmethod
+    def from_values(cls, values, key, multi=True):
+        """Índice de `values` por key(valor), em O(n log n): uma ordenação estável e montagem em O(n).
+
+        Mesma ordem de sorted(values, key=key); sem multi, vale o último valor de cada chave.
+        """
+        values = list(values)
+        keys = [key(v) for v in values]
+        unique, grouped = [], []
+        for i in sorted(range(len(values)), key=keys.__getitem__):
+            k = keys[i]
+            if unique and not unique[-1] < k: # Mesma chave da anterior
+                if multi:
+                    grouped[-1].append(values[i])
+                else:
+                    grouped[-1] = values[i]
+            else:
+                unique.append(k)
+                grouped.append([values[i]] if multi else values[i])
+        tree = cls(key=key, multi=multi)
+        tree.root = tree._build_balanced(unique, 0, len(unique), grouped)
+        return tree
+
+    # --- Acesso por Chave ---
+    def __setitem__(self, k, value):
+        """Associa `value` a `k` (com multi=True, acrescenta à lista da chave)."""
+        node = self._insert_key(k)
+        if not self.multi:
+            node.value = value
+        elif node.value is None:
+            node.value = [value]
+        else:
+            node.value.append(value)
+
+    def __getitem__(self, k):
+        node = self._search_node(self.root, k)
+        if node is None:
+            raise KeyError(k)
+        return list(node.value or ()) if self.multi else node.value
+
+    def __delitem__(self, k):
+        """Remove a chave `k` (e todos os seus valores); KeyError se não existir."""
+        if self._search_node(self.root, k) is None:
+            raise KeyError(k)
+        self.delete(k)
+
+    def get(self, k, default=None):
+        node = self._search_node(self.root, k)
+        if node is None:
+            return default
+        return list(node.value or ()) if self.multi else node.value
+
+    # --- Índice por key= ---
+    def _key_of(self, value):
+        if self.key is None:
+            raise TypeError("add/discard exigem um SortedMap criado com key=.")
+        return self.key(value)
+
+    def add(self, value):
+        """Indexa `value` pela chave key(value)."""
+        self[self._key_of(value)] = value
+
+    def discard(self, value):
+        """Remove `value` da chave key(value), se estiver lá; retorna True se removeu."""
+        k = self._key_of(value)
+        node = self._search_node(self.root, k)
+        if node is None:
+            return False
+        if self.multi:
+            values = node.value or []
+            for i, v in enumerate(values):
+                if v is value or v == value:
+                    del values[i]
+                    break
+            else:
+                return False
+            if values:
+                return True # A chave continua com outros valores
+        elif not (node.value is value or node.value == value):
+            return False
+        self.delete(k)
+        return True
+
+    # --- Iteração em Ordem ---
+    # Geradores preguiçosos sobre [lo, hi] (None = sem limite). Com
+    # reverse=True as chaves vêm em ordem decrescente, mas os valores de uma
+    # mesma chave continuam na ordem de inserção, como em sorted(..., reverse=True).
+
+    def keys(self, lo=None, hi=None, reverse=False):
+        for node in self._iter_nodes(lo, hi, reverse):
+            yield node.key
+
+    def values(self, lo=None, hi=None, reverse=False):
+        if self.multi:
+            for node in self._iter_nodes(lo, hi, reverse):
+                yield from node.value or ()
+        else:
+            for node in self._iter_nodes(lo, hi, reverse):
+                yield node.value
+
+    def items(self, lo=None, hi=None, reverse=False):
+        if self.multi:
+            for node in self._iter_nodes(lo, hi, reverse):
+                for value in node.value or ():
+                    yield node.key, value
+        else:
+            for node in self._iter_nodes(lo, hi, reverse):
+                yield node.key, node.value
+
     # --- Testes de Validação ---
 if __name__ == "__main__":
     avl = AVLTree()
@@ -250,4 +825,43 @@ if __name__ == "__main__":
         root_key = avl.root.key
         print(f"Removendo a raiz ({root_key})...")
         avl.delete(root_key)
-        avl.print_tree()
\ No newline at end of file
+        avl.print_tree()
+
+    # 4. Teste de Construção em Lote, Junção/Divisão e Conjuntos
+    print("\n--- Teste 4: from_sorted, insert_many, split/join e conjuntos ---")
+    pares = AVLTree.from_sorted(range(0, 40, 2))
+    pares.insert_many([5, 1, 37, 5])
+    print(f"from_sorted(0, 2, ..., 38) + insert_many([5, 1, 37, 5]): altura {pares.root.height}")
+    menores, achou, maiores = pares.split(20)
+    print(f"split(20): {len(list(menores))} menores, contém 20: {achou}, {len(list(maiores))} maiores")
+    menores.join(20, maiores)
+    multiplos_3 = AVLTree.from_sorted(range(0, 40, 3))
+    menores.intersection(multiplos_3)
+    print(f"Pares (com 1, 5, 37) ∩ múltiplos de 3: {list(menores)}")
+    assert list(menores) == [0, 6, 12, 18, 24, 30, 36] and menores.validate()
+    print("Teste 4: Sucesso.")
+
+    print("\n--- Teste 5: estatísticas de ordem e intervalos ---")
+    arvore = AVLTree.from_sorted(range(0, 100, 5))
+    print(f"len: {len(arvore)}, rank(42): {arvore.rank(42)}, select(3): {arvore.select(3)}, select(-1): {arvore.select(-1)}")
+    print(f"count_range(10, 30): {arvore.count_range(10, 30)}, floor(42): {arvore.floor(42)}, ceiling(42): {arvore.ceiling(42)}")
+    print(f"iter_range(22, 48): {list(arvore.iter_range(22, 48))}")
+    assert arvore.rank(42) == 9 and arvore.select(3) == 15 and arvore.count_range(10, 30) == 5
+    assert (arvore.floor(42), arvore.ceiling(42), arvore.floor(-1)) == (40, 45, None)
+    assert list(arvore.iter_range(22, 48)) == [25, 30, 35, 40, 45] and arvore.validate()
+    print("Teste 5: Sucesso.")
+
+    print("\n--- Teste 6: SortedMap (chave -> valor) e índice por key= ---")
+    precos = SortedMap({30: "c", 10: "a"})
+    precos[20] = "b"
+    precos[30] = "C"
+    del precos[10]
+    print(f"items: {list(precos.items())}, get(10): {precos.get(10)}, decrescente: {list(precos.keys(reverse=True))}")
+    assert list(precos.items()) == [(20, "b"), (30, "C")] and precos.get(10) is None
+    pedidos = [("Java", 3), ("Python", 2), ("React", 3), ("C", 1)]
+    indice = SortedMap.from_values(pedidos, key=lambda p: p[1])
+    indice.add(("Go", 2))
+    indice.discard(("Java", 3))
+    print(f"Índice por prioridade: {list(indice.values())}; [3]: {indice[3]}")
+    assert list(indice.values()) == [("C", 1), ("Python", 2), ("Go", 2), ("React", 3)] and indice.validate()
+    print("Teste 6: Sucesso.")
\ No newline at end of file
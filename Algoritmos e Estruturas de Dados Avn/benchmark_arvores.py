@@ -0,0 +1,423 @@
+import argparse
+import bisect
+import gc
+import itertools
+import random
+import sys
+import time
+
+from arvores import AVLTree, SortedMap
+from ordenacao import criterios, gerar_produtos, merge_sort
+
+# Benchmark da AVLTree iterativa (arvores.py) contra a versão recursiva
+# original, mantida aqui apenas como referência de desempenho.
+
+# --- REFERÊNCIA: AVL RECURSIVA (implementação anterior de arvores.py) ---
+class _NoRecursivo:
+    def __init__(self, key):
+        self.key = key
+        self.left = None
+        self.right = None
+        self.height = 1
+
+class AVLTreeRecursiva:
+    def __init__(self):
+        self.root = None
+
+    def _get_height(self, node):
+        if not node:
+            return 0
+        return node.height
+
+    def _get_balance(self, node):
+        if not node:
+            return 0
+        return self._get_height(node.left) - self._get_height(node.right)
+
+    def _update_height(self, node):
+        node.height = 1 + max(self._get_height(node.left), self._get_height(node.right))
+
+    def _rotate_left(self, z):
+        y = z.right
+        z.right = y.left
+        y.left = z
+        self._update_height(z)
+        self._update_height(y)
+        return y
+
+    def _rotate_right(self, y):
+        x = y.left
+        y.left = x.right
+        x.right = y
+        self._update_height(y)
+        self._update_height(x)
+        return x
+
+    def _balance_tree(self, root, key):
+        self._update_height(root)
+        balance = self._get_balance(root)
+        if balance > 1 and key < root.left.key:
+            return self._rotate_right(root)
+        if balance < -1 and key > root.right.key:
+            return self._rotate_left(root)
+        if balance > 1 and key > root.left.key:
+            root.left = self._rotate_left(root.left)
+            return self._rotate_right(root)
+        if balance < -1 and key < root.right.key:
+            root.right = self._rotate_right(root.right)
+            return self._rotate_left(root)
+        return root
+
+    def insert(self, key):
+        self.root = self._insert_node(self.root, key)
+
+    def _insert_node(self, root, key):
+        if not root:
+            return _NoRecursivo(key)
+        if key < root.key:
+            root.left = self._insert_node(root.left, key)
+        elif key > root.key:
+            root.right = self._insert_node(root.right, key)
+        else:
+            return root
+        return self._balance_tree(root, key)
+
+    def search(self, key):
+        return self._search_node(self.root, key)
+
+    def _search_node(self, root, key):
+        if root is None or root.key == key:
+            return root
+        if key < root.key:
+            return self._search_node(root.left, key)
+        return self._search_node(root.right, key)
+
+    def delete(self, key):
+        self.root = self._delete_node(self.root, key)
+
+    def _delete_node(self, root, key):
+        if not root:
+            return root
+        if key < root.key:
+            root.left = self._delete_node(root.left, key)
+        elif key > root.key:
+            root.right = self._delete_node(root.right, key)
+        else:
+            if root.left is None:
+                return root.right
+            if root.right is None:
+                return root.left
+            temp = root.right
+            while temp.left is not None:
+                temp = temp.left
+            root.key = temp.key
+            root.right = self._delete_node(root.right, temp.key)
+        self._update_height(root)
+        balance = self._get_balance(root)
+        if balance > 1 and self._get_balance(root.left) >= 0:
+            return self._rotate_right(root)
+        if balance > 1 and self._get_balance(root.left) < 0:
+            root.left = self._rotate_left(root.left)
+            return self._rotate_right(root)
+        if balance < -1 and self._get_balance(root.right) <= 0:
+            return self._rotate_left(root)
+        if balance < -1 and self._get_balance(root.right) > 0:
+            root.right = self._rotate_right(root.right)
+            return self._rotate_left(root)
+        return root
+
+# --- MEDIÇÃO ---
+def _ns_por_op(funcao, chaves):
+    inicio = time.perf_counter()
+    for k in chaves:
+        funcao(k)
+    return (time.perf_counter() - inicio) / len(chaves) * 1e9
+
+def medir_operacoes(classe, chaves, buscas, remocoes):
+    """ns/operação de inserção, busca e remoção; retorna (resultados, árvore final)."""
+    arvore = classe()
+    resultados = {
+        "insert": _ns_por_op(arvore.insert, chaves),
+        "search": _ns_por_op(arvore.search, buscas),
+        "delete": _ns_por_op(arvore.delete, remocoes),
+    }
+    return resultados, arvore
+
+def _chaves_em_ordem(arvore):
+    chaves = []
+    pilha, no = [], arvore.root
+    while pilha or no is not None:
+        while no is not None:
+            pilha.append(no)
+            no = no.left
+        no = pilha.pop()
+        chaves.append(no.key)
+        no = no.right
+    return chaves
+
+def executar_benchmark_avl(n, seed=None, recursiva=True):
+    """Compara a AVL iterativa com a recursiva em chaves aleatórias e ordenadas (ns/op)."""
+    rng = random.Random(seed)
+    cenarios = {
+        "aleatórias": rng.sample(range(10 * n), n),
+        "ordenadas": list(range(n)),
+    }
+    classes = [("Iterativa", AVLTree)]
+    if recursiva:
+        classes.append(("Recursiva", AVLTreeRecursiva))
+
+    print(f"\nAVL: {n} chaves (ns por operação)")
+    print("{:<12}{:<12}{:>12}{:>12}{:>12}".format("Chaves", "Versão", "insert", "search", "delete"))
+    print("-" * 60)
+    for nome_cenario, chaves in cenarios.items():
+        buscas = rng.sample(chaves, len(chaves))
+        remocoes = buscas[: n // 2]
+        esperado = sorted(set(chaves) - set(remocoes))
+        for nome, classe in classes:
+            resultados, arvore = medir_operacoes(classe, chaves, buscas, remocoes)
+            if _chaves_em_ordem(arvore) != esperado:
+                raise AssertionError(f"AVL {nome} divergiu do esperado ({nome_cenario}).")
+            print("{:<12}{:<12}{:>12.0f}{:>12.0f}{:>12.0f}".format(
+                nome_cenario, nome, resultados["insert"], resultados["search"], resultados["delete"]))
+
+    # Sem recursão em Python: a AVL iterativa funciona mesmo com um limite mínimo
+    limite = sys.getrecursionlimit()
+    sys.setrecursionlimit(50)
+    try:
+        arvore = AVLTree()
+        for k in range(min(n, 100000)):
+            arvore.insert(k)
+        for k in range(0, min(n, 100000), 2):
+            arvore.delete(k)
+    finally:
+        sys.setrecursionlimit(limite)
+    print(f"\nAVL iterativa com sys.setrecursionlimit(50): ok (altura {arvore.root.height})")
+
+# --- OPERAÇÕES EM LOTE ---
+def _cronometrar(funcao):
+    gc.collect() # Lixo das medições anteriores não entra na conta
+    inicio = time.perf_counter()
+    resultado = funcao()
+    return time.perf_counter() - inicio, resultado
+
+def _inserir_um_a_um(arvore, chaves):
+    for k in chaves:
+        arvore.insert(k)
+    return arvore
+
+def _split_por_filtragem(arvore, k):
+    """Divisão ingênua em O(n): percorre tudo e reconstrói as duas metades."""
+    chaves = list(arvore)
+    return AVLTree.from_sorted([x for x in chaves if x < k]), AVLTree.from_sorted([x for x in chaves if x > k])
+
+def executar_benchmark_lote(n, m, seed=None):
+    """from_sorted, insert_many, união e split contra as alternativas item a item / O(n)."""
+    rng = random.Random(seed)
+    chaves = sorted(rng.sample(range(10 * n), n))
+    lote = rng.sample(range(10 * n), m)
+
+    print(f"\nAVL EM LOTE: árvore com {n} chaves, lote de {m}")
+    print("{:<34}{:>16}{:>16}{:>10}".format("Operação", "Alternativa (s)", "Em lote (s)", "Ganho"))
+    print("-" * 76)
+
+    def linha(nome, t_alternativa, t_lote, esperado, arvore):
+        if list(arvore) != esperado:
+            raise AssertionError(f"{nome}: resultado divergiu do esperado.")
+        arvore.validate()
+        print("{:<34}{:>16.4f}{:>16.4f}{:>9.1f}x".format(nome, t_alternativa, t_lote, t_alternativa / t_lote))
+
+    # from_sorted vs. n inserções
+    t_alt, arvore = _cronometrar(lambda: _inserir_um_a_um(AVLTree(), chaves))
+    del arvore
+    t_lote, arvore = _cronometrar(lambda: AVLTree.from_sorted(chaves))
+    linha(f"Construir ({n} ordenadas)", t_alt, t_lote, chaves, arvore)
+
+    # insert_many vs. m inserções na ordem de chegada
+    esperado = sorted(set(chaves) | set(lote))
+    t_alt, _ = _cronometrar(lambda: _inserir_um_a_um(arvore, lote))
+    arvore = AVLTree.from_sorted(chaves)
+    t_lote, _ = _cronometrar(lambda: arvore.insert_many(lote))
+    linha(f"insert_many ({m} aleatórias)", t_alt, t_lote, esperado, arvore)
+
+    # União de duas árvores de n/2 chaves intercaladas vs. inserir a segunda na primeira
+    metade_a, metade_b = chaves[::2], chaves[1::2]
+    a = AVLTree.from_sorted(metade_a)
+    t_alt, _ = _cronometrar(lambda: _inserir_um_a_um(a, rng.sample(metade_b, len(metade_b))))
+    a, b = AVLTree.from_sorted(metade_a), AVLTree.from_sorted(metade_b)
+    t_lote, _ = _cronometrar(lambda: a.union(b))
+    linha("União (2 x n/2, intercaladas)", t_alt, t_lote, chaves, a)
+
+    # split + join (O(log n)) vs. divisão por filtragem (O(n))
+    del a, b
+    arvore = AVLTree.from_sorted(chaves)
+    consultas = rng.sample(chaves, min(5, n))
+    t_alt, _ = _cronometrar(lambda: [_split_por_filtragem(arvore, k) for k in consultas])
+
+    def dividir_e_juntar():
+        for k in consultas:
+            menores, _, maiores = arvore.split(k)
+            menores.join(k, maiores)
+            arvore.root = menores.root
+    t_lote, _ = _cronometrar(dividir_e_juntar)
+    linha(f"split + join ({len(consultas)} chaves)", t_alt, t_lote, chaves, arvore)
+
+# --- ESTATÍSTICAS DE ORDEM ---
+def executar_benchmark_ordem(n, q, seed=None):
+    """rank/select/count_range/floor/iter_range da AVL contra lista ordenada + bisect (µs por consulta).
+
+    Cenário estático: as mesmas consultas sobre um conjunto fixo. Cenário
+    dinâmico: inserções intercaladas com rank, em que a lista paga O(n) por
+    bisect.insort (deslocamento dos elementos) e a AVL O(log n).
+    """
+    rng = random.Random(seed)
+    chaves = rng.sample(range(10 * n), n)
+    consultas = [rng.randrange(10 * n) for _ in range(q)]
+    posicoes = [rng.randrange(n) for _ in range(q)]
+    intervalos = [(x, x + 100) for x in consultas] # ~10 chaves por intervalo
+
+    t_lista, lista = _cronometrar(lambda: sorted(chaves))
+    t_avl, arvore = _cronometrar(lambda: _inserir_um_a_um(AVLTree(), chaves))
+
+    def floor_lista(x):
+        i = bisect.bisect_right(lista, x)
+        return lista[i - 1] if i else None
+
+    def iter_range_lista(lo, hi):
+        return lista[bisect.bisect_left(lista, lo):bisect.bisect_right(lista, hi)]
+
+    medicoes = [
+        ("rank", lambda: [bisect.bisect_left(lista, x) for x in consultas],
+                 lambda: [arvore.rank(x) for x in consultas]),
+        ("select", lambda: [lista[i] for i in posicoes],
+                   lambda: [arvore.select(i) for i in posicoes]),
+        ("count_range", lambda: [bisect.bisect_right(lista, hi) - bisect.bisect_left(lista, lo) for lo, hi in intervalos],
+                        lambda: [arvore.count_range(lo, hi) for lo, hi in intervalos]),
+        ("floor", lambda: [floor_lista(x) for x in consultas],
+                  lambda: [arvore.floor(x) for x in consultas]),
+        ("iter_range (~10 chaves)", lambda: [iter_range_lista(lo, hi) for lo, hi in intervalos],
+                                    lambda: [list(arvore.iter_range(lo, hi)) for lo, hi in intervalos]),
+    ]
+
+    print(f"\nESTATÍSTICAS DE ORDEM: {n} chaves, {q} consultas (µs por operação)")
+    print("{:<28}{:>18}{:>12}".format("Operação", "Lista + bisect", "AVL"))
+    print("-" * 58)
+    print("{:<28}{:>18.2f}{:>12.2f}".format("construir (sorted / insert)", t_lista / n * 1e6, t_avl / n * 1e6))
+    for nome, com_lista, com_avl in medicoes:
+        t_lista, esperado = _cronometrar(com_lista)
+        t_avl, obtido = _cronometrar(com_avl)
+        if obtido != esperado:
+            raise AssertionError(f"{nome}: AVL divergiu da lista ordenada.")
+        print("{:<28}{:>18.2f}{:>12.2f}".format(nome, t_lista / q * 1e6, t_avl / q * 1e6))
+
+    # Dinâmico: cada novo valor (espalhado pelo intervalo, para a lista deslocar
+    # em média metade dos elementos) é inserido e logo em seguida consultado
+    existentes = set(chaves)
+    novos = [x for x in rng.sample(range(10 * n), 2 * q) if x not in existentes][:q]
+
+    def dinamico_lista():
+        ranks = []
+        for x in novos:
+            bisect.insort(lista, x)
+            ranks.append(bisect.bisect_left(lista, x - n))
+        return ranks
+
+    def dinamico_avl():
+        ranks = []
+        for x in novos:
+            arvore.insert(x)
+            ranks.append(arvore.rank(x - n))
+        return ranks
+
+    t_lista, esperado = _cronometrar(dinamico_lista)
+    t_avl, obtido = _cronometrar(dinamico_avl)
+    if obtido != esperado:
+        raise AssertionError("insert + rank: AVL divergiu da lista ordenada.")
+    print("{:<28}{:>18.2f}{:>12.2f}".format("insert + rank (dinâmico)", t_lista / q * 1e6, t_avl / q * 1e6))
+
+# --- ÍNDICE ORDENADO (SortedMap) ---
+def executar_benchmark_indice(n, atualizacoes, nome_crit, seed=None, topo=10):
+    """Índice SortedMap mantido a cada mudança vs. reordenar a lista inteira (ms por atualização).
+
+    Cada atualização remove um produto, adiciona outro e lê os `topo`
+    primeiros na ordem do critério. A reordenação completa é medida em
+    menos atualizações (no máximo 20), pois custa O(n log n) cada.
+    """
+    random.seed(seed)
+    key, rev = criterios[nome_crit]
+    produtos = gerar_produtos(n + atualizacoes)
+    iniciais, novos = produtos[:n], produtos[n:]
+    rng = random.Random(seed)
+    saidas = [rng.randrange(n) for _ in range(atualizacoes)] # Posição (na lista viva) do produto removido
+
+    def com_reordenacao(ordenar, quantidade):
+        vivos = list(iniciais)
+        for i in range(quantidade):
+            vivos[saidas[i]] = vivos[-1] # Remove em O(1) (a ordem da lista não importa: será reordenada)
+            vivos.pop()
+            vivos.append(novos[i])
+            primeiros = ordenar(list(vivos))[:topo]
+        return primeiros
+
+    def com_indice(indice, quantidade):
+        vivos = list(iniciais)
+        for i in range(quantidade):
+            indice.discard(vivos[saidas[i]])
+            vivos[saidas[i]] = vivos[-1]
+            vivos.pop()
+            indice.add(novos[i])
+            vivos.append(novos[i])
+            primeiros = list(itertools.islice(indice.values(reverse=rev), topo))
+        return primeiros
+
+    poucas = min(atualizacoes, 20)
+    print(f"\nÍNDICE ORDENADO: {n} produtos, critério {nome_crit}, top {topo} após cada atualização")
+    print("{:<36}{:>14}{:>20}".format("Estratégia", "Atualizações", "ms/atualização"))
+    print("-" * 70)
+    t, indice = _cronometrar(lambda: SortedMap.from_values(iniciais, key=key))
+    print("{:<36}{:>14}{:>20.1f}".format("Construir o índice (total)", "-", t * 1e3))
+    t_indice, esperado = _cronometrar(lambda: com_indice(indice, poucas))
+    indice = SortedMap.from_values(iniciais, key=key)
+    for nome, ordenar in [("Reordenar (merge_sort)", lambda v: merge_sort(v, key=key, reverse=rev)),
+                          ("Reordenar (sorted)", lambda v: sorted(v, key=key, reverse=rev))]:
+        t, obtido = _cronometrar(lambda: com_reordenacao(ordenar, poucas))
+        if obtido != esperado:
+            raise AssertionError(f"{nome}: top {topo} divergiu do índice.")
+        print("{:<36}{:>14}{:>20.3f}".format(nome, poucas, t / poucas * 1e3))
+    t, _ = _cronometrar(lambda: com_indice(indice, atualizacoes))
+    indice.validate()
+    print("{:<36}{:>14}{:>20.3f}".format("SortedMap (discard + add + top)", atualizacoes, t / atualizacoes * 1e3))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks da AVLTree.")
+    sub = parser.add_subparsers(dest="comando")
+    p_ops = sub.add_parser("operacoes", help="insert/search/delete: iterativa vs. recursiva (padrão).")
+    p_ops.add_argument("-n", type=int, default=1000000, help="Número de chaves (padrão: 1000000).")
+    p_ops.add_argument("--seed", type=int, default=0, help="Semente das chaves (padrão: 0).")
+    p_ops.add_argument("--sem-recursiva", action="store_true", help="Mede só a versão iterativa.")
+    p_lote = sub.add_parser("lote", help="from_sorted, insert_many, união e split/join.")
+    p_lote.add_argument("-n", type=int, default=1000000, help="Chaves na árvore (padrão: 1000000).")
+    p_lote.add_argument("-m", type=int, default=100000, help="Tamanho do lote (padrão: 100000).")
+    p_lote.add_argument("--seed", type=int, default=0, help="Semente das chaves (padrão: 0).")
+    p_ordem = sub.add_parser("ordem", help="rank/select/count_range/floor/iter_range vs. lista + bisect.")
+    p_ordem.add_argument("-n", type=int, default=1000000, help="Chaves na árvore (padrão: 1000000).")
+    p_ordem.add_argument("-q", type=int, default=100000, help="Número de consultas (padrão: 100000).")
+    p_ordem.add_argument("--seed", type=int, default=0, help="Semente das chaves (padrão: 0).")
+    p_indice = sub.add_parser("indice", help="SortedMap como índice de um critério vs. reordenar a cada mudança.")
+    p_indice.add_argument("-n", type=int, default=100000, help="Número de produtos (padrão: 100000).")
+    p_indice.add_argument("-u", type=int, default=10000, help="Atualizações (padrão: 10000).")
+    p_indice.add_argument("--criterio", default="Preço (Asc)", help=f"Opções: {', '.join(criterios)}.")
+    p_indice.add_argument("--seed", type=int, default=0, help="Semente dos produtos (padrão: 0).")
+    args = parser.parse_args()
+
+    if args.comando == "lote":
+        executar_benchmark_lote(args.n, args.m, args.seed)
+    elif args.comando == "indice":
+        if args.criterio not in criterios:
+            parser.error(f"Critério desconhecido: {args.criterio!r}.")
+        executar_benchmark_indice(args.n, args.u, args.criterio, args.seed)
+    elif args.comando == "ordem":
+        executar_benchmark_ordem(args.n, args.q, args.seed)
+    elif args.comando == "operacoes":
+        executar_benchmark_avl(args.n, args.seed, not args.sem_recursiva)
+    else:
+        executar_benchmark_avl(1000000, 0)
@@ -0,0 +1,343 @@
+import argparse
+import gc
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+import instrumentacao
+from grafos import Graph, dijkstra, dijkstra_csr, shortest_path
+from grafos_astar import Landmarks, astar, euclidean_heuristic
+from grafos_cache import ShortestPathCache
+from grafos_ch import ContractionHierarchy
+
+# Benchmarks de caminhos mínimos em grafos sintéticos do tipo "malha viária":
+# grade linhas x colunas, arestas entre vizinhos horizontais/verticais com peso
+# = comprimento (1) x fator aleatório em [1, 1.5]. Os pesos nunca são menores
+# que a distância euclidiana entre as coordenadas, o que torna a distância em
+# linha reta uma heurística admissível. Opcionalmente, uma linha/coluna a cada
+# `vias_rapidas` é uma via expressa (peso x 0.25), o que dá ao grafo a
+# hierarquia de uma malha viária real (sem ela, a heurística euclidiana deixa
+# de ser admissível).
+
+# --- GERAÇÃO DE GRAFOS ---
+FATOR_VIA_RAPIDA = 0.25
+
+def gerar_grafo_grade(linhas, colunas, seed=None, vias_rapidas=None):
+    """Grade com nós 0..linhas*colunas-1 (nó = linha * colunas + coluna)."""
+    rng = random.Random(seed)
+    grafo = Graph()
+    for r in range(linhas):
+        for c in range(colunas):
+            no = r * colunas + c
+            if c + 1 < colunas:
+                fator = FATOR_VIA_RAPIDA if vias_rapidas and r % vias_rapidas == 0 else 1
+                grafo.add_edge(no, no + 1, round(rng.uniform(1, 1.5) * fator, 3))
+            if r + 1 < linhas:
+                fator = FATOR_VIA_RAPIDA if vias_rapidas and c % vias_rapidas == 0 else 1
+                grafo.add_edge(no, no + colunas, round(rng.uniform(1, 1.5) * fator, 3))
+    return grafo
+
+def coordenadas_grade(linhas, colunas):
+    """coordenadas[nó] = (x, y) dos nós de gerar_grafo_grade."""
+    return {r * colunas + c: (c, r) for r in range(linhas) for c in range(colunas)}
+
+# --- MEDIÇÃO ---
+def _medir_memoria(funcao):
+    """(bytes alocados e ainda vivos ao final de funcao(), resultado)."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        resultado = funcao()
+        atual, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return atual, resultado
+
+def _ms_por_consulta(funcao, origens):
+    gc.collect()
+    inicio = time.perf_counter()
+    resultados = [funcao(s) for s in origens]
+    return (time.perf_counter() - inicio) / len(origens) * 1e3, resultados
+
+def _cronometrar(funcao):
+    gc.collect()
+    inicio = time.perf_counter()
+    resultado = funcao()
+    return time.perf_counter() - inicio, resultado
+
+# --- CSR vs. DICIONÁRIO ---
+def executar_benchmark_csr(linhas, colunas, consultas, seed=None):
+    """Memória por aresta e latência de dijkstra (dicionário) vs. dijkstra_csr (CSR)."""
+    bytes_dict, grafo = _medir_memoria(lambda: gerar_grafo_grade(linhas, colunas, seed))
+    arestas = sum(len(vizinhos) for vizinhos in grafo.adj.values())
+    inicio = time.perf_counter()
+    bytes_csr, csr = _medir_memoria(grafo.freeze)
+    tempo_freeze = time.perf_counter() - inicio # Inclui a sobrecarga do tracemalloc
+
+    origens = random.Random(seed).sample(grafo.get_nodes(), consultas)
+    ms_dict, res_dict = _ms_por_consulta(lambda s: dijkstra(grafo, s), origens)
+    ms_csr, res_csr = _ms_por_consulta(lambda s: dijkstra_csr(csr, s), origens)
+    for (dist_dict, _), (dist_csr, _) in zip(res_dict, res_csr):
+        if csr.to_labels(dist_csr, [-1] * len(dist_csr))[0] != dist_dict:
+            raise AssertionError("dijkstra_csr divergiu de dijkstra.")
+
+    print(f"\nCSR: grade {linhas}x{colunas} ({csr.num_nodes()} nós, {arestas} arestas armazenadas), "
+          f"{consultas} consultas")
+    print("{:<30}{:>16}{:>18}".format("Forma", "Bytes/aresta", "ms por consulta"))
+    print("-" * 64)
+    print("{:<30}{:>16.1f}{:>18.1f}".format("Graph.adj (dicionário)", bytes_dict / arestas, ms_dict))
+    print("{:<30}{:>16.1f}{:>18.1f}".format("CSRGraph (total)", bytes_csr / arestas, ms_csr))
+    print("{:<30}{:>16.1f}{:>18}".format("CSRGraph (só buffers)", csr.nbytes() / arestas, "-"))
+    print(f"\nfreeze(): {tempo_freeze:.2f} s (com tracemalloc); o total do CSR inclui ids/labels dos nós.")
+
+# --- CONSULTAS PONTO A PONTO ---
+def _caminho_dijkstra_completo(grafo, origem, destino):
+    """Forma anterior de find_and_visualize_shortest_path: Dijkstra de fonte única inteiro."""
+    distances, predecessors = dijkstra(grafo, origem)
+    if distances[destino] == float("inf"):
+        return [], distances[destino]
+    path = []
+    no = destino
+    while no is not None:
+        path.append(no)
+        no = predecessors[no]
+    path.reverse()
+    return path, distances[destino]
+
+def gerar_pares(linhas, colunas, consultas, raio=None, seed=None):
+    """Pares (origem, destino) aleatórios; com `raio`, o destino fica a até raio linhas/colunas da origem."""
+    rng = random.Random(seed)
+    pares = []
+    for _ in range(consultas):
+        r, c = rng.randrange(linhas), rng.randrange(colunas)
+        if raio is None:
+            r2, c2 = rng.randrange(linhas), rng.randrange(colunas)
+        else:
+            r2 = min(linhas - 1, max(0, r + rng.randint(-raio, raio)))
+            c2 = min(colunas - 1, max(0, c + rng.randint(-raio, raio)))
+        pares.append((r * colunas + c, r2 * colunas + c2))
+    return pares
+
+def medir_consultas(funcao, pares):
+    """(ms por consulta, nós assentados por consulta, resultados) de funcao(origem, destino)."""
+    gc.collect()
+    inicio = time.perf_counter()
+    resultados = [funcao(s, t) for s, t in pares]
+    ms = (time.perf_counter() - inicio) / len(pares) * 1e3
+    with instrumentacao.instrumentar() as c: # Segunda passada, só para contar
+        for s, t in pares:
+            funcao(s, t)
+    return ms, (c["pops"] - c["pops_obsoletos"]) / len(pares), resultados
+
+def _conferir_distancias(nome, resultados, esperados):
+    for (_, d), (_, e) in zip(resultados, esperados):
+        if abs(d - e) > 1e-9 * max(1.0, abs(e)):
+            raise AssertionError(f"{nome}: distância {d} diverge da esperada {e}.")
+
+def executar_benchmark_p2p(linhas, colunas, consultas, raio, seed=None):
+    """Dijkstra completo vs. shortest_path com parada antecipada e bidirecional (ms e nós assentados)."""
+    grafo = gerar_grafo_grade(linhas, colunas, seed)
+    estrategias = [
+        ("Dijkstra completo", lambda s, t: _caminho_dijkstra_completo(grafo, s, t)),
+        ("Parada antecipada", lambda s, t: shortest_path(grafo, s, t)),
+        ("Bidirecional", lambda s, t: shortest_path(grafo, s, t, bidirectional=True)),
+    ]
+    print(f"\nPONTO A PONTO: grade {linhas}x{colunas} ({linhas * colunas} nós), {consultas} consultas por cenário")
+    print("{:<14}{:<22}{:>16}{:>18}".format("Pares", "Estratégia", "ms por consulta", "Nós assentados"))
+    print("-" * 70)
+    for nome_cenario, r in (("aleatórios", None), (f"raio {raio}", raio)):
+        pares = gerar_pares(linhas, colunas, consultas, r, seed)
+        esperados = None
+        for nome, funcao in estrategias:
+            ms, assentados, resultados = medir_consultas(funcao, pares)
+            if esperados is None:
+                esperados = resultados
+            _conferir_distancias(nome, resultados, esperados)
+            print("{:<14}{:<22}{:>16.2f}{:>18.0f}".format(nome_cenario, nome, ms, assentados))
+
+# --- A* E ALT ---
+def executar_benchmark_alt(linhas, colunas, consultas, ks, seed=None):
+    """Nós assentados e latência: Dijkstra (parada antecipada) vs. A* euclidiano vs. ALT com k landmarks."""
+    grafo = gerar_grafo_grade(linhas, colunas, seed)
+    coordenadas = coordenadas_grade(linhas, colunas)
+    pares = gerar_pares(linhas, colunas, consultas, seed=seed)
+
+    print(f"\nALT: grade {linhas}x{colunas} ({linhas * colunas} nós), {consultas} consultas aleatórias")
+    print("{:<24}{:>16}{:>12}{:>18}{:>18}".format(
+        "Estratégia", "Pré-proc. (s)", "Tabelas", "ms por consulta", "Nós assentados"))
+    print("-" * 88)
+    estrategias = [
+        ("Dijkstra", 0.0, "-", lambda s, t: shortest_path(grafo, s, t)),
+        ("Bidirecional", 0.0, "-", lambda s, t: shortest_path(grafo, s, t, bidirectional=True)),
+        ("A* euclidiano", 0.0, "-", lambda s, t: astar(grafo, s, t, euclidean_heuristic(coordenadas))),
+    ]
+    for k in ks:
+        t_pre, marcos = _cronometrar(lambda: Landmarks.build(grafo, k, seed=seed))
+        estrategias.append((f"ALT (k={k})", t_pre, f"{marcos.nbytes() / 2**20:.1f} MiB",
+                            lambda s, t, m=marcos: astar(grafo, s, t, m.heuristic)))
+
+    esperados = None
+    for nome, t_pre, tabelas, funcao in estrategias:
+        ms, assentados, resultados = medir_consultas(funcao, pares)
+        if esperados is None:
+            esperados = resultados
+        _conferir_distancias(nome, resultados, esperados)
+        print("{:<24}{:>16.2f}{:>12}{:>18.2f}{:>18.0f}".format(nome, t_pre, tabelas, ms, assentados))
+
+    # Persistência das tabelas do último k
+    descritor, caminho = tempfile.mkstemp(suffix=".alt")
+    os.close(descritor)
+    try:
+        t_save, _ = _cronometrar(lambda: marcos.save(caminho))
+        t_load, carregados = _cronometrar(lambda: Landmarks.load(caminho))
+        tamanho = os.path.getsize(caminho)
+    finally:
+        os.remove(caminho)
+    if carregados.tables != marcos.tables:
+        raise AssertionError("Landmarks.load não reproduziu as tabelas salvas.")
+    print(f"\nsave/load (k={ks[-1]}): {tamanho / 2**20:.1f} MiB em disco, save {t_save:.3f} s, load {t_load:.3f} s")
+
+# --- CONTRACTION HIERARCHIES ---
+def _comprimento(grafo, caminho):
+    return sum(min(w for v, w in grafo.adj[u] if v == proximo) for u, proximo in zip(caminho, caminho[1:]))
+
+def executar_benchmark_ch(linhas, colunas, consultas, vias_rapidas, seed=None):
+    """Pré-processamento (tempo, atalhos) e aceleração das consultas da CH contra Dijkstra."""
+    grafo = gerar_grafo_grade(linhas, colunas, seed, vias_rapidas)
+    arestas = sum(len(vizinhos) for vizinhos in grafo.adj.values()) // 2
+    t_pre, ch = _cronometrar(lambda: ContractionHierarchy.build(grafo))
+    pares = gerar_pares(linhas, colunas, consultas, seed=seed)
+
+    vias = f"via rápida a cada {vias_rapidas}" if vias_rapidas else "sem vias rápidas"
+    print(f"\nCH: grade {linhas}x{colunas} ({linhas * colunas} nós, {arestas} arestas, {vias}), "
+          f"{consultas} consultas")
+    print(f"Pré-processamento: {t_pre:.1f} s, {ch.num_shortcuts} atalhos ({ch.num_shortcuts / arestas:.2f} por aresta)")
+    print("{:<22}{:>18}{:>18}{:>12}".format("Estratégia", "ms por consulta", "Nós assentados", "Aceleração"))
+    print("-" * 70)
+    base = None
+    esperados = None
+    for nome, funcao in [("Dijkstra", lambda s, t: shortest_path(grafo, s, t)),
+                         ("Bidirecional", lambda s, t: shortest_path(grafo, s, t, bidirectional=True)),
+                         ("CH", ch.shortest_path)]:
+        ms, assentados, resultados = medir_consultas(funcao, pares)
+        if esperados is None:
+            base, esperados = ms, resultados
+        _conferir_distancias(nome, resultados, esperados)
+        print("{:<22}{:>18.3f}{:>18.0f}{:>11.1f}x".format(nome, ms, assentados, base / ms))
+    # Os caminhos desempacotados são caminhos reais do grafo original
+    for caminho, distancia in resultados:
+        if caminho and abs(_comprimento(grafo, caminho) - distancia) > 1e-6 * max(1.0, distancia):
+            raise AssertionError("CH: caminho desempacotado não tem o comprimento informado.")
+
+# --- CACHE DE CAMINHOS ---
+def gerar_carga_quente(linhas, colunas, consultas, quentes, fracao_quente, mutar_a_cada, seed=None):
+    """Sequência de ("consulta", s, t) e ("aresta", u, v, peso): `fracao_quente` das consultas sai de
+    `quentes` origens fixas; a cada `mutar_a_cada` consultas, uma aresta nova entre nós próximos."""
+    rng = random.Random(seed)
+    n = linhas * colunas
+    origens_quentes = rng.sample(range(n), quentes)
+    carga = []
+    for i in range(consultas):
+        s = rng.choice(origens_quentes) if rng.random() < fracao_quente else rng.randrange(n)
+        carga.append(("consulta", s, rng.randrange(n)))
+        if mutar_a_cada and (i + 1) % mutar_a_cada == 0:
+            r, c = rng.randrange(linhas - 2), rng.randrange(colunas - 2)
+            u, v = r * colunas + c, (r + 2) * colunas + c + 2 # Diagonal de 2x2: às vezes encurta caminhos
+            carga.append(("aresta", u, v, round(rng.uniform(2.5, 6), 3)))
+    return carga
+
+def executar_benchmark_cache(linhas, colunas, consultas, quentes, mutar_a_cada, max_entradas, seed=None):
+    """Consultas repetidas de origens quentes: shortest_path sem cache vs. ShortestPathCache."""
+    carga = gerar_carga_quente(linhas, colunas, consultas, quentes, 0.9, mutar_a_cada, seed)
+
+    def sem_cache():
+        grafo = gerar_grafo_grade(linhas, colunas, seed)
+        resultados = []
+        for operacao in carga:
+            if operacao[0] == "aresta":
+                grafo.add_edge(*operacao[1:])
+            else:
+                resultados.append(shortest_path(grafo, operacao[1], operacao[2])[1])
+        return resultados, None
+
+    def com_cache():
+        cache = ShortestPathCache(gerar_grafo_grade(linhas, colunas, seed), max_entries=max_entradas)
+        resultados = []
+        for operacao in carga:
+            if operacao[0] == "aresta":
+                cache.add_edge(*operacao[1:])
+            else:
+                resultados.append(cache.shortest_path(operacao[1], operacao[2])[1])
+        return resultados, cache
+
+    print(f"\nCACHE: grade {linhas}x{colunas}, {consultas} consultas (90% de {quentes} origens quentes), "
+          f"aresta nova a cada {mutar_a_cada} consultas, até {max_entradas} entradas")
+    print("{:<16}{:>14}{:>10}{:>14}{:>10}{:>10}{:>12}".format(
+        "Estratégia", "ms/consulta", "Acertos", "Invalidações", "Despejos", "Entradas", "MiB"))
+    print("-" * 86)
+    esperados = None
+    for nome, funcao in (("Sem cache", sem_cache), ("Com cache", com_cache)):
+        tempo, (resultados, cache) = _cronometrar(funcao)
+        if esperados is None:
+            esperados = resultados
+        elif any(abs(a - b) > 1e-9 * max(1.0, abs(b)) for a, b in zip(resultados, esperados)):
+            raise AssertionError("ShortestPathCache divergiu de shortest_path.")
+        ms = tempo / consultas * 1e3
+        if cache is None:
+            print("{:<16}{:>14.2f}{:>10}{:>14}{:>10}{:>10}{:>12}".format(nome, ms, "-", "-", "-", "-", "-"))
+        else:
+            st = cache.stats()
+            print("{:<16}{:>14.2f}{:>9.0%}{:>14}{:>10}{:>10}{:>12.1f}".format(
+                nome, ms, st["hit_rate"], st["invalidations"], st["evictions"], st["entries"], st["bytes"] / 2**20))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks de caminhos mínimos em grafos.")
+    sub = parser.add_subparsers(dest="comando")
+    p_csr = sub.add_parser("csr", help="Memória e latência: Graph (dicionário) vs. CSRGraph.")
+    p_csr.add_argument("--linhas", type=int, default=300, help="Linhas da grade (padrão: 300).")
+    p_csr.add_argument("--colunas", type=int, default=300, help="Colunas da grade (padrão: 300).")
+    p_csr.add_argument("-q", "--consultas", type=int, default=10, help="Origens de Dijkstra (padrão: 10).")
+    p_csr.add_argument("--seed", type=int, default=0, help="Semente dos pesos e consultas (padrão: 0).")
+    p_p2p = sub.add_parser("p2p", help="Consultas s -> t: Dijkstra completo vs. parada antecipada vs. bidirecional.")
+    p_p2p.add_argument("--linhas", type=int, default=300, help="Linhas da grade (padrão: 300).")
+    p_p2p.add_argument("--colunas", type=int, default=300, help="Colunas da grade (padrão: 300).")
+    p_p2p.add_argument("-q", "--consultas", type=int, default=20, help="Consultas por cenário (padrão: 20).")
+    p_p2p.add_argument("--raio", type=int, default=10, help="Distância máxima (em linhas/colunas) dos pares próximos (padrão: 10).")
+    p_p2p.add_argument("--seed", type=int, default=0, help="Semente dos pesos e consultas (padrão: 0).")
+    p_alt = sub.add_parser("alt", help="Dijkstra vs. A* euclidiano vs. ALT (landmarks).")
+    p_alt.add_argument("--linhas", type=int, default=300, help="Linhas da grade (padrão: 300).")
+    p_alt.add_argument("--colunas", type=int, default=300, help="Colunas da grade (padrão: 300).")
+    p_alt.add_argument("-q", "--consultas", type=int, default=20, help="Consultas aleatórias (padrão: 20).")
+    p_alt.add_argument("-k", "--landmarks", type=int, nargs="+", default=[4, 16], help="Quantidades de landmarks (padrão: 4 16).")
+    p_alt.add_argument("--seed", type=int, default=0, help="Semente dos pesos, landmarks e consultas (padrão: 0).")
+    p_ch = sub.add_parser("ch", help="Contraction Hierarchies: pré-processamento, atalhos e aceleração.")
+    p_ch.add_argument("--linhas", type=int, default=100, help="Linhas da grade (padrão: 100).")
+    p_ch.add_argument("--colunas", type=int, default=100, help="Colunas da grade (padrão: 100).")
+    p_ch.add_argument("-q", "--consultas", type=int, default=100, help="Consultas aleatórias (padrão: 100).")
+    p_ch.add_argument("--vias-rapidas", type=int, default=10, help="Via rápida a cada N linhas/colunas; 0 = nenhuma (padrão: 10).")
+    p_ch.add_argument("--seed", type=int, default=0, help="Semente dos pesos e consultas (padrão: 0).")
+    p_cache = sub.add_parser("cache", help="Origens quentes: sem cache vs. ShortestPathCache (LRU + invalidação).")
+    p_cache.add_argument("--linhas", type=int, default=100, help="Linhas da grade (padrão: 100).")
+    p_cache.add_argument("--colunas", type=int, default=100, help="Colunas da grade (padrão: 100).")
+    p_cache.add_argument("-q", "--consultas", type=int, default=2000, help="Consultas (padrão: 2000).")
+    p_cache.add_argument("--quentes", type=int, default=10, help="Origens quentes (padrão: 10).")
+    p_cache.add_argument("--mutar-a-cada", type=int, default=100, help="Consultas entre arestas novas; 0 = nunca (padrão: 100).")
+    p_cache.add_argument("--max-entradas", type=int, default=64, help="Entradas no cache (padrão: 64).")
+    p_cache.add_argument("--seed", type=int, default=0, help="Semente dos pesos e consultas (padrão: 0).")
+    args = parser.parse_args()
+
+    if args.comando == "csr":
+        executar_benchmark_csr(args.linhas, args.colunas, args.consultas, args.seed)
+    elif args.comando == "p2p":
+        executar_benchmark_p2p(args.linhas, args.colunas, args.consultas, args.raio, args.seed)
+    elif args.comando == "alt":
+        executar_benchmark_alt(args.linhas, args.colunas, args.consultas, args.landmarks, args.seed)
+    elif args.comando == "ch":
+        executar_benchmark_ch(args.linhas, args.colunas, args.consultas, args.vias_rapidas, args.seed)
+    elif args.comando == "cache":
+        executar_benchmark_cache(args.linhas, args.colunas, args.consultas, args.quentes,
+                                 args.mutar_a_cada, args.max_entradas, args.seed)
+    else:
+        parser.print_help()
@@ -0,0 +1,276 @@
+import argparse
+import csv
+import gc
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+from instrumentacao import instrumentar
+from ordenacao import algoritmos, criterios, gerar_produtos, selecionar
+
+# Suíte de benchmark estatisticamente robusta para os algoritmos de ordenacao.py.
+# Diferente da medição única de medir_tempo_e_verificar:
+# - aquecimento + várias repetições, reportando mediana e IQR (intervalo interquartil);
+# - varredura de tamanhos, com algoritmos O(n^2) limitados automaticamente;
+# - distribuições de entrada (aleatória, ordenada, invertida, poucos únicos, quase ordenada);
+# - verificação de corretude e pico de memória (tracemalloc) FORA da medição de tempo;
+# - GC opcionalmente desligado durante as repetições;
+# - contagem opcional de operações (comparações, trocas, chamadas de key),
+#   também em execução separada;
+# - saída JSON/CSV e comparação com um baseline que sinaliza regressões.
+
+DISTRIBUICOES = ("aleatória", "ordenada", "invertida", "poucos únicos", "quase ordenada")
+
+# Tamanho máximo por algoritmo (pior caso O(n^2) nas distribuições adversárias)
+LIMITES_N = {
+    "Bubble Sort": 5000,
+}
+
+TEMPO_MAX_PADRAO = 10.0 # Se a mediana passar disso, tamanhos maiores são pulados
+LIMIAR_REGRESSAO_PADRAO = 0.10 # 10% mais lento que o baseline
+
+# --- GERAÇÃO DAS ENTRADAS ---
+def gerar_entrada(n, distribuicao, key, reverse, rng_seed=None):
+    """Gera n produtos na distribuição pedida, relativa ao critério (key, reverse)."""
+    if rng_seed is not None:
+        random.seed(rng_seed)
+    produtos = gerar_produtos(n)
+    if distribuicao == "poucos únicos":
+        # 10 valores distintos por atributo (categorias já têm 5)
+        precos = [round(random.uniform(10, 1000), 2) for _ in range(10)]
+        avaliacoes = [round(random.uniform(0, 5), 2) for _ in range(10)]
+        datas = sorted({p.data_adicao for p in produtos[:10]})
+        for p in produtos:
+            p.preco = random.choice(precos)
+            p.avaliacao = random.choice(avaliacoes)
+            p.data_adicao = random.choice(datas)
+    elif distribuicao == "ordenada":
+        produtos.sort(key=key, reverse=reverse)
+    elif distribuicao == "invertida":
+        produtos.sort(key=key, reverse=not reverse)
+    elif distribuicao == "quase ordenada":
+        produtos.sort(key=key, reverse=reverse)
+        for _ in range(max(1, n // 100)): # 1% de trocas aleatórias
+            i, j = random.randrange(n), random.randrange(n)
+            produtos[i], produtos[j] = produtos[j], produtos[i]
+    elif distribuicao != "aleatória":
+        raise ValueError(f"Distribuição desconhecida: {distribuicao!r}. Opções: {', '.join(DISTRIBUICOES)}.")
+    return produtos
+
+# --- MEDIÇÃO ---
+def resumir(tempos):
+    """Mediana, quartis e IQR de uma lista de tempos."""
+    if len(tempos) >= 2:
+        q1, mediana, q3 = statistics.quantiles(tempos, n=4, method="inclusive")
+    else:
+        q1 = mediana = q3 = tempos[0]
+    return {"mediana": mediana, "q1": q1, "q3": q3, "iqr": q3 - q1, "minimo": min(tempos)}
+
+def medir(algoritmo, dados, key, reverse, repeticoes=5, aquecimento=1, desligar_gc=False, medir_memoria=True,
+          contar_operacoes=False):
+    """Executa aquecimento + repetições e retorna o resumo estatístico (tempos em segundos).
+
+    Cada execução ordena uma cópia nova; a cópia é feita fora do intervalo medido.
+    Levanta AssertionError se o resultado divergir de sorted().
+    """
+    if repeticoes < 1:
+        raise ValueError("medir: repeticoes deve ser >= 1.")
+    # Corretude (fora da medição)
+    esperado = [key(p) for p in sorted(dados, key=key, reverse=reverse)]
+    obtido = algoritmo(list(dados), key=key, reverse=reverse)
+    if [key(p) for p in obtido] != esperado:
+        raise AssertionError(f"{algoritmo.__name__} divergiu de sorted().")
+    del esperado, obtido
+
+    for _ in range(aquecimento):
+        algoritmo(list(dados), key=key, reverse=reverse)
+
+    tempos = []
+    gc_estava_ligado = gc.isenabled()
+    try:
+        if desligar_gc:
+            gc.collect()
+            gc.disable()
+        for _ in range(repeticoes):
+            copia = list(dados)
+            inicio = time.perf_counter()
+            algoritmo(copia, key=key, reverse=reverse)
+            tempos.append(time.perf_counter() - inicio)
+    finally:
+        if desligar_gc and gc_estava_ligado:
+            gc.enable()
+
+    resumo = resumir(tempos)
+    resumo["repeticoes"] = repeticoes
+    resumo["pico_memoria"] = None
+    if medir_memoria:
+        # Execução separada: tracemalloc distorce o tempo
+        copia = list(dados)
+        tracemalloc.start()
+        algoritmo(copia, key=key, reverse=reverse)
+        _, pico = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        resumo["pico_memoria"] = pico
+    for nome in CONTADORES:
+        resumo[nome] = None
+    if contar_operacoes:
+        # Execução separada: as chaves instrumentadas deixam a ordenação mais lenta
+        with instrumentar() as contadores:
+            algoritmo(list(dados), key=key, reverse=reverse)
+        for nome in CONTADORES:
+            resumo[nome] = contadores[nome]
+    return resumo
+
+def executar_suite(tamanhos, algoritmos_sel, criterios_sel, distribuicoes, repeticoes=5, aquecimento=1,
+                   desligar_gc=False, medir_memoria=True, tempo_max=TEMPO_MAX_PADRAO, seed=0,
+                   contar_operacoes=False):
+    """Roda todas as combinações e retorna a lista de resultados (dicionários)."""
+    resultados = []
+    estourou_em = {} # Algoritmo -> menor n em que a mediana passou de tempo_max
+    for n in sorted(tamanhos):
+        for nome_dist in distribuicoes:
+            for nome_crit, (key, rev) in criterios_sel.items():
+                dados = gerar_entrada(n, nome_dist, key, rev, rng_seed=seed)
+                for nome_alg, alg in algoritmos_sel.items():
+                    if n > min(LIMITES_N.get(nome_alg, float("inf")), estourou_em.get(nome_alg, float("inf"))):
+                        continue
+                    resumo = medir(alg, dados, key, rev, repeticoes, aquecimento, desligar_gc, medir_memoria,
+                                   contar_operacoes)
+                    resultado = {"algoritmo": nome_alg, "criterio": nome_crit, "distribuicao": nome_dist, "n": n}
+                    resultado.update(resumo)
+                    resultados.append(resultado)
+                    imprimir_linha(resultado)
+                    if resumo["mediana"] > tempo_max:
+                        # Só tamanhos maiores são pulados: o resto deste n ainda roda
+                        estourou_em.setdefault(nome_alg, n)
+    return resultados
+
+# --- SAÍDA ---
+CONTADORES = ["comparacoes", "trocas", "chamadas_key"] # Ver instrumentacao.py
+CAMPOS = ["algoritmo", "criterio", "distribuicao", "n", "repeticoes", "mediana", "q1", "q3", "iqr", "minimo",
+          "pico_memoria"] + CONTADORES
+
+def imprimir_cabecalho(contadores=False):
+    extra = "{:>14}{:>12}{:>10}".format("Comparações", "Trocas", "Keys") if contadores else ""
+    print("{:<14}{:<22}{:<16}{:>9}{:>13}{:>12}{:>13}".format(
+        "Algoritmo", "Critério", "Distribuição", "n", "Mediana (s)", "IQR (s)", "Pico (KiB)") + extra)
+    print("-" * (99 + len(extra)))
+
+def imprimir_linha(r):
+    pico = "-" if r["pico_memoria"] is None else f"{r['pico_memoria'] / 1024:.1f}"
+    extra = ""
+    if r["comparacoes"] is not None:
+        extra = "{:>14}{:>12}{:>10}".format(r["comparacoes"], r["trocas"], r["chamadas_key"])
+    print("{:<14}{:<22}{:<16}{:>9}{:>13.6f}{:>12.6f}{:>13}".format(
+        r["algoritmo"], r["criterio"], r["distribuicao"], r["n"], r["mediana"], r["iqr"], pico) + extra)
+
+def salvar_json(resultados, caminho, meta):
+    with open(caminho, "w", encoding="utf-8") as arquivo:
+        json.dump({"meta": meta, "resultados": resultados}, arquivo, ensure_ascii=False, indent=2)
+
+def salvar_csv(resultados, caminho):
+    with open(caminho, "w", newline="", encoding="utf-8") as arquivo:
+        escritor = csv.DictWriter(arquivo, fieldnames=CAMPOS)
+        escritor.writeheader()
+        escritor.writerows(resultados)
+
+def carregar_json(caminho):
+    with open(caminho, encoding="utf-8") as arquivo:
+        return json.load(arquivo)["resultados"]
+
+# --- COMPARAÇÃO COM BASELINE ---
+def _chave_resultado(r):
+    return (r["algoritmo"], r["criterio"], r["distribuicao"], r["n"])
+
+def comparar_com_baseline(resultados, baseline, limiar=LIMIAR_REGRESSAO_PADRAO):
+    """Retorna as regressões: medianas mais de `limiar` acima do baseline e fora do ruído (IQR).
+
+    Cada item é (resultado, resultado_baseline, variacao_relativa).
+    """
+    base_por_chave = {_chave_resultado(r): r for r in baseline}
+    regressoes = []
+    for r in resultados:
+        base = base_por_chave.get(_chave_resultado(r))
+        if base is None or base["mediana"] <= 0:
+            continue
+        variacao = (r["mediana"] - base["mediana"]) / base["mediana"]
+        ruido = max(r["iqr"], base["iqr"])
+        if variacao > limiar and r["mediana"] - base["mediana"] > ruido:
+            regressoes.append((r, base, variacao))
+    return regressoes
+
+def imprimir_regressoes(regressoes, limiar):
+    if not regressoes:
+        print(f"\nNenhuma regressão acima de {limiar:.0%} em relação ao baseline.")
+        return
+    print(f"\nREGRESSÕES (> {limiar:.0%} e acima do IQR):")
+    for r, base, variacao in regressoes:
+        print(f"  {r['algoritmo']:<14}{r['criterio']:<22}{r['distribuicao']:<16}n={r['n']:<9}"
+              f"{base['mediana']:.6f}s -> {r['mediana']:.6f}s (+{variacao:.0%})")
+
+# --- LINHA DE COMANDO ---
+def _inteiro_minimo(minimo):
+    """Tipo do argparse: inteiro >= minimo."""
+    def converter(texto):
+        valor = int(texto)
+        if valor < minimo:
+            raise argparse.ArgumentTypeError(f"deve ser >= {minimo}: {valor}")
+        return valor
+    return converter
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark estatístico dos algoritmos de ordenacao.py.")
+    parser.add_argument("--tamanhos", nargs="+", type=_inteiro_minimo(1), default=[1000, 10000, 100000],
+                        help="Tamanhos de entrada (padrão: 1000 10000 100000; aceita até 1e7).")
+    parser.add_argument("--algoritmos", nargs="+", metavar="NOME", help=f"Opções: {', '.join(algoritmos)}.")
+    parser.add_argument("--criterios", nargs="+", metavar="NOME", help=f"Opções: {', '.join(criterios)}.")
+    parser.add_argument("--distribuicoes", nargs="+", metavar="NOME", choices=DISTRIBUICOES,
+                        default=list(DISTRIBUICOES), help=f"Opções: {', '.join(DISTRIBUICOES)}.")
+    parser.add_argument("--repeticoes", type=_inteiro_minimo(1), default=5, help="Repetições medidas (padrão: 5).")
+    parser.add_argument("--aquecimento", type=_inteiro_minimo(0), default=1, help="Execuções de aquecimento (padrão: 1).")
+    parser.add_argument("--sem-gc", action="store_true", help="Desliga o GC durante as repetições.")
+    parser.add_argument("--sem-memoria", action="store_true", help="Não mede o pico de memória.")
+    parser.add_argument("--contadores", action="store_true",
+                        help="Conta comparações, trocas e chamadas de key (execução extra, fora da medição).")
+    parser.add_argument("--tempo-max", type=float, default=TEMPO_MAX_PADRAO,
+                        help=f"Mediana (s) acima da qual o algoritmo deixa de rodar tamanhos maiores (padrão: {TEMPO_MAX_PADRAO}).")
+    parser.add_argument("--seed", type=int, default=0, help="Semente dos dados (padrão: 0).")
+    parser.add_argument("--json", metavar="ARQUIVO", help="Salva os resultados em JSON.")
+    parser.add_argument("--csv", metavar="ARQUIVO", help="Salva os resultados em CSV.")
+    parser.add_argument("--baseline", metavar="ARQUIVO", help="JSON de uma execução anterior para comparação.")
+    parser.add_argument("--limiar", type=float, default=LIMIAR_REGRESSAO_PADRAO,
+                        help=f"Variação relativa considerada regressão (padrão: {LIMIAR_REGRESSAO_PADRAO}).")
+    args = parser.parse_args(argv)
+
+    algoritmos_sel = selecionar(algoritmos, args.algoritmos, "Algoritmo", parser)
+    criterios_sel = selecionar(criterios, args.criterios, "Critério", parser)
+    meta = {
+        "python": sys.version.split()[0],
+        "plataforma": platform.platform(),
+        "repeticoes": args.repeticoes,
+        "aquecimento": args.aquecimento,
+        "gc_desligado": args.sem_gc,
+        "seed": args.seed,
+    }
+
+    imprimir_cabecalho(args.contadores)
+    resultados = executar_suite(args.tamanhos, algoritmos_sel, criterios_sel, args.distribuicoes,
+                                args.repeticoes, args.aquecimento, args.sem_gc, not args.sem_memoria,
+                                args.tempo_max, args.seed, args.contadores)
+    if args.json:
+        salvar_json(resultados, args.json, meta)
+    if args.csv:
+        salvar_csv(resultados, args.csv)
+    if args.baseline:
+        regressoes = comparar_com_baseline(resultados, carregar_json(args.baseline), args.limiar)
+        imprimir_regressoes(regressoes, args.limiar)
+        if regressoes:
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
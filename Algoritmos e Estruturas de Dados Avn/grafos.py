@@ -1,11 +1,19 @@
 # ...existing code...
+import array
 import heapq
 import math
+import sys
+
+import instrumentacao
 
 class Graph:
     def __init__(self):
         # O grafo é um dicionário: {nó: [(vizinho, peso), ...]}
         self.adj = {}
+        # Incrementado a cada add_edge: caches (grafos_cache.py) comparam a versão
+        # para saber se um resultado ainda vale. Quem alterar `adj` diretamente
+        # deve incrementá-la também.
+        self.version = 0
 
     def add_edge(self, source, destination, weight):
         """Adiciona uma aresta (com peso) ao grafo. Assumimos um grafo não-direcionado para simplicidade."""
@@ -19,16 +27,103 @@ class Graph:
         
         # Para grafo não-direcionado, adicione a aresta de volta
         self.adj[destination].append((source, weight))
+        self.version += 1
 
     def get_nodes(self):
         """Retorna todos os nós (vértices) do grafo."""
         return list(self.adj.keys())
 
+    def freeze(self):
+        """Compila o grafo atual para a forma compacta CSRGraph (cópia imutável)."""
+        return CSRGraph.from_graph(self)
+
     def __repr__(self):
         """Representação legível do grafo."""
         return f"Grafo com {len(self.adj)} nós: {self.adj}"
 # ...existing code...
 
+# --- FORMA COMPACTA (CSR) ---
+class CSRGraph:
+    """Grafo imutável em CSR (compressed sparse row), gerado por Graph.freeze().
+
+    Os rótulos dos nós viram ids densos 0..V-1 (`labels[id]`, `ids[rótulo]`).
+    As arestas que saem de u ficam em targets/weights[offsets[u]:offsets[u + 1]],
+    em arrays do módulo `array` (4-8 bytes por id, 8 por peso) em vez de uma
+    tupla e dois objetos Python por aresta. as_numpy() expõe os mesmos
+    buffers como arrays NumPy, sem cópia.
+
+    Os pesos mantêm o tipo: só inteiros -> array("q"); inteiros e floats ->
+    array("d") (inteiros viram float). Outros tipos (Decimal, Fraction) ou
+    inteiros fora de 64 bits ficam em uma lista comum, sem perder precisão.
+    """
+
+    def __init__(self, labels, offsets, targets, weights):
+        self.labels = labels
+        self.ids = {label: i for i, label in enumerate(labels)}
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+
+    @classmethod
+    def from_graph(cls, graph):
+        labels = list(graph.adj)
+        ids = {label: i for i, label in enumerate(labels)}
+        offsets = array.array("q", [0])
+        targets = array.array("i" if len(labels) < 2**31 else "q")
+        weights = []
+        for label in labels:
+            edges = graph.adj[label]
+            targets.extend([ids[v] for v, _ in edges])
+            weights.extend([w for _, w in edges])
+            offsets.append(len(targets))
+        return cls(labels, offsets, targets, _compactar_pesos(weights))
+
+    def num_nodes(self):
+        return len(self.labels)
+
+    def num_edges(self):
+        """Arestas armazenadas (cada aresta não-direcionada conta duas vezes, como em Graph.adj)."""
+        return len(self.targets)
+
+    def nbytes(self):
+        """Bytes dos buffers de arestas (offsets, targets, weights; pesos em lista contam os objetos)."""
+        total = sum(len(a) * a.itemsize for a in (self.offsets, self.targets))
+        if isinstance(self.weights, array.array):
+            return total + len(self.weights) * self.weights.itemsize
+        return total + sys.getsizeof(self.weights) + sum(sys.getsizeof(w) for w in self.weights)
+
+    def as_numpy(self):
+        """(offsets, targets, weights) como arrays NumPy que compartilham a memória dos buffers.
+
+        Pesos em lista (Decimal, Fraction...) viram uma cópia com dtype=object.
+        """
+        import numpy as np # Opcional: só é necessário aqui
+        offsets, targets = (np.frombuffer(a, dtype=a.typecode) for a in (self.offsets, self.targets))
+        if isinstance(self.weights, array.array):
+            return offsets, targets, np.frombuffer(self.weights, dtype=self.weights.typecode)
+        return offsets, targets, np.array(self.weights, dtype=object)
+
+    def to_labels(self, distances, predecessors):
+        """Converte o resultado de dijkstra_csr para os dicionários de dijkstra (por rótulo)."""
+        labels = self.labels
+        return ({labels[i]: d for i, d in enumerate(distances)},
+                {labels[i]: (labels[p] if p >= 0 else None) for i, p in enumerate(predecessors)})
+
+    def __repr__(self):
+        return f"CSRGraph({self.num_nodes()} nós, {self.num_edges()} arestas, {self.nbytes()} bytes)"
+
+def _compactar_pesos(pesos):
+    """array("q") para pesos inteiros, array("d") para int/float; senão, a própria lista."""
+    tipos = {type(w) for w in pesos}
+    try:
+        if tipos <= {int}:
+            return array.array("q", pesos)
+        if tipos <= {int, float}:
+            return array.array("d", pesos)
+    except OverflowError: # Inteiro fora de 64 bits (ou de um double)
+        pass
+    return pesos
+
 def dijkstra(graph, start_node):
     distances = {node: math.inf for node in graph.get_nodes()}
     predecessors = {node: None for node in graph.get_nodes()}
@@ -40,56 +135,195 @@ def dijkstra(graph, start_node):
 
     # Fila de Prioridade (Min-Heap): armazena tuplas (distância, nó)
     priority_queue = [(0, start_node)]
+    c = instrumentacao.ativo # Contadores opcionais (ver instrumentacao.py)
 
     while priority_queue:
         # Extrai o nó com a menor distância (O(log V))
         current_distance, current_node = heapq.heappop(priority_queue)
+        if c is not None:
+            c["pops"] += 1
 
         # Se a distância extraída for maior que a distância já conhecida (redundância da heap), ignore.
         if current_distance > distances[current_node]:
+            if c is not None:
+                c["pops_obsoletos"] += 1
             continue
 
         # Explora os vizinhos
         for neighbor, weight in graph.adj.get(current_node, []):
             distance = current_distance + weight
+            if c is not None:
+                c["arestas_examinadas"] += 1
 
             # Relaxamento: se um caminho mais curto for encontrado, atualiza a distância e o predecessor
             if distance < distances[neighbor]:
                 distances[neighbor] = distance
                 predecessors[neighbor] = current_node
+                if c is not None:
+                    c["relaxamentos"] += 1
 
                 # Adiciona o vizinho à fila de prioridade (O(log V))
                 heapq.heappush(priority_queue, (distance, neighbor))
 
     return distances, predecessors
 
-def find_and_visualize_shortest_path(graph, start_node, end_node):
-    distances, predecessors = dijkstra(graph, start_node)
+def dijkstra_csr(csr, start_node):
+    """Dijkstra sobre CSRGraph: listas indexadas por id em vez de dicionários por rótulo.
+
+    Retorna (distances, predecessors) como listas de tamanho V; o predecessor
+    é um id (-1 se não houver). csr.to_labels() converte para o formato de dijkstra.
+    """
+    start = csr.ids.get(start_node)
+    if start is None:
+        raise ValueError(f"Nó inicial '{start_node}' não existe no grafo.")
+    offsets, targets, weights = csr.offsets, csr.targets, csr.weights
+    distances = [math.inf] * len(csr.labels)
+    predecessors = [-1] * len(csr.labels)
+    distances[start] = 0
+    priority_queue = [(0, start)]
+    heappop, heappush = heapq.heappop, heapq.heappush
+    c = instrumentacao.ativo
+
+    while priority_queue:
+        current_distance, u = heappop(priority_queue)
+        if c is not None:
+            c["pops"] += 1
+        if current_distance > distances[u]:
+            if c is not None:
+                c["pops_obsoletos"] += 1
+            continue
+        lo, hi = offsets[u], offsets[u + 1]
+        if c is not None:
+            c["arestas_examinadas"] += hi - lo
+        # Fatias dos arrays: a cópia é feita em C, mais barata que indexar aresta a aresta
+        for v, weight in zip(targets[lo:hi], weights[lo:hi]):
+            distance = current_distance + weight
+            if distance < distances[v]:
+                distances[v] = distance
+                predecessors[v] = u
+                if c is not None:
+                    c["relaxamentos"] += 1
+                heappush(priority_queue, (distance, v))
+
+    return distances, predecessors
+
+# --- CONSULTAS PONTO A PONTO ---
+# shortest_path responde uma consulta s -> t sem imprimir nada. O estado
+# (distâncias e predecessores) é criado só para os nós alcançados, então o
+# custo depende da região explorada e não do tamanho do grafo; a busca para
+# assim que o destino sai do heap. Com bidirectional=True, duas buscas (a partir
+# de s e de t) avançam alternadamente e param quando a soma dos topos dos heaps
+# alcança o melhor caminho já visto. A busca reversa usa o próprio `adj`: vale
+# para grafos montados com add_edge (não-direcionados, adjacência simétrica).
 
-    if end_node not in distances:
+def _validar_nos(graph, start_node, end_node):
+    if start_node not in graph.adj:
+        raise ValueError(f"Nó inicial '{start_node}' não existe no grafo.")
+    if end_node not in graph.adj:
         raise ValueError(f"Nó destino '{end_node}' não existe no grafo.")
 
-    min_distance = distances[end_node]
+def _caminho_ate(predecessors, node):
+    """Caminho da origem da busca até `node`, seguindo os predecessores."""
     path = []
-    current = end_node
+    while node is not None:
+        path.append(node)
+        node = predecessors[node]
+    path.reverse()
+    return path
 
-    # 2. Reconstrução do Caminho
-    if min_distance == math.inf:
-        print(f"\n[Resultado] Não há caminho entre {start_node} e {end_node}.")
-        return [], math.inf
+def shortest_path(graph, start_node, end_node, bidirectional=False):
+    """Caminho mínimo start_node -> end_node, sem imprimir: (path, distância) ou ([], math.inf)."""
+    _validar_nos(graph, start_node, end_node)
+    if bidirectional:
+        return _dijkstra_bidirecional(graph, start_node, end_node)
+    distances = {start_node: 0}
+    predecessors = {start_node: None}
+    priority_queue = [(0, start_node)]
+    adj = graph.adj
+    inf = math.inf
+    c = instrumentacao.ativo
+
+    while priority_queue:
+        current_distance, current_node = heapq.heappop(priority_queue)
+        if c is not None:
+            c["pops"] += 1
+        if current_distance > distances[current_node]:
+            if c is not None:
+                c["pops_obsoletos"] += 1
+            continue
+        if current_node == end_node: # Destino assentado: a distância é definitiva
+            return _caminho_ate(predecessors, end_node), current_distance
+        for neighbor, weight in adj[current_node]:
+            distance = current_distance + weight
+            if c is not None:
+                c["arestas_examinadas"] += 1
+            if distance < distances.get(neighbor, inf):
+                distances[neighbor] = distance
+                predecessors[neighbor] = current_node
+                if c is not None:
+                    c["relaxamentos"] += 1
+                heapq.heappush(priority_queue, (distance, neighbor))
+    return [], math.inf
+
+def _dijkstra_bidirecional(graph, start_node, end_node):
+    if start_node == end_node:
+        return [start_node], 0
+    adj = graph.adj
+    inf = math.inf
+    # Índice 0: busca a partir da origem; 1: a partir do destino
+    distances = ({start_node: 0}, {end_node: 0})
+    predecessors = ({start_node: None}, {end_node: None})
+    queues = ([(0, start_node)], [(0, end_node)])
+    best, meeting = inf, None
+    c = instrumentacao.ativo
 
-    while current is not None:
-        path.append(current)
-        current = predecessors[current]
+    while queues[0] and queues[1]:
+        if queues[0][0][0] + queues[1][0][0] >= best:
+            break # Nenhum caminho ainda não visto pode ser menor que `best`
+        side = 0 if queues[0][0][0] <= queues[1][0][0] else 1
+        dist, other = distances[side], distances[1 - side]
+        current_distance, current_node = heapq.heappop(queues[side])
+        if c is not None:
+            c["pops"] += 1
+        if current_distance > dist[current_node]:
+            if c is not None:
+                c["pops_obsoletos"] += 1
+            continue
+        for neighbor, weight in adj[current_node]:
+            distance = current_distance + weight
+            if c is not None:
+                c["arestas_examinadas"] += 1
+            if distance < dist.get(neighbor, inf):
+                dist[neighbor] = distance
+                predecessors[side][neighbor] = current_node
+                if c is not None:
+                    c["relaxamentos"] += 1
+                heapq.heappush(queues[side], (distance, neighbor))
+            if neighbor in other and distance + other[neighbor] < best:
+                best, meeting = distance + other[neighbor], neighbor
 
-    path.reverse() # O caminho é reconstruído do destino para a origem, então precisa ser invertido.
+    if meeting is None:
+        return [], math.inf
+    path = _caminho_ate(predecessors[0], meeting)
+    node = predecessors[1][meeting]
+    while node is not None: # Metade reversa: do encontro até o destino
+        path.append(node)
+        node = predecessors[1][node]
+    return path, best
 
-    # 3. Visualização (Requisito 5)
+def _imprimir_caminho(start_node, end_node, path, min_distance):
+    if not path:
+        print(f"\n[Resultado] Não há caminho entre {start_node} e {end_node}.")
+        return
     print(f"\n--- CAMINHO MÍNIMO ({start_node} -> {end_node}) ---")
     print(f"Distância Mínima: {min_distance}")
     print(f"Caminho: {' -> '.join(map(str, path))}")
     print("------------------------------------------")
 
+def find_and_visualize_shortest_path(graph, start_node, end_node, bidirectional=False):
+    """shortest_path seguido da impressão do resultado (Requisito 5)."""
+    path, min_distance = shortest_path(graph, start_node, end_node, bidirectional)
+    _imprimir_caminho(start_node, end_node, path, min_distance)
     return path, min_distance
 
 # --- Testes de Validação ---
@@ -146,4 +380,23 @@ if __name__ == "__main__":
     print("\n--- TESTE 4: Origem e Destino Iguais (A para A) ---")
     path4, dist4 = find_and_visualize_shortest_path(G, 'A', 'A')
     assert dist4 == 0, f"Teste 4 falhou: Distância esperada 0, obtida {dist4}"
-    print("Teste 4: Sucesso.")
\ No newline at end of file
+    print("Teste 4: Sucesso.")
+    # ----------------------------------------------------
+    # Caso de Teste 5: Forma compacta (CSR) dá as mesmas distâncias
+    # ----------------------------------------------------
+    print("\n--- TESTE 5: CSRGraph + dijkstra_csr ---")
+    csr = G.freeze()
+    print(csr)
+    dist5, pred5 = csr.to_labels(*dijkstra_csr(csr, 'A'))
+    assert dist5 == dijkstra(G, 'A')[0], "Teste 5 falhou: distâncias divergem de dijkstra"
+    assert pred5['Z'] == 'F' and pred5['A'] is None, "Teste 5 falhou: predecessores incorretos"
+    print("Teste 5: Sucesso.")
+
+    # ----------------------------------------------------
+    # Caso de Teste 6: Consulta silenciosa, unidirecional e bidirecional
+    # ----------------------------------------------------
+    print("\n--- TESTE 6: shortest_path (parada antecipada e bidirecional) ---")
+    for bidirecional in (False, True):
+        assert shortest_path(G, 'A', 'Z', bidirecional) == (['A', 'C', 'D', 'F', 'Z'], 7), "Teste 6 falhou"
+        assert shortest_path(G, 'A', 'K', bidirecional) == ([], math.inf), "Teste 6 falhou: K é isolado"
+    print("Teste 6: Sucesso.")
@@ -0,0 +1,259 @@
+import array
+import heapq
+import json
+import math
+import random
+import struct
+
+import instrumentacao
+from grafos import Graph, _caminho_ate, _validar_nos, dijkstra
+
+# Busca A* sobre grafos.Graph com heurísticas plugáveis e a variante ALT
+# (A*, Landmarks e desigualdade Triangular).
+#
+# Uma heurística é uma função h(nó, destino) que nunca superestima a distância
+# real (admissível). Com h = 0, astar é o Dijkstra com parada antecipada.
+#
+# ALT: para um landmark L com distâncias pré-calculadas d(L, ·) e d(·, L), a
+# desigualdade triangular dá dois limites inferiores para d(u, t):
+#     d(L, t) - d(L, u)    e    d(u, L) - d(t, L)
+# e a heurística é o maior deles entre todos os landmarks. As tabelas ficam
+# em arrays de doubles (8 bytes por nó e por tabela) na ordem de `labels`.
+# Elas valem para o grafo da construção: depois de add_edge, reconstrua.
+
+# --- HEURÍSTICAS ---
+def zero_heuristic(node, target):
+    """Heurística nula: A* vira Dijkstra com parada antecipada."""
+    return 0
+
+def euclidean_heuristic(coordinates, scale=1.0):
+    """h(u, t) = scale * distância em linha reta, para grafos geométricos.
+
+    Admissível se nenhuma aresta pesar menos que `scale` vezes a distância
+    entre as coordenadas dos seus extremos.
+    """
+    def heuristic(node, target):
+        (x1, y1), (x2, y2) = coordinates[node], coordinates[target]
+        return scale * math.hypot(x1 - x2, y1 - y2)
+    return heuristic
+
+# --- A* ---
+def astar(graph, start_node, end_node, heuristic=zero_heuristic):
+    """Caminho mínimo com A*: (path, distância) ou ([], math.inf), como grafos.shortest_path.
+
+    Nós já fechados são reabertos se um caminho melhor aparecer, então o
+    resultado é exato para qualquer heurística admissível (consistente ou não).
+    """
+    _validar_nos(graph, start_node, end_node)
+    distances = {start_node: 0}
+    predecessors = {start_node: None}
+    priority_queue = [(heuristic(start_node, end_node), 0, start_node)]
+    adj = graph.adj
+    inf = math.inf
+    c = instrumentacao.ativo
+
+    while priority_queue:
+        _, current_distance, current_node = heapq.heappop(priority_queue)
+        if c is not None:
+            c["pops"] += 1
+        if current_distance > distances[current_node]:
+            if c is not None:
+                c["pops_obsoletos"] += 1
+            continue
+        if current_node == end_node:
+            return _caminho_ate(predecessors, end_node), current_distance
+        for neighbor, weight in adj[current_node]:
+            distance = current_distance + weight
+            if c is not None:
+                c["arestas_examinadas"] += 1
+            if distance < distances.get(neighbor, inf):
+                distances[neighbor] = distance
+                predecessors[neighbor] = current_node
+                if c is not None:
+                    c["relaxamentos"] += 1
+                heapq.heappush(priority_queue, (distance + heuristic(neighbor, end_node), distance, neighbor))
+    return [], math.inf
+
+# --- ALT: LANDMARKS ---
+_MAGICO = b"ALT2"
+_CABECALHO = struct.Struct("<Q") # Tamanho do cabeçalho serializado
+
+class Landmarks:
+    """Tabelas de distância de/para k landmarks, para a heurística ALT.
+
+    `tables` tem um par (dist_from, dist_to) por landmark, arrays de V doubles
+    na ordem de `labels`; em grafos não-direcionados os dois são o mesmo array.
+    """
+
+    def __init__(self, labels, landmarks, tables):
+        self.labels = labels
+        self.index = {label: i for i, label in enumerate(labels)}
+        self.landmarks = landmarks
+        self.tables = tables
+
+    @classmethod
+    def build(cls, graph, k, seed=None, strategy="farthest", directed=False):
+        """Escolhe k landmarks e calcula as tabelas com grafos.dijkstra (k execuções, ou 2k se directed).
+
+        strategy="farthest": cada landmark é o nó mais distante dos já escolhidos
+        (o primeiro, o mais distante de um nó aleatório), o que espalha os
+        landmarks pela borda do grafo; "random": k nós aleatórios.
+        directed=True calcula d(·, L) no grafo reverso; senão d(·, L) = d(L, ·).
+        """
+        if strategy not in ("farthest", "random"):
+            raise ValueError(f"Estratégia de landmarks desconhecida: {strategy!r}.")
+        labels = graph.get_nodes()
+        k = min(k, len(labels))
+        rng = random.Random(seed)
+        reverse = _grafo_reverso(graph) if directed else None
+
+        def tabela(g, origem):
+            distances = dijkstra(g, origem)[0]
+            return array.array("d", [distances[label] for label in labels])
+
+        landmarks, tables = [], []
+        if strategy == "random":
+            candidatos = iter(rng.sample(labels, k))
+        else:
+            # Distância mínima de cada nó aos landmarks escolhidos (inicia por um nó aleatório)
+            minimas = tabela(graph, rng.choice(labels)) if labels else []
+        for _ in range(k):
+            if strategy == "random":
+                landmark = next(candidatos)
+            else:
+                alcancaveis = [i for i, d in enumerate(minimas) if d != math.inf]
+                landmark = labels[max(alcancaveis, key=minimas.__getitem__)]
+            dist_from = tabela(graph, landmark)
+            dist_to = tabela(reverse, landmark) if directed else dist_from
+            landmarks.append(landmark)
+            tables.append((dist_from, dist_to))
+            if strategy == "farthest":
+                minimas = array.array("d", map(min, minimas, dist_from))
+        return cls(labels, landmarks, tables)
+
+    def heuristic(self, node, target):
+        """Maior limite inferior de d(node, target) dado pelos landmarks (0 para nós fora das tabelas)."""
+        i = self.index.get(node)
+        j = self.index.get(target)
+        if i is None or j is None:
+            return 0
+        best = 0
+        for dist_from, dist_to in self.tables:
+            # inf - inf = nan falha nas duas comparações e é ignorado
+            bound = dist_from[j] - dist_from[i]
+            if bound > best:
+                best = bound
+            bound = dist_to[i] - dist_to[j]
+            if bound > best:
+                best = bound
+        return best
+
+    def nbytes(self):
+        """Bytes das tabelas de distância (arrays compartilhados contam uma vez)."""
+        unicos = {id(a): a for par in self.tables for a in par}
+        return sum(len(a) * a.itemsize for a in unicos.values())
+
+    # --- Persistência ---
+    # Formato: b"ALT2", tamanho do cabeçalho (u64), cabeçalho em JSON UTF-8
+    # ({"labels": [...], "landmarks": [índices em labels], "directed": bool}) e
+    # as tabelas como doubles crus. Carregar um arquivo não executa código;
+    # por isso os rótulos precisam ser str ou int (tipos que o JSON preserva).
+
+    def save(self, path):
+        if not all(type(label) in (str, int) for label in self.labels):
+            raise TypeError("Landmarks.save só aceita rótulos str ou int.")
+        directed = any(a is not b for a, b in self.tables)
+        cabecalho = json.dumps({
+            "labels": self.labels,
+            "landmarks": [self.index[landmark] for landmark in self.landmarks],
+            "directed": directed,
+        }).encode("utf-8")
+        with open(path, "wb") as arquivo:
+            arquivo.write(_MAGICO)
+            arquivo.write(_CABECALHO.pack(len(cabecalho)))
+            arquivo.write(cabecalho)
+            for dist_from, dist_to in self.tables:
+                dist_from.tofile(arquivo)
+                if directed:
+                    dist_to.tofile(arquivo)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as arquivo:
+            if arquivo.read(len(_MAGICO)) != _MAGICO:
+                raise ValueError(f"{path!r} não é um arquivo de landmarks ALT.")
+            (tamanho,) = _CABECALHO.unpack(arquivo.read(_CABECALHO.size))
+            cabecalho = json.loads(arquivo.read(tamanho).decode("utf-8")) # Erros de formato são ValueError
+            labels, directed = cabecalho["labels"], cabecalho["directed"]
+            landmarks = [labels[i] for i in cabecalho["landmarks"]]
+            tables = []
+            for _ in landmarks:
+                dist_from = array.array("d")
+                dist_from.fromfile(arquivo, len(labels))
+                dist_to = dist_from
+                if directed:
+                    dist_to = array.array("d")
+                    dist_to.fromfile(arquivo, len(labels))
+                tables.append((dist_from, dist_to))
+        return cls(labels, landmarks, tables)
+
+    def __repr__(self):
+        return f"Landmarks({len(self.landmarks)} landmarks, {len(self.labels)} nós, {self.nbytes()} bytes)"
+
+def _grafo_reverso(graph):
+    """Graph com todas as arestas de graph.adj invertidas (sem duplicar pela simetria de add_edge)."""
+    reverse = Graph()
+    for node in graph.adj:
+        reverse.adj[node] = []
+    for node, edges in graph.adj.items():
+        for neighbor, weight in edges:
+            reverse.adj[neighbor].append((node, weight))
+    return reverse
+
+def alt_shortest_path(graph, landmarks, start_node, end_node):
+    """A* com a heurística ALT das tabelas de `landmarks`."""
+    return astar(graph, start_node, end_node, landmarks.heuristic)
+
+# --- Testes de Validação ---
+if __name__ == "__main__":
+    import os
+    import tempfile
+
+    G = Graph()
+    for origem, destino, peso in [('A', 'B', 4), ('A', 'C', 2), ('B', 'E', 3), ('C', 'D', 2), ('C', 'F', 4),
+                                  ('D', 'E', 3), ('D', 'F', 1), ('E', 'Z', 1), ('F', 'Z', 2)]:
+        G.add_edge(origem, destino, peso)
+    G.adj['K'] = [] # Nó isolado
+
+    print("--- TESTE 1: A* com heurística nula e com landmarks ---")
+    marcos = Landmarks.build(G, 2, seed=0)
+    print(marcos, "->", marcos.landmarks)
+    for heuristica in (zero_heuristic, marcos.heuristic):
+        assert astar(G, 'A', 'Z', heuristica) == (['A', 'C', 'D', 'F', 'Z'], 7), "Teste 1 falhou"
+        assert astar(G, 'A', 'K', heuristica) == ([], math.inf), "Teste 1 falhou: K é isolado"
+    for u in G.adj:
+        for t in G.adj:
+            assert marcos.heuristic(u, t) <= astar(G, u, t)[1], "Teste 1 falhou: heurística não admissível"
+    print("Teste 1: Sucesso.")
+
+    print("\n--- TESTE 2: Salvar e carregar as tabelas ---")
+    descritor, caminho = tempfile.mkstemp(suffix=".alt")
+    os.close(descritor)
+    try:
+        marcos.save(caminho)
+        carregados = Landmarks.load(caminho)
+    finally:
+        os.remove(caminho)
+    assert carregados.landmarks == marcos.landmarks and carregados.tables == marcos.tables, "Teste 2 falhou"
+    assert alt_shortest_path(G, carregados, 'B', 'F') == astar(G, 'B', 'F'), "Teste 2 falhou"
+    print("Teste 2: Sucesso.")
+
+    print("\n--- TESTE 3: Heurística euclidiana ---")
+    coordenadas = {'S': (0, 0), 'M': (1, 0), 'N': (0, 1), 'T': (2, 0)}
+    H = Graph()
+    H.add_edge('S', 'M', 1)
+    H.add_edge('M', 'T', 1.5)
+    H.add_edge('S', 'N', 1)
+    H.add_edge('N', 'T', 2.5)
+    assert astar(H, 'S', 'T', euclidean_heuristic(coordenadas)) == (['S', 'M', 'T'], 2.5), "Teste 3 falhou"
+    print("Teste 3: Sucesso.")
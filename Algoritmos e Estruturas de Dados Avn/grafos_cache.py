@@ -0,0 +1,201 @@
+import collections
+import math
+import sys
+
+from grafos import Graph, _caminho_ate, _imprimir_caminho, _validar_nos, dijkstra, shortest_path
+
+# Cache de caminhos mínimos sobre um grafos.Graph, para serviços com muitas
+# consultas repetidas a partir de poucas origens "quentes".
+#
+# - Árvores por origem: o resultado completo de dijkstra(graph, s). Responde
+#   dijkstra(s) e qualquer consulta s -> t com a reconstrução do caminho.
+# - Resultados ponto a ponto: (path, distância) de shortest_path(s, t), mais
+#   baratos de calcular quando a origem é consultada uma única vez. Na
+#   `tree_after`-ésima falta ponto a ponto da mesma origem, calcula-se a árvore.
+#
+# Despejo LRU por número de entradas e/ou por bytes (estimados). Cada entrada
+# guarda a versão do grafo (Graph.version) em que foi calculada; uma versão
+# diferente na leitura conta como invalidação. Mudanças feitas por
+# cache.add_edge são mais finas: uma árvore só é descartada se a nova aresta
+# encurtar alguma distância dela (du + w < dv ou dv + w < du); as demais
+# continuam válidas. Os resultados retornados são compartilhados com o cache:
+# não os modifique.
+
+BYTES_POR_NO_ARVORE = 2 * 8 + 24 # Referências nos dois dicionários + o objeto float da distância
+
+class ShortestPathCache:
+    """Memoiza dijkstra e shortest_path de um Graph, com LRU e invalidação por versão."""
+
+    def __init__(self, graph, max_entries=128, max_bytes=None, tree_after=2):
+        self.graph = graph
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.tree_after = tree_after
+        # chave -> [versão do grafo, bytes estimados, resultado]
+        # ("arvore", s) -> (distances, predecessors); ("p2p", s, t) -> (path, distância)
+        self._entries = collections.OrderedDict()
+        self._misses_por_origem = collections.Counter()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.evictions = 0
+
+    # --- Armazenamento LRU ---
+    def _get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] != self.graph.version:
+            self._discard(key)
+            self.invalidations += 1
+            return None
+        self._entries.move_to_end(key)
+        return entry[2]
+
+    def _put(self, key, result, size):
+        if key in self._entries:
+            self._discard(key)
+        self._entries[key] = [self.graph.version, size, result]
+        self.bytes += size
+        while self._entries and ((self.max_entries is not None and len(self._entries) > self.max_entries)
+                                 or (self.max_bytes is not None and self.bytes > self.max_bytes)):
+            self._discard(next(iter(self._entries))) # Menos usado recentemente
+            self.evictions += 1
+
+    def _discard(self, key):
+        self.bytes -= self._entries.pop(key)[1]
+
+    @staticmethod
+    def _tamanho_arvore(distances, predecessors):
+        return sys.getsizeof(distances) + sys.getsizeof(predecessors) + BYTES_POR_NO_ARVORE * len(distances)
+
+    # --- Consultas ---
+    def dijkstra(self, start_node):
+        """Como grafos.dijkstra(graph, start_node), memoizado por origem."""
+        tree = self._get(("arvore", start_node))
+        if tree is not None:
+            self.hits += 1
+            return tree
+        self.misses += 1
+        return self._calcular_arvore(start_node)
+
+    def _calcular_arvore(self, start_node):
+        tree = dijkstra(self.graph, start_node)
+        self._misses_por_origem.pop(start_node, None)
+        self._put(("arvore", start_node), tree, self._tamanho_arvore(*tree))
+        return tree
+
+    def shortest_path(self, start_node, end_node, bidirectional=False):
+        """Como grafos.shortest_path, respondendo pela árvore da origem ou pelo resultado memoizado."""
+        _validar_nos(self.graph, start_node, end_node)
+        tree = self._get(("arvore", start_node))
+        if tree is None:
+            result = self._get(("p2p", start_node, end_node))
+            if result is not None:
+                self.hits += 1
+                return result
+            self.misses += 1
+            self._misses_por_origem[start_node] += 1
+            if self._misses_por_origem[start_node] < self.tree_after:
+                if len(self._misses_por_origem) > 4 * (self.max_entries or 1024):
+                    self._misses_por_origem.clear() # Mantém o contador limitado
+                    self._misses_por_origem[start_node] = 1
+                result = shortest_path(self.graph, start_node, end_node, bidirectional)
+                self._put(("p2p", start_node, end_node), result, sys.getsizeof(result[0]) + 8 * len(result[0]))
+                return result
+            tree = self._calcular_arvore(start_node) # Origem recorrente: vale a pena a árvore inteira
+        else:
+            self.hits += 1
+        distances, predecessors = tree
+        if distances[end_node] == math.inf:
+            return [], math.inf
+        return _caminho_ate(predecessors, end_node), distances[end_node]
+
+    def find_and_visualize_shortest_path(self, start_node, end_node, bidirectional=False):
+        path, min_distance = self.shortest_path(start_node, end_node, bidirectional)
+        _imprimir_caminho(start_node, end_node, path, min_distance)
+        return path, min_distance
+
+    # --- Mutação e Invalidação ---
+    def add_edge(self, source, destination, weight):
+        """graph.add_edge, descartando só as árvores que a nova aresta encurta.
+
+        Resultados ponto a ponto são sempre descartados: sem a árvore da origem
+        não há como saber se a aresta cria um atalho.
+        """
+        version = self.graph.version
+        self.graph.add_edge(source, destination, weight)
+        for key in list(self._entries):
+            entry = self._entries[key]
+            if entry[0] != version:
+                continue # Já obsoleta (o grafo mudou por fora do cache); é descartada na leitura
+            if key[0] == "arvore":
+                distances = entry[2][0]
+                if source in distances and destination in distances:
+                    du, dv = distances[source], distances[destination]
+                    if not (du + weight < dv or dv + weight < du):
+                        entry[0] = self.graph.version # A árvore continua exata
+                        continue
+            self._discard(key)
+            self.invalidations += 1
+
+    def clear(self):
+        self._entries.clear()
+        self._misses_por_origem.clear()
+        self.bytes = 0
+
+    def stats(self):
+        """Acertos, faltas, invalidações, despejos LRU, entradas e bytes estimados."""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "invalidations": self.invalidations,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+        }
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __repr__(self):
+        return f"ShortestPathCache({len(self._entries)} entradas, {self.bytes} bytes, {self.hits} acertos, {self.misses} faltas)"
+
+# --- Testes de Validação ---
+if __name__ == "__main__":
+    G = Graph()
+    for origem, destino, peso in [('A', 'B', 4), ('A', 'C', 2), ('B', 'E', 3), ('C', 'D', 2), ('C', 'F', 4),
+                                  ('D', 'E', 3), ('D', 'F', 1), ('E', 'Z', 1), ('F', 'Z', 2)]:
+        G.add_edge(origem, destino, peso)
+
+    print("--- TESTE 1: Acertos e faltas ---")
+    cache = ShortestPathCache(G, max_entries=4)
+    assert cache.shortest_path('A', 'Z') == (['A', 'C', 'D', 'F', 'Z'], 7) # Falta: ponto a ponto
+    assert cache.shortest_path('A', 'Z') == (['A', 'C', 'D', 'F', 'Z'], 7) # Acerto
+    assert cache.shortest_path('A', 'E')[1] == 7 # Segunda falta de A: calcula a árvore
+    assert cache.shortest_path('A', 'B')[1] == 4 # Acerto pela árvore
+    assert cache.dijkstra('A')[0] == dijkstra(G, 'A')[0]
+    print(cache.stats())
+    assert (cache.hits, cache.misses) == (3, 2), "Teste 1 falhou"
+    print("Teste 1: Sucesso.")
+
+    print("\n--- TESTE 2: Invalidação por add_edge ---")
+    cache.add_edge('B', 'Z', 100) # Não encurta nada a partir de A: a árvore continua válida
+    assert cache.shortest_path('A', 'Z')[1] == 7 and cache.invalidations == 1, "Teste 2 falhou" # Só o resultado p2p caiu
+    cache.add_edge('A', 'Z', 1) # Encurta: a árvore de A é descartada
+    assert cache.shortest_path('A', 'Z') == (['A', 'Z'], 1), "Teste 2 falhou"
+    G.add_edge('A', 'E', 0.5) # Mudança por fora do cache: detectada pela versão
+    assert cache.shortest_path('A', 'E') == (['A', 'E'], 0.5), "Teste 2 falhou"
+    print(cache.stats())
+    print("Teste 2: Sucesso.")
+
+    print("\n--- TESTE 3: Limite de bytes (LRU) ---")
+    pequeno = ShortestPathCache(G, max_entries=None, max_bytes=2000, tree_after=1)
+    for origem in G.adj:
+        pequeno.dijkstra(origem)
+    assert pequeno.bytes <= 2000 and pequeno.evictions > 0, "Teste 3 falhou"
+    print(pequeno)
+    print("Teste 3: Sucesso.")
@@ -0,0 +1,231 @@
+import heapq
+import math
+
+import instrumentacao
+from grafos import Graph, shortest_path
+
+# Contraction Hierarchies (CH) para grafos.Graph estáticos e não-direcionados
+# (adjacência simétrica, como a montada por add_edge).
+#
+# Pré-processamento: os nós são contraídos um a um, em ordem de prioridade
+# 2 x edge difference (atalhos criados - arestas removidas) + vizinhos já
+# contraídos + nível na hierarquia, com atualização preguiçosa: a prioridade é
+# recalculada ao sair do heap e o nó volta para o heap se piorou. Contrair v liga cada par de
+# vizinhos u, w ainda não contraídos por um atalho u-w de peso
+# d(u, v) + d(v, w), a menos que uma busca de testemunha (Dijkstra local que
+# evita v, limitada em distância e em nós assentados) ache um caminho tão curto
+# quanto. Uma testemunha não encontrada só gera um atalho a mais, nunca um
+# resultado errado.
+#
+# Consulta: duas buscas de Dijkstra a partir de s e de t que só sobem na
+# hierarquia (arestas para nós contraídos depois). O caminho mínimo passa por
+# um nó de nível máximo onde as duas se encontram; os atalhos são desfeitos
+# recursivamente até as arestas originais. Stall-on-demand: um nó alcançado
+# por um caminho mais curto vindo de cima não expande suas arestas.
+
+LIMITE_TESTEMUNHA = 64 # Nós assentados por busca de testemunha
+
+class ContractionHierarchy:
+    """Hierarquia de contração pré-calculada; shortest_path(s, t) responde consultas em ~ms."""
+
+    def __init__(self, labels, rank, up, middle, num_shortcuts):
+        self.labels = labels
+        self.ids = {label: i for i, label in enumerate(labels)}
+        self.rank = rank # Ordem de contração de cada id
+        self.up = up # up[u] = [(w, peso), ...] com rank[w] > rank[u]
+        self.middle = middle # middle[(u, w)] = nó contraído que o atalho u-w pula (u de menor rank)
+        self.num_shortcuts = num_shortcuts
+
+    @classmethod
+    def build(cls, graph, witness_limit=LIMITE_TESTEMUNHA):
+        labels = graph.get_nodes()
+        ids = {label: i for i, label in enumerate(labels)}
+        n = len(labels)
+        # Grafo restante: adj[u] = {w: peso}, só com o menor peso entre arestas paralelas
+        adj = [{} for _ in range(n)]
+        for label, edges in graph.adj.items():
+            u = ids[label]
+            for neighbor, weight in edges:
+                w = ids[neighbor]
+                if w != u and weight < adj[u].get(w, math.inf):
+                    adj[u][w] = weight
+                    adj[w][u] = weight
+        middle = {}
+        contracted_neighbors = [0] * n
+        depth = [0] * n # Nível na hierarquia: 1 + o maior nível dos vizinhos contraídos antes
+        rank = [0] * n
+        up = [None] * n
+
+        def priority(v, shortcuts):
+            return 2 * (len(shortcuts) - len(adj[v])) + contracted_neighbors[v] + depth[v]
+
+        queue = [(priority(v, cls._shortcuts(adj, v, witness_limit)), v) for v in range(n)]
+        heapq.heapify(queue)
+        order = 0
+        while queue:
+            _, v = heapq.heappop(queue)
+            shortcuts = cls._shortcuts(adj, v, witness_limit)
+            current = priority(v, shortcuts)
+            if queue and current > queue[0][0]:
+                heapq.heappush(queue, (current, v)) # Prioridade desatualizada: reavalia depois
+                continue
+            for u, w, weight in shortcuts:
+                if weight < adj[u].get(w, math.inf):
+                    adj[u][w] = weight
+                    adj[w][u] = weight
+                    middle[(u, w)] = middle[(w, u)] = v
+            # As arestas que restam em v vão para nós contraídos depois: são as arestas de subida
+            rank[v] = order
+            order += 1
+            up[v] = list(adj[v].items())
+            for u in adj[v]:
+                del adj[u][v]
+                contracted_neighbors[u] += 1
+                depth[u] = max(depth[u], depth[v] + 1)
+            adj[v] = {}
+
+        # Guarda só o nó do meio indexado pelo extremo de menor rank
+        middle = {(u, w): m for (u, w), m in middle.items() if rank[u] < rank[w]}
+        return cls(labels, rank, up, middle, len(middle))
+
+    @staticmethod
+    def _shortcuts(adj, v, witness_limit):
+        """Atalhos (u, w, peso) necessários para contrair v, com u < w."""
+        neighbors = adj[v]
+        shortcuts = []
+        for u, weight_u in neighbors.items():
+            targets = {w: weight_u + weight_w for w, weight_w in neighbors.items() if w > u}
+            if not targets:
+                continue
+            witness = ContractionHierarchy._witness_search(adj, u, v, max(targets.values()), witness_limit)
+            for w, via_v in targets.items():
+                if via_v < witness.get(w, math.inf):
+                    shortcuts.append((u, w, via_v))
+        return shortcuts
+
+    @staticmethod
+    def _witness_search(adj, source, skip, max_distance, limit):
+        """Dijkstra local a partir de `source` sem passar por `skip`; retorna as distâncias (tentativas)."""
+        distances = {source: 0}
+        priority_queue = [(0, source)]
+        settled = 0
+        c = instrumentacao.ativo
+        while priority_queue and settled < limit:
+            current_distance, current_node = heapq.heappop(priority_queue)
+            if current_distance > distances[current_node]:
+                continue
+            if current_distance > max_distance:
+                break
+            settled += 1
+            if c is not None:
+                c["testemunhas_assentados"] += 1
+            for neighbor, weight in adj[current_node].items():
+                if neighbor == skip:
+                    continue
+                distance = current_distance + weight
+                if distance < distances.get(neighbor, math.inf):
+                    distances[neighbor] = distance
+                    heapq.heappush(priority_queue, (distance, neighbor))
+        return distances
+
+    # --- Consulta ---
+    def shortest_path(self, start_node, end_node):
+        """(path, distância) como grafos.shortest_path; ([], math.inf) se não houver caminho."""
+        if start_node not in self.ids:
+            raise ValueError(f"Nó inicial '{start_node}' não existe no grafo.")
+        if end_node not in self.ids:
+            raise ValueError(f"Nó destino '{end_node}' não existe no grafo.")
+        s, t = self.ids[start_node], self.ids[end_node]
+        up = self.up
+        inf = math.inf
+        distances = ({s: 0}, {t: 0})
+        predecessors = ({s: None}, {t: None})
+        queues = ([(0, s)], [(0, t)])
+        best, meeting = (0, s) if s == t else (inf, None)
+        c = instrumentacao.ativo
+
+        while True:
+            key_f = queues[0][0][0] if queues[0] else inf
+            key_b = queues[1][0][0] if queues[1] else inf
+            if min(key_f, key_b) >= best:
+                break
+            side = 0 if key_f <= key_b else 1
+            dist, other = distances[side], distances[1 - side]
+            current_distance, u = heapq.heappop(queues[side])
+            if c is not None:
+                c["pops"] += 1
+            if current_distance > dist[u]:
+                if c is not None:
+                    c["pops_obsoletos"] += 1
+                continue
+            if u in other and current_distance + other[u] < best:
+                best, meeting = current_distance + other[u], u
+            if any(dist.get(w, inf) + weight < current_distance for w, weight in up[u]):
+                if c is not None:
+                    c["nos_parados"] += 1
+                continue # Stall-on-demand: u não está em um caminho mínimo desta busca
+            for w, weight in up[u]:
+                distance = current_distance + weight
+                if c is not None:
+                    c["arestas_examinadas"] += 1
+                if distance < dist.get(w, inf):
+                    dist[w] = distance
+                    predecessors[side][w] = u
+                    heapq.heappush(queues[side], (distance, w))
+
+        if meeting is None:
+            return [], math.inf
+        # Caminho na hierarquia: s ... encontro ... t (com atalhos)
+        forward = []
+        node = meeting
+        while node is not None:
+            forward.append(node)
+            node = predecessors[0][node]
+        forward.reverse()
+        node = predecessors[1][meeting]
+        while node is not None:
+            forward.append(node)
+            node = predecessors[1][node]
+        labels = self.labels
+        return [labels[i] for i in self._unpack(forward)], best
+
+    def _unpack(self, path):
+        """Substitui cada atalho do caminho pelos nós que ele pula, até restarem arestas originais."""
+        rank, middle = self.rank, self.middle
+        result = [path[0]]
+        # Pilha de arestas a expandir, em ordem inversa (a próxima aresta fica no topo)
+        stack = [(path[i], path[i + 1]) for i in range(len(path) - 2, -1, -1)]
+        while stack:
+            u, w = stack.pop()
+            m = middle.get((u, w) if rank[u] < rank[w] else (w, u))
+            if m is None:
+                result.append(w)
+            else:
+                stack.append((m, w))
+                stack.append((u, m))
+        return result
+
+    def __repr__(self):
+        return f"ContractionHierarchy({len(self.labels)} nós, {self.num_shortcuts} atalhos)"
+
+# --- Testes de Validação ---
+if __name__ == "__main__":
+    G = Graph()
+    for origem, destino, peso in [('A', 'B', 4), ('A', 'C', 2), ('B', 'E', 3), ('C', 'D', 2), ('C', 'F', 4),
+                                  ('D', 'E', 3), ('D', 'F', 1), ('E', 'Z', 1), ('F', 'Z', 2)]:
+        G.add_edge(origem, destino, peso)
+    G.adj['K'] = [] # Nó isolado
+
+    print("--- TESTE 1: Consultas na hierarquia ---")
+    ch = ContractionHierarchy.build(G)
+    print(ch)
+    assert ch.shortest_path('A', 'Z') == (['A', 'C', 'D', 'F', 'Z'], 7), "Teste 1 falhou"
+    assert ch.shortest_path('A', 'K') == ([], math.inf), "Teste 1 falhou: K é isolado"
+    assert ch.shortest_path('E', 'E') == (['E'], 0), "Teste 1 falhou: origem = destino"
+    print("Teste 1: Sucesso.")
+
+    print("\n--- TESTE 2: Mesmas distâncias que shortest_path ---")
+    for s in G.adj:
+        for t in G.adj:
+            assert ch.shortest_path(s, t)[1] == shortest_path(G, s, t)[1], f"Teste 2 falhou em {s} -> {t}"
+    print("Teste 2: Sucesso.")
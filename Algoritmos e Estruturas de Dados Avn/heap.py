@@ -1,13 +1,35 @@
+import argparse
+import gc
 import heapq
 import itertools
+import random
+import time
+
+import instrumentacao
+
+REPR_MAX_ITENS = 20 # __repr__ mostra só as tarefas mais prioritárias
+COMPACTACAO_MIN_HEAP = 64 # Heaps menores que isso nunca são compactados
+LOTE_ORDENACAO = 4 # pop_many ordena o heap quando k >= tamanho / LOTE_ORDENACAO
+
+def _repr_fila(nome, entries, total):
+    """Representação limitada: as REPR_MAX_ITENS tarefas mais prioritárias, em O(n log k)."""
+    items = [(entry[0], entry[2]) for entry in heapq.nsmallest(REPR_MAX_ITENS, entries, key=lambda e: e[0])]
+    if total > len(items):
+        return f"{nome}({items} ... +{total - len(items)} tarefas)"
+    return f"{nome}({items})"
 
 class PriorityQueue:
     REMOVED = "<removed-task>"
 
-    def __init__(self):
+    def __init__(self, compaction_threshold=0.5):
+        """compaction_threshold: fração de entradas obsoletas no heap que dispara a
+        reconstrução (heapify só das entradas vivas); None desliga a compactação."""
         self.heap = []  # lista de entradas: [priority, count, task]
         self.entry_finder = {}  # task -> entry
         self.counter = itertools.count()  # quebra empates
+        self.compaction_threshold = compaction_threshold
+        self.removed_count = 0  # entradas REMOVED ainda em self.heap
+        self.compactions = 0
 
     def add_task(self, task, priority=0):
         """Adiciona uma tarefa ou atualiza a prioridade se já existir."""
@@ -15,35 +37,300 @@ class PriorityQueue:
             # marca a entrada antiga como removida
             old_entry = self.entry_finder.pop(task)
             old_entry[2] = self.REMOVED
+            self.removed_count += 1
+            threshold = self.compaction_threshold
+            if threshold is not None and self.removed_count > threshold * len(self.heap):
+                self._compact()
         entry = [priority, next(self.counter), task]
         self.entry_finder[task] = entry
         heapq.heappush(self.heap, entry)
+        c = instrumentacao.ativo
+        if c is not None:
+            c["heap_sifts"] += 1
 
     def pop_task(self):
         """Remove e retorna a tarefa com menor prioridade. Levanta KeyError se vazio."""
+        c = instrumentacao.ativo
         while self.heap:
             priority, _, task = heapq.heappop(self.heap)
+            if c is not None:
+                c["heap_sifts"] += 1
             if task is not self.REMOVED and task != self.REMOVED:
                 # entrada válida
                 self.entry_finder.pop(task, None)
                 return task, priority
             # caso seja removida/obsoleta, ignora e continua
+            self.removed_count -= 1
+            if c is not None:
+                c["entradas_obsoletas_ignoradas"] += 1
         raise KeyError("pop from an empty priority queue")
 
     def change_priority(self, task, new_priority):
         """Altera a prioridade de uma tarefa existente (ou adiciona se não existir)."""
         self.add_task(task, new_priority)
 
+    def remove_task(self, task):
+        """Marca a tarefa como removida. Levanta KeyError se não existir."""
+        entry = self.entry_finder.pop(task)
+        entry[2] = self.REMOVED
+        self.removed_count += 1
+        threshold = self.compaction_threshold
+        if threshold is not None and self.removed_count > threshold * len(self.heap):
+            self._compact()
+
+    # --- Operações em lote ---
+
+    def add_many(self, items):
+        """Adiciona pares (task, priority) em lote; equivale a add_task em cada par, na ordem.
+
+        Se o lote for pelo menos do tamanho do heap (ou a fila estiver vazia),
+        as entradas são anexadas e o heap é reconstruído com heapify em O(n);
+        senão, cada entrada entra com heappush.
+        """
+        entry_finder, counter, REMOVED = self.entry_finder, self.counter, self.REMOVED
+        new_entries = []
+        removed = 0
+        for task, priority in items:
+            old_entry = entry_finder.pop(task, None)
+            if old_entry is not None:
+                old_entry[2] = REMOVED
+                removed += 1
+            entry = [priority, next(counter), task]
+            entry_finder[task] = entry
+            new_entries.append(entry)
+
+        heap = self.heap
+        if len(new_entries) >= len(heap):
+            heap.extend(new_entries)
+            heapq.heapify(heap)
+        else:
+            push = heapq.heappush
+            for entry in new_entries:
+                push(heap, entry)
+        c = instrumentacao.ativo
+        if c is not None:
+            c["heap_sifts"] += len(new_entries)
+        self.removed_count += removed
+        threshold = self.compaction_threshold
+        if removed and threshold is not None and self.removed_count > threshold * len(heap):
+            self._compact()
+
+    def pop_many(self, k):
+        """Remove e retorna até k tarefas [(task, priority), ...] em ordem de prioridade.
+
+        Diferente de pop_task, não levanta KeyError: devolve menos itens se a fila esvaziar.
+        """
+        heap, entry_finder, REMOVED = self.heap, self.entry_finder, self.REMOVED
+        pop = heapq.heappop
+        popped = []
+        skipped = 0
+        if k * LOTE_ORDENACAO >= len(heap):
+            # Lote grande: ordenar (em C) e cortar o prefixo custa menos que k
+            # heappops, e uma lista ordenada continua sendo um heap válido
+            heap.sort()
+            j = 0
+            while j < len(heap) and len(popped) < k:
+                priority, _, task = heap[j]
+                j += 1
+                if task is REMOVED:
+                    skipped += 1
+                    continue
+                del entry_finder[task]
+                popped.append((task, priority))
+            del heap[:j]
+        else:
+            while heap and len(popped) < k:
+                priority, _, task = pop(heap)
+                if task is REMOVED:
+                    skipped += 1
+                    continue
+                del entry_finder[task]
+                popped.append((task, priority))
+        self.removed_count -= skipped
+        c = instrumentacao.ativo
+        if c is not None:
+            c["heap_sifts"] += len(popped) + skipped
+            c["entradas_obsoletas_ignoradas"] += skipped
+        return popped
+
+    def peek(self):
+        """Retorna (task, priority) da tarefa com menor prioridade, sem removê-la.
+
+        Levanta KeyError se vazio. Entradas obsoletas no topo são descartadas.
+        """
+        heap = self.heap
+        while heap and heap[0][2] is self.REMOVED:
+            heapq.heappop(heap)
+            self.removed_count -= 1
+        if not heap:
+            raise KeyError("peek from an empty priority queue")
+        priority, _, task = heap[0]
+        return task, priority
+
+    def merge(self, other):
+        """Adiciona todas as tarefas de outra PriorityQueue (que não é alterada).
+
+        Tarefas presentes nas duas ficam com a prioridade de `other`; empates
+        entre tarefas de `other` mantêm a ordem que tinham lá, depois das
+        tarefas empatadas desta fila.
+        """
+        # entry_finder está na ordem do contador (toda atualização reinsere a
+        # chave no fim do dicionário), logo a ordem dos empates é preservada
+        self.add_many([(entry[2], entry[0]) for entry in other.entry_finder.values()])
+
+    def _compact(self):
+        """Reconstrói o heap só com as entradas vivas (chamada quando as obsoletas passam do limiar).
+
+        Cada compactação custa O(tamanho do heap), mas só ocorre depois de
+        ~threshold * tamanho atualizações: o custo amortizado continua O(log n).
+        """
+        if len(self.heap) < COMPACTACAO_MIN_HEAP:
+            return
+        # heapify preserva a ordem (priority, count), logo a ordem de remoção não muda
+        self.heap = [entry for entry in self.heap if entry[2] is not self.REMOVED]
+        heapq.heapify(self.heap)
+        self.removed_count = 0
+        self.compactions += 1
+
+    def stats(self):
+        """Contadores de memória: tarefas vivas, entradas obsoletas, tamanho do heap e compactações."""
+        return {
+            "live": len(self.entry_finder),
+            "dead": self.removed_count,
+            "heap_size": len(self.heap),
+            "compactions": self.compactions,
+        }
+
     def __len__(self):
         return len(self.entry_finder)
 
     def __repr__(self):
-        items = [(entry[0], entry[2]) for entry in self.entry_finder.values()]
-        items_sorted = sorted(items, key=lambda x: x[0])
-        return f"PriorityQueue({items_sorted})"
+        return _repr_fila(type(self).__name__, self.entry_finder.values(), len(self.entry_finder))
 
-def test_priority_queue():
-    pq = PriorityQueue()
+class IndexedPriorityQueue:
+    """Fila de prioridade com heap d-ário indexado, sem entradas obsoletas.
+
+    Mantém task -> posição no heap: change_priority ajusta a entrada no lugar
+    (sift-up/sift-down) e remove_task remove qualquer tarefa em O(log n). A
+    memória é proporcional às tarefas vivas, não ao total de atualizações.
+    Mesma interface e mesma ordem de remoção de PriorityQueue (empates por
+    ordem de inserção/atualização). Aridades maiores deixam a árvore mais
+    baixa ao custo de mais comparações por nível no sift-down; d=4..8
+    costuma ser o mais rápido (`python heap.py bench`).
+    """
+
+    def __init__(self, arity=8):
+        if arity < 2:
+            raise ValueError("A aridade do heap deve ser pelo menos 2.")
+        self.arity = arity
+        self.heap = []  # lista de entradas: [priority, count, task]
+        self.position = {}  # task -> índice da entrada em self.heap
+        self.counter = itertools.count()  # quebra empates
+
+    def add_task(self, task, priority=0):
+        """Adiciona uma tarefa ou atualiza a prioridade (no lugar) se já existir."""
+        i = self.position.get(task)
+        if i is None:
+            self.heap.append([priority, next(self.counter), task])
+            self._sift_up(len(self.heap) - 1)
+            return
+        entry = self.heap[i]
+        old_priority = entry[0]
+        entry[0] = priority
+        entry[1] = next(self.counter)  # como em PriorityQueue: vai para o fim entre os empates
+        if priority < old_priority:
+            self._sift_up(i)
+        else:
+            self._sift_down(i)
+
+    def pop_task(self):
+        """Remove e retorna a tarefa com menor prioridade. Levanta KeyError se vazio."""
+        if not self.heap:
+            raise KeyError("pop from an empty priority queue")
+        return self._remove_at(0)
+
+    def change_priority(self, task, new_priority):
+        """Altera a prioridade de uma tarefa existente (ou adiciona se não existir)."""
+        self.add_task(task, new_priority)
+
+    def remove_task(self, task):
+        """Remove a tarefa em O(log n). Levanta KeyError se não existir."""
+        self._remove_at(self.position[task])
+
+    def __len__(self):
+        return len(self.heap)
+
+    def __repr__(self):
+        return _repr_fila(type(self).__name__, self.heap, len(self))
+
+    # --- Operações internas do heap d-ário ---
+    # Entradas são listas [priority, count, task]: a comparação de listas usa
+    # priority e desempata por count (único), sem nunca comparar as tarefas.
+
+    def _remove_at(self, i):
+        heap = self.heap
+        last = heap.pop()
+        if i == len(heap):  # era a última entrada
+            entry = last
+        else:
+            entry = heap[i]
+            heap[i] = last
+            self.position[last[2]] = i
+            if last < entry:
+                self._sift_up(i)
+            else:
+                self._sift_down(i)
+        del self.position[entry[2]]
+        return entry[2], entry[0]
+
+    def _sift_up(self, i):
+        """Sobe a entrada de i até a posição correta (deslocando os pais para baixo)."""
+        heap, position, d = self.heap, self.position, self.arity
+        entry = heap[i]
+        while i > 0:
+            parent = (i - 1) // d
+            p = heap[parent]
+            if not entry < p:
+                break
+            heap[i] = p
+            position[p[2]] = i
+            i = parent
+        heap[i] = entry
+        position[entry[2]] = i
+        c = instrumentacao.ativo
+        if c is not None:
+            c["heap_sifts"] += 1
+
+    def _sift_down(self, i):
+        """Desce a entrada de i, trocando-a com o menor dos (até d) filhos."""
+        heap, position, d = self.heap, self.position, self.arity
+        n = len(heap)
+        entry = heap[i]
+        while True:
+            first = d * i + 1
+            if first >= n:
+                break
+            last = first + d if first + d < n else n
+            # Menor filho em uma única passada pelos índices, sem fatia temporária
+            child = first
+            smallest = heap[first]
+            for j in range(first + 1, last):
+                candidate = heap[j]
+                if candidate < smallest:
+                    child, smallest = j, candidate
+            if not smallest < entry:
+                break
+            heap[i] = smallest
+            position[smallest[2]] = i
+            i = child
+        heap[i] = entry
+        position[entry[2]] = i
+        c = instrumentacao.ativo
+        if c is not None:
+            c["heap_sifts"] += 1
+
+def test_priority_queue(cls=PriorityQueue):
+    pq = cls()
     # Exemplo com Linguagens de Programação -> Definição a Priorização de Estudos destas Linguagens
     print("Inicializando fila de prioridade e adicionando Linguagens de Programação...")
     pq.add_task("JavaScript", 5)
@@ -74,5 +361,188 @@ def test_priority_queue():
     assert [t for t, _ in popped] == [t for t, _ in expected_order], "Ordem de remoção incorreta"
     print("\nTeste concluído com sucesso.")
 
+def test_indexed_priority_queue():
+    """Mesmo cenário de test_priority_queue e equivalência com PriorityQueue em um trace aleatório."""
+    test_priority_queue(IndexedPriorityQueue)
+
+    print("\nRemovendo tarefas arbitrárias (remove_task)...")
+    pq = IndexedPriorityQueue()
+    for i, prio in enumerate([5, 1, 4, 1, 3, 9, 2, 6]):
+        pq.add_task(f"T{i}", prio)
+    pq.remove_task("T2")
+    pq.remove_task("T1")
+    restantes = [pq.pop_task() for _ in range(len(pq))]
+    assert restantes == [("T3", 1), ("T6", 2), ("T4", 3), ("T0", 5), ("T7", 6), ("T5", 9)], restantes
+
+    for arity in (2, 3, 4, 8):
+        trace = gerar_trace_atualizacoes(200, 5000, seed=arity)
+        esperado = executar_trace(PriorityQueue(compaction_threshold=None), trace)
+        assert executar_trace(IndexedPriorityQueue(arity), trace) == esperado
+        compactada = PriorityQueue(compaction_threshold=0.25)
+        assert executar_trace(compactada, trace) == esperado
+        assert compactada.compactions > 0
+    print("IndexedPriorityQueue e PriorityQueue compactada equivalentes à PriorityQueue sem compactação.")
+
+    print("\nOperações em lote (add_many, pop_many, peek, merge)...")
+    for trace_seed in range(3):
+        rng = random.Random(trace_seed)
+        lotes = [[(rng.randrange(300), rng.randrange(50)) for _ in range(rng.choice([5, 100, 1000]))]
+                 for _ in range(20)]
+        individual, em_lote = PriorityQueue(), PriorityQueue()
+        for lote in lotes:
+            for task, prio in lote:
+                individual.add_task(task, prio)
+            em_lote.add_many(lote)
+            topo = em_lote.peek()
+            assert len(em_lote) == len(individual) and topo == individual.pop_task()
+            individual.add_task(*topo) # Devolve a tarefa (vai para o fim entre os empates)
+            em_lote.add_task(*topo)
+            k = rng.randrange(200)
+            esperado = [individual.pop_task() for _ in range(min(k, len(individual)))]
+            assert em_lote.pop_many(k) == esperado
+    a, b = PriorityQueue(), PriorityQueue()
+    a.add_many([("x", 1), ("y", 2)])
+    b.add_many([("z", 1), ("y", 0), ("w", 1)])
+    a.merge(b)
+    assert len(b) == 3 and a.pop_many(10) == [("y", 0), ("x", 1), ("z", 1), ("w", 1)]
+    print("Lotes equivalentes às operações individuais.")
+
+    print("\nEstatísticas e __repr__ limitado:")
+    pq = PriorityQueue()
+    for i in range(1000):
+        pq.add_task(i % 100, i)
+    stats = pq.stats()
+    print(f"  {stats}")
+    assert stats["live"] == 100 and stats["dead"] <= 0.5 * stats["heap_size"]
+    print(f"  {pq!r}"[:120] + " ...")
+
+# --- BENCHMARK: CARGA COM MUITAS ATUALIZAÇÕES ---
+def gerar_trace_atualizacoes(n_tarefas, n_operacoes, fracao_atualizacoes=0.9, seed=None):
+    """Trace de operações: ("add", tarefa, prioridade) ou ("pop",).
+
+    Começa com n_tarefas inserções; depois, cada operação é uma mudança de
+    prioridade de uma tarefa aleatória (com probabilidade fracao_atualizacoes;
+    se a tarefa já saiu, ela volta à fila) ou uma remoção do mínimo.
+    """
+    rng = random.Random(seed)
+    trace = [("add", t, rng.random()) for t in range(n_tarefas)]
+    for _ in range(n_operacoes):
+        if rng.random() < fracao_atualizacoes:
+            trace.append(("add", rng.randrange(n_tarefas), rng.random()))
+        else:
+            trace.append(("pop",))
+    return trace
+
+def executar_trace(pq, trace):
+    """Aplica o trace na fila e retorna a lista de (tarefa, prioridade) removidas."""
+    removidas = []
+    add, pop = pq.add_task, pq.pop_task
+    for op in trace:
+        if op[0] == "add":
+            add(op[1], op[2])
+        elif len(pq):
+            removidas.append(pop())
+    return removidas
+
+def executar_benchmark_heap(n_tarefas, n_operacoes, aridades, fracao_atualizacoes=0.9, seed=None):
+    """Compara PriorityQueue (lazy deletion) com IndexedPriorityQueue em um trace com muitas atualizações."""
+    trace = gerar_trace_atualizacoes(n_tarefas, n_operacoes, fracao_atualizacoes, seed)
+    filas = [("Lazy deletion", lambda: PriorityQueue(compaction_threshold=None)),
+             ("Lazy + compactação", PriorityQueue)]
+    filas += [(f"Indexado d={d}", lambda d=d: IndexedPriorityQueue(d)) for d in aridades]
+
+    print(f"\nFILA DE PRIORIDADE: {n_tarefas} tarefas, {n_operacoes} operações "
+          f"({fracao_atualizacoes:.0%} atualizações)")
+    print("{:<20}{:>12}{:>14}{:>16}{:>14}".format("Implementação", "Tempo (s)", "Ops/s", "Entradas heap", "Tarefas vivas"))
+    print("-" * 76)
+    esperado = None
+    for nome, fabrica in filas:
+        pq = fabrica()
+        inicio = time.perf_counter()
+        removidas = executar_trace(pq, trace)
+        tempo = time.perf_counter() - inicio
+        if esperado is None:
+            esperado = removidas
+        elif removidas != esperado:
+            raise AssertionError(f"{nome} divergiu da PriorityQueue de referência.")
+        print("{:<20}{:>12.4f}{:>14.0f}{:>16}{:>14}".format(nome, tempo, len(trace) / tempo, len(pq.heap), len(pq)))
+
+def _encher_individual(lotes):
+    pq = PriorityQueue()
+    for lote in lotes:
+        for task, prio in lote:
+            pq.add_task(task, prio)
+    return pq
+
+def _encher_em_lote(lotes):
+    pq = PriorityQueue()
+    for lote in lotes:
+        pq.add_many(lote)
+    return pq
+
+def _esvaziar_individual(pq, tamanho):
+    removidas = []
+    while len(pq):
+        removidas.extend(pq.pop_task() for _ in range(min(tamanho, len(pq))))
+    return removidas
+
+def _esvaziar_em_lote(pq, tamanho):
+    removidas = []
+    while len(pq):
+        removidas.extend(pq.pop_many(tamanho))
+    return removidas
+
+def executar_benchmark_lote(n, tamanhos_lote, seed=None, repeticoes=3):
+    """Vazão (itens/s) de add_task/pop_task item a item vs. add_many/pop_many em lotes (melhor de `repeticoes`)."""
+    rng = random.Random(seed)
+    itens = [(t, rng.random()) for t in range(n)]
+
+    print(f"\nOPERAÇÕES EM LOTE: {n} tarefas (melhor de {repeticoes})")
+    print("{:>8}{:>18}{:>18}{:>18}{:>18}".format("Lote", "add_task (it/s)", "add_many (it/s)",
+                                                  "pop_task (it/s)", "pop_many (it/s)"))
+    print("-" * 80)
+    for tamanho in tamanhos_lote:
+        lotes = [itens[i:i + tamanho] for i in range(0, n, tamanho)]
+        vazoes = []
+        resultados = []
+        for encher, esvaziar in ((_encher_individual, _esvaziar_individual), (_encher_em_lote, _esvaziar_em_lote)):
+            t_add = t_pop = float("inf")
+            for _ in range(repeticoes):
+                gc.collect()
+                inicio = time.perf_counter()
+                pq = encher(lotes)
+                t_add = min(t_add, time.perf_counter() - inicio)
+                inicio = time.perf_counter()
+                removidas = esvaziar(pq, tamanho)
+                t_pop = min(t_pop, time.perf_counter() - inicio)
+            vazoes.append((n / t_add, n / t_pop))
+            resultados.append(removidas)
+        if resultados[0] != resultados[1]:
+            raise AssertionError(f"Lotes de {tamanho} divergiram das operações individuais.")
+        (add, pop), (add_lote, pop_lote) = vazoes
+        print("{:>8}{:>18.0f}{:>18.0f}{:>18.0f}{:>18.0f}".format(tamanho, add, add_lote, pop, pop_lote))
+
 if __name__ == "__main__":
-    test_priority_queue()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Fila de prioridade: testes e benchmark.")
+    sub = parser.add_subparsers(dest="comando")
+    p_bench = sub.add_parser("bench", help="Lazy deletion vs. heap indexado em um trace com muitas atualizações.")
+    p_bench.add_argument("--tarefas", type=int, default=10000, help="Tarefas distintas (padrão: 10000).")
+    p_bench.add_argument("--operacoes", type=int, default=500000, help="Operações do trace (padrão: 500000).")
+    p_bench.add_argument("--atualizacoes", type=float, default=0.9, help="Fração de atualizações (padrão: 0.9).")
+    p_bench.add_argument("--aridades", nargs="+", type=int, default=[2, 4, 8], help="Aridades do heap indexado.")
+    p_bench.add_argument("--seed", type=int, default=0, help="Semente do trace (padrão: 0).")
+    p_lote = sub.add_parser("lote", help="Operações item a item vs. add_many/pop_many.")
+    p_lote.add_argument("-n", type=int, default=200000, help="Número de tarefas (padrão: 200000).")
+    p_lote.add_argument("--lotes", nargs="+", type=int, default=[10, 1000, 100000],
+                        help="Tamanhos de lote (padrão: 10 1000 100000).")
+    p_lote.add_argument("--seed", type=int, default=0, help="Semente das prioridades (padrão: 0).")
+    args = parser.parse_args()
+
+    if args.comando == "bench":
+        executar_benchmark_heap(args.tarefas, args.operacoes, args.aridades, args.atualizacoes, args.seed)
+    elif args.comando == "lote":
+        executar_benchmark_lote(args.n, args.lotes, args.seed)
+    else:
+        test_priority_queue()
+        print()
+        test_indexed_priority_queue()
\ No newline at end of file
@@ -0,0 +1,286 @@
+import argparse
+import asyncio
+import collections
+import contextlib
+import random
+import statistics
+import threading
+import time
+
+from heap import PriorityQueue
+
+# Variantes de heap.PriorityQueue para pools de workers:
+# - ThreadSafePriorityQueue: todas as operações sob um lock; pop_task bloqueia
+#   (com timeout opcional) em uma Condition até haver tarefa;
+# - AsyncPriorityQueue: para asyncio (um único event loop), com `await pop_task()`.
+# Ambas mantêm a semântica de atualização de prioridade (add_task em tarefa
+# existente muda a prioridade) e acordam UM consumidor por tarefa adicionada
+# (notify(1) / um future por vez), evitando o "estouro da manada" de notify_all.
+
+class ThreadSafePriorityQueue(PriorityQueue):
+    """PriorityQueue segura para várias threads, com pop_task bloqueante."""
+
+    def __init__(self, compaction_threshold=0.5):
+        super().__init__(compaction_threshold)
+        self._cond = threading.Condition(threading.Lock())
+
+    def add_task(self, task, priority=0):
+        with self._cond:
+            super().add_task(task, priority)
+            self._cond.notify()
+
+    def add_many(self, items):
+        items = list(items)
+        with self._cond:
+            super().add_many(items)
+            self._cond.notify(len(items))
+
+    def pop_task(self, block=True, timeout=None):
+        """Remove e retorna (task, priority) com menor prioridade.
+
+        Com block=True espera até haver uma tarefa (ou até `timeout` segundos).
+        Levanta KeyError se a fila continuar vazia.
+        """
+        with self._cond:
+            if block:
+                self._cond.wait_for(lambda: self.entry_finder, timeout)
+            return super().pop_task()
+
+    def pop_many(self, k, block=True, timeout=None):
+        """Como PriorityQueue.pop_many, mas com block=True espera ao menos uma tarefa."""
+        with self._cond:
+            if block:
+                self._cond.wait_for(lambda: self.entry_finder, timeout)
+            return super().pop_many(k)
+
+    def remove_task(self, task):
+        with self._cond:
+            super().remove_task(task)
+
+    def peek(self):
+        with self._cond:
+            return super().peek()
+
+    def merge(self, other):
+        """Adiciona as tarefas de `other` (lida sob o lock dela, se tiver um)."""
+        with getattr(other, "_cond", None) or contextlib.nullcontext():
+            items = [(entry[2], entry[0]) for entry in other.entry_finder.values()]
+        self.add_many(items)
+
+    def stats(self):
+        with self._cond:
+            return super().stats()
+
+    def __len__(self):
+        with self._cond:
+            return len(self.entry_finder)
+
+    def __repr__(self):
+        with self._cond:
+            return super().__repr__() # Não chama len(self), que pegaria o lock de novo
+
+class AsyncPriorityQueue(PriorityQueue):
+    """PriorityQueue para asyncio: `await pop_task()` espera até haver uma tarefa.
+
+    Não é segura entre threads (como asyncio.Queue): use-a em um único event
+    loop. Cada tarefa adicionada acorda no máximo um consumidor em espera.
+    """
+
+    def __init__(self, compaction_threshold=0.5):
+        super().__init__(compaction_threshold)
+        self._getters = collections.deque()  # futures dos consumidores em espera (FIFO)
+
+    def _wakeup_next(self, n=1):
+        while self._getters and n > 0:
+            getter = self._getters.popleft()
+            if not getter.done():
+                getter.set_result(None)
+                n -= 1
+
+    def add_task(self, task, priority=0):
+        super().add_task(task, priority)
+        self._wakeup_next()
+
+    def add_many(self, items):
+        items = list(items)
+        super().add_many(items)
+        self._wakeup_next(len(items))
+
+    def pop_task_nowait(self):
+        """pop_task sem espera: levanta KeyError se vazio."""
+        return super().pop_task()
+
+    async def pop_task(self, timeout=None):
+        """Remove e retorna (task, priority); espera até `timeout` segundos (None = sem limite).
+
+        Levanta KeyError se o tempo acabar com a fila vazia.
+        """
+        if timeout is None:
+            return await self._pop_task()
+        try:
+            return await asyncio.wait_for(self._pop_task(), timeout)
+        except asyncio.TimeoutError:
+            raise KeyError("pop from an empty priority queue") from None
+
+    async def _pop_task(self):
+        # Mesmo protocolo de asyncio.Queue.get
+        while not self.entry_finder:
+            getter = asyncio.get_running_loop().create_future()
+            self._getters.append(getter)
+            try:
+                await getter
+            except BaseException:
+                getter.cancel()
+                with contextlib.suppress(ValueError):
+                    self._getters.remove(getter)
+                # Se este consumidor foi acordado e cancelado, repassa a vez
+                if self.entry_finder and not getter.cancelled():
+                    self._wakeup_next()
+                raise
+        return super().pop_task()
+
+# --- BENCHMARK DE CONTENÇÃO ---
+FIM = float("inf") # Prioridade das tarefas sentinela: saem depois de todas as reais
+
+def _resumir_latencias(latencias):
+    p50, p95, p99 = (statistics.quantiles(latencias, n=100)[i] for i in (49, 94, 98))
+    return p50, p95, p99
+
+def _imprimir_resultado(modo, produtores, consumidores, total, tempo, latencias):
+    p50, p95, p99 = _resumir_latencias(latencias)
+    print("{:<8}{:>11}{:>13}{:>12.0f}{:>13.1f}{:>13.1f}{:>13.1f}".format(
+        modo, produtores, consumidores, total / tempo, p50 * 1e6, p95 * 1e6, p99 * 1e6))
+
+def medir_contencao_threads(produtores, consumidores, por_produtor, seed=None):
+    """N threads produtoras e M consumidoras; retorna (tempo, latências add -> pop em segundos)."""
+    pq = ThreadSafePriorityQueue()
+    latencias = [[] for _ in range(consumidores)]
+
+    def produzir(p):
+        rng = random.Random(None if seed is None else seed + p)
+        for i in range(por_produtor):
+            pq.add_task((p, i, time.perf_counter()), rng.random())
+
+    def consumir(c):
+        minhas = latencias[c]
+        while True:
+            tarefa, prioridade = pq.pop_task()
+            if prioridade == FIM:
+                return
+            minhas.append(time.perf_counter() - tarefa[2])
+
+    threads_c = [threading.Thread(target=consumir, args=(c,)) for c in range(consumidores)]
+    threads_p = [threading.Thread(target=produzir, args=(p,)) for p in range(produtores)]
+    inicio = time.perf_counter()
+    for t in threads_c + threads_p:
+        t.start()
+    for t in threads_p:
+        t.join()
+    for c in range(consumidores):
+        pq.add_task(("FIM", c), FIM)
+    for t in threads_c:
+        t.join()
+    tempo = time.perf_counter() - inicio
+    return tempo, [x for lista in latencias for x in lista]
+
+async def _contencao_async(produtores, consumidores, por_produtor, seed):
+    pq = AsyncPriorityQueue()
+    latencias = []
+
+    async def produzir(p):
+        rng = random.Random(None if seed is None else seed + p)
+        for i in range(por_produtor):
+            pq.add_task((p, i, time.perf_counter()), rng.random())
+            if i % 64 == 63:
+                await asyncio.sleep(0) # Cede o loop para os consumidores
+
+    async def consumir():
+        while True:
+            tarefa, prioridade = await pq.pop_task()
+            if prioridade == FIM:
+                return
+            latencias.append(time.perf_counter() - tarefa[2])
+
+    inicio = time.perf_counter()
+    tarefas_c = [asyncio.create_task(consumir()) for _ in range(consumidores)]
+    await asyncio.gather(*(produzir(p) for p in range(produtores)))
+    for c in range(consumidores):
+        pq.add_task(("FIM", c), FIM)
+    await asyncio.gather(*tarefas_c)
+    return time.perf_counter() - inicio, latencias
+
+def medir_contencao_async(produtores, consumidores, por_produtor, seed=None):
+    """Mesmo cenário de medir_contencao_threads com corrotinas em um event loop."""
+    return asyncio.run(_contencao_async(produtores, consumidores, por_produtor, seed))
+
+def executar_benchmark_contencao(configuracoes, por_produtor, modos=("thread", "async"), seed=None):
+    """Vazão (ops/s, add + pop) e latência (µs) do add_task ao pop_task para cada (N, M)."""
+    medidores = {"thread": medir_contencao_threads, "async": medir_contencao_async}
+    print(f"\nCONTENÇÃO: {por_produtor} tarefas por produtor")
+    print("{:<8}{:>11}{:>13}{:>12}{:>13}{:>13}{:>13}".format(
+        "Modo", "Produtores", "Consumidores", "Ops/s", "p50 (µs)", "p95 (µs)", "p99 (µs)"))
+    print("-" * 83)
+    for modo in modos:
+        for produtores, consumidores in configuracoes:
+            tempo, latencias = medidores[modo](produtores, consumidores, por_produtor, seed)
+            total = produtores * por_produtor
+            if len(latencias) != total:
+                raise AssertionError(f"{modo}: {len(latencias)} tarefas consumidas, esperado {total}.")
+            _imprimir_resultado(modo, produtores, consumidores, 2 * total, tempo, latencias)
+
+def test_filas_concorrentes():
+    """Timeouts, ordem de prioridade e atualização de prioridade nas duas variantes."""
+    pq = ThreadSafePriorityQueue()
+    try:
+        pq.pop_task(timeout=0.01)
+        raise AssertionError("pop_task deveria levantar KeyError após o timeout")
+    except KeyError:
+        pass
+    resultado = []
+    consumidor = threading.Thread(target=lambda: resultado.append(pq.pop_task(timeout=5)))
+    consumidor.start()
+    time.sleep(0.01)
+    pq.add_task("Python", 2)
+    consumidor.join()
+    assert resultado == [("Python", 2)], resultado
+    pq.add_many([("Java", 3), ("React", 1), ("JavaScript", 5)])
+    pq.change_priority("JavaScript", 0)
+    assert repr(pq) == "ThreadSafePriorityQueue([(0, 'JavaScript'), (1, 'React'), (3, 'Java')])", repr(pq)
+    assert pq.pop_many(10) == [("JavaScript", 0), ("React", 1), ("Java", 3)]
+
+    async def cenario_async():
+        apq = AsyncPriorityQueue()
+        try:
+            await apq.pop_task(timeout=0.01)
+            raise AssertionError("pop_task deveria levantar KeyError após o timeout")
+        except KeyError:
+            pass
+        consumidores = [asyncio.create_task(apq.pop_task()) for _ in range(2)]
+        await asyncio.sleep(0)
+        apq.add_task("Java", 3)
+        apq.add_task("JavaScript", 5)
+        apq.change_priority("JavaScript", 0)
+        return sorted(await asyncio.gather(*consumidores), key=lambda x: x[1])
+
+    assert asyncio.run(cenario_async()) == [("JavaScript", 0), ("Java", 3)]
+    print("ThreadSafePriorityQueue e AsyncPriorityQueue: testes concluídos com sucesso.")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Filas de prioridade concorrentes: testes e benchmark de contenção.")
+    sub = parser.add_subparsers(dest="comando")
+    p_bench = sub.add_parser("contencao", help="N produtores x M consumidores: ops/s e percentis de latência.")
+    p_bench.add_argument("--configuracoes", nargs="+", default=["1x1", "4x4", "8x2", "2x8"],
+                         help="Pares PRODUTORESxCONSUMIDORES (padrão: 1x1 4x4 8x2 2x8).")
+    p_bench.add_argument("--tarefas", type=int, default=20000, help="Tarefas por produtor (padrão: 20000).")
+    p_bench.add_argument("--modos", nargs="+", choices=["thread", "async"], default=["thread", "async"])
+    p_bench.add_argument("--seed", type=int, default=0, help="Semente das prioridades (padrão: 0).")
+    args = parser.parse_args()
+
+    if args.comando == "contencao":
+        try:
+            configuracoes = [tuple(int(x) for x in c.lower().split("x")) for c in args.configuracoes]
+        except ValueError:
+            parser.error("Configurações devem ter o formato PRODUTORESxCONSUMIDORES (ex.: 4x2).")
+        executar_benchmark_contencao(configuracoes, args.tarefas, args.modos, args.seed)
+    else:
+        test_filas_concorrentes()
@@ -0,0 +1,82 @@
+import collections
+import contextlib
+
+# Contadores de operações (opt-in) para os caminhos críticos de ordenacao.py,
+# heap.py, arvores.py e grafos.py.
+#
+# Desligada, a instrumentação custa um teste `if c is not None` por operação
+# contada (a variável é lida uma vez por chamada e mantida em uma local). As
+# comparações das ordenações nem isso: só com a instrumentação ligada as
+# chaves são envolvidas em ChaveInstrumentada, que conta cada comparação.
+#
+# Uso:
+#     with instrumentar() as c:
+#         heap_sort(dados, key=lambda p: p.preco)
+#     print(c["comparacoes"], c["trocas"], c["chamadas_key"])
+
+ativo = None # Counter em uso, ou None (instrumentação desligada)
+
+@contextlib.contextmanager
+def instrumentar():
+    """Liga a contagem dentro do bloco e entrega o Counter com os resultados.
+
+    Blocos aninhados têm contadores próprios; ao sair, as contagens do bloco
+    interno também são somadas ao externo.
+    """
+    global ativo
+    contadores = collections.Counter()
+    anterior = ativo
+    ativo = contadores
+    try:
+        yield contadores
+    finally:
+        ativo = anterior
+        if anterior is not None:
+            for nome, valor in contadores.items():
+                if nome.endswith("_max"):
+                    anterior[nome] = max(anterior[nome], valor)
+                else:
+                    anterior[nome] += valor
+
+def registrar_maximo(contadores, nome, valor):
+    """Guarda em contadores[nome] o maior valor observado (ex.: profundidade_max)."""
+    if valor > contadores[nome]:
+        contadores[nome] = valor
+
+class ChaveInstrumentada:
+    """Envolve o valor de uma chave e conta as comparações feitas com ele."""
+    __slots__ = ("valor", "contadores")
+
+    def __init__(self, valor, contadores):
+        self.valor = valor
+        self.contadores = contadores
+
+    def __lt__(self, outro):
+        self.contadores["comparacoes"] += 1
+        return self.valor < outro.valor
+
+    def __le__(self, outro):
+        self.contadores["comparacoes"] += 1
+        return self.valor <= outro.valor
+
+    def __gt__(self, outro):
+        self.contadores["comparacoes"] += 1
+        return self.valor > outro.valor
+
+    def __ge__(self, outro):
+        self.contadores["comparacoes"] += 1
+        return self.valor >= outro.valor
+
+    def __eq__(self, outro):
+        self.contadores["comparacoes"] += 1
+        return self.valor == outro.valor
+
+    def __ne__(self, outro):
+        self.contadores["comparacoes"] += 1
+        return self.valor != outro.valor
+
+    def __hash__(self):
+        return hash(self.valor)
+
+    def __repr__(self):
+        return f"ChaveInstrumentada({self.valor!r})"
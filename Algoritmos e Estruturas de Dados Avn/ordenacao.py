@@ -1,11 +1,21 @@
+import argparse
+import math
+import operator
 import random
 import datetime
+import gc
+import itertools
+import sys
 import time
+import tracemalloc
+
+import instrumentacao
+import ordenacao_referencia as referencia
+from instrumentacao import ChaveInstrumentada
 
 # Configuração dos Requisitos Iniciais
-# Número de produtos a serem gerados
+# Número padrão de produtos gerados pelo benchmark (python ordenacao.py bench -n ...)
 N_PRODUTOS = 1000 # 1000 produtos exatamente como solicitado
-print(f"Configuração: Gerando {N_PRODUTOS} produtos.")
 
 # --- CLASSE PRODUTO ---
 class Produto:
@@ -20,8 +30,49 @@ class Produto:
         # Formatando para melhor visualização
         return f"Produto(Preco:{self.preco:.2f}, Aval:{self.avaliacao:.2f}, Data:{self.data_adicao.date()}, Cat:{self.categoria})"
 
+# --- PRODUTO COMPACTO (cargas com milhões de registros) ---
+# Datas como inteiros: microssegundos desde 1970-01-01 (datetime ingênuo).
+# Usado também por ordenacao_colunar.py e ordenacao_externa.py.
+EPOCA = datetime.datetime(1970, 1, 1)
+UM_MICROSSEGUNDO = datetime.timedelta(microseconds=1)
+
+def para_microssegundos(data):
+    return (data - EPOCA) // UM_MICROSSEGUNDO
+
+def de_microssegundos(valor):
+    return EPOCA + datetime.timedelta(microseconds=int(valor))
+
+class ProdutoCompacto:
+    """Produto sem __dict__: __slots__, categoria internada e data como inteiro.
+
+    A data fica em `data_us` (microssegundos desde 1970-01-01, datetime
+    ingênuo); `data_adicao` continua devolvendo um datetime, então os
+    lambdas de `criterios` e o __repr__ funcionam sem alteração.
+    """
+    __slots__ = ("nome", "preco", "avaliacao", "data_us", "categoria")
+
+    def __init__(self, nome, preco, avaliacao, data_adicao, categoria):
+        self.nome = nome
+        self.preco = preco
+        self.avaliacao = avaliacao
+        if isinstance(data_adicao, datetime.datetime):
+            data_adicao = para_microssegundos(data_adicao)
+        self.data_us = data_adicao
+        # Uma única string por categoria, compartilhada por todos os registros
+        self.categoria = sys.intern(categoria)
+
+    @property
+    def data_adicao(self):
+        return de_microssegundos(self.data_us)
+
+    @classmethod
+    def from_produto(cls, p):
+        return cls(p.nome, p.preco, p.avaliacao, p.data_adicao, p.categoria)
+
+    __repr__ = Produto.__repr__
+
 # --- GERAÇÃO DE DADOS (Requisito 1) ---
-def gerar_produtos(n):
+def gerar_produtos(n, classe=Produto):
     nomes = ["Produto" + str(i) for i in range(n)]
     precos = [round(random.uniform(10, 1000), 2) for _ in range(n)]
     avaliacoes = [round(random.uniform(0, 5), 2) for _ in range(n)]
@@ -29,39 +80,70 @@ def gerar_produtos(n):
     datas = [datetime.datetime.now() - datetime.timedelta(days=random.randint(0, 365), seconds=random.randint(0, 86400)) for _ in range(n)]
     categorias = ["Categoria" + str(random.randint(1, 5)) for _ in range(n)]
     
-    produtos = [Produto(nomes[i], precos[i], avaliacoes[i], datas[i], categorias[i]) for i in range(n)]
+    produtos = [classe(nomes[i], precos[i], avaliacoes[i], datas[i], categorias[i]) for i in range(n)]
     return produtos
 
-dataset_original = gerar_produtos(N_PRODUTOS)
-
 
 ## Implementação de Algoritmos de Ordenação 
 # Bubble Sort, Quick Sort, Merge Sort, Heap Sort RESPECTIVAMENTE
 # Cada função recebe a lista, uma função chave e um booleano para ordem reversa
+#
+# Decorate-sort-undecorate: cada algoritmo calcula key(x) exatamente uma vez por
+# elemento (lista `keys`, paralela a `arr`) e compara apenas as chaves já
+# calculadas. Toda troca em `arr` é espelhada em `keys`, de modo que a sequência
+# de comparações/trocas (e portanto o resultado) é a mesma de antes.
+
+def _instrumentar_key(key, instrumentar_comparacoes=True):
+    """Retorna `key` ou, com a instrumentação ligada, uma versão que conta as
+    chamadas e (se pedido) envolve a chave para contar as comparações."""
+    c = instrumentacao.ativo
+    if c is None:
+        return key
+
+    def key_contada(x):
+        c["chamadas_key"] += 1
+        if instrumentar_comparacoes:
+            return ChaveInstrumentada(key(x), c)
+        return key(x)
+    return key_contada
+
+def _calcular_chaves(arr, key, instrumentar_comparacoes=True):
+    """Calcula a chave de cada elemento uma única vez (fase 'decorate')."""
+    _contar("alocacoes_buffer")
+    key = _instrumentar_key(key, instrumentar_comparacoes)
+    return [key(x) for x in arr]
+
+def _contar(nome, quantidade=1):
+    """Soma `quantidade` ao contador `nome`, se a instrumentação estiver ligada."""
+    c = instrumentacao.ativo
+    if c is not None:
+        c[nome] += quantidade
 
 def bubble_sort(arr, key=lambda x: x, reverse=False):
     n = len(arr)
+    keys = _calcular_chaves(arr, key)
+    c = instrumentacao.ativo
     # Loop principal para passar por toda a lista
     for i in range(n - 1):
         swapped = False
         # Loop para as comparações e trocas
         for j in range(0, n - i - 1):
-            # Obtém os valores de comparação
-            val_j = key(arr[j])
-            val_j1 = key(arr[j + 1])
+            # Obtém os valores de comparação (já pré-calculados)
+            val_j = keys[j]
+            val_j1 = keys[j + 1]
             
             # Condição de troca
-            should_swap = False
             if not reverse: # Ascendente (padrão)
-                if val_j > val_j1:
-                    should_swap = True
+                should_swap = val_j > val_j1
             else: # Descendente
-                if val_j < val_j1:
-                    should_swap = True
+                should_swap = val_j < val_j1
             
             if should_swap:
                 arr[j], arr[j + 1] = arr[j + 1], arr[j] # Troca
+                keys[j], keys[j + 1] = val_j1, val_j
                 swapped = True
+                if c is not None:
+                    c["trocas"] += 1
         
         # Se nenhuma troca ocorreu em um passo, a lista está ordenada
         if not swapped:
@@ -70,144 +152,557 @@ def bubble_sort(arr, key=lambda x: x, reverse=False):
 
 
 def quick_sort(arr, key=lambda x: x, reverse=False):
-    # Função auxiliar para particionamento (Lomuto ou Hoare)
-    def partition(items, low, high):
-        # Escolhe o pivo como o elemento mais à direita
-        pivot_val = key(items[high])
-        i = low - 1  # Índice do menor elemento
-
-        for j in range(low, high):
-            current_val = key(items[j])
-            
-            # Condição de partição
-            should_swap = False
-            if not reverse: # Ascendente
-                if current_val <= pivot_val:
-                    should_swap = True
-            else: # Descendente
-                if current_val >= pivot_val:
-                    should_swap = True
+    """Quick Sort sem pior caso O(n^2): delega para introsort (abaixo).
 
-            if should_swap:
-                i += 1
-                items[i], items[j] = items[j], items[i] # Troca
+    A versão original (Lomuto recursivo, pivô no fim) está em
+    ordenacao_referencia.quick_sort, usada só como comparação.
+    """
+    return introsort(arr, key=key, reverse=reverse)
 
-        # Troca o pivo (items[high]) com o elemento items[i + 1]
-        items[i + 1], items[high] = items[high], items[i + 1]
-        return i + 1
+# --- MERGE SORT BOTTOM-UP ---
+# Versão iterativa: em vez de fatiar arr[:mid]/arr[mid:] a cada nível, mescla
+# ("ping-pong") entre dois lados do mesmo tamanho: (keys, arr) e um buffer
+# auxiliar de 2n posições (chaves em [0, n), itens em [n, 2n)). Cada lado é um
+# trio (lista de chaves, lista de itens, deslocamento dos itens). O número de
+# passadas é conhecido após a detecção das corridas; se for ímpar, os dados são
+# copiados para o buffer antes da primeira, e assim a última passada termina
+# em (keys, arr). Nenhuma lista temporária é criada além das chaves. Corridas
+# naturais (ascendentes ou estritamente descendentes, estilo TimSort) são
+# detectadas e estendidas até MIN_RUN, então listas quase ordenadas custam ~O(n).
 
-    # Função auxiliar recursiva
-    def _quick_sort(items, low, high):
-        if low < high:
-            # pi é o índice de partição, items[pi] está no lugar certo
-            pi = partition(items, low, high)
+MIN_RUN = 32 # Tamanho mínimo de uma corrida (completada com Insertion Sort binário)
 
-            # Ordena recursivamente os elementos antes e depois da partição
-            _quick_sort(items, low, pi - 1)
-            _quick_sort(items, pi + 1, high)
+def merge_sort(arr, key=lambda x: x, reverse=False, buffer=None):
+    """Merge Sort estável. `buffer` (lista) pode ser reutilizado entre chamadas.
 
-    # Execução principal
-    _quick_sort(arr, 0, len(arr) - 1)
-    return arr
+    O buffer cresce para 2·len(arr) posições se necessário e mantém referências
+    aos itens da última ordenação até ser reutilizado ou descartado. Com um
+    buffer já do tamanho certo, a única alocação por chamada é a lista de chaves.
+    """
+    if len(arr) < 2:
+        return arr
+    return _merge_sort_chaves(arr, _calcular_chaves(arr, key), reverse, buffer)
 
-def merge_sort(arr, key=lambda x: x, reverse=False):
-    if len(arr) > 1:
-        mid = len(arr) // 2
-        L = arr[:mid]  # Metade esquerda
-        R = arr[mid:]  # Metade direita
+def _merge_sort_chaves(arr, keys, reverse=False, buffer=None):
+    """Corpo do merge_sort sobre chaves já calculadas (keys[i] é a chave de arr[i])."""
+    n = len(arr)
+    menor = operator.gt if reverse else operator.lt
 
-        # Chamada recursiva em ambas as metades
-        merge_sort(L, key=key, reverse=reverse)
-        merge_sort(R, key=key, reverse=reverse)
+    corridas = _detectar_corridas(keys, arr, n, menor)
+    if len(corridas) == 1:
+        return arr # Já ordenada (após inverter/estender as corridas): o buffer nem é usado
 
-        i = j = k = 0
+    if buffer is None:
+        buffer = [None] * (2 * n)
+        _contar("alocacoes_buffer")
+    elif len(buffer) < 2 * n:
+        buffer.extend([None] * (2 * n - len(buffer)))
+        _contar("alocacoes_buffer")
 
-        # Mesclagem (Merge)
-        while i < len(L) and j < len(R):
-            val_l = key(L[i])
-            val_r = key(R[j])
-            
-            # Condição de comparação
-            is_l_smaller = False
-            if not reverse: # Ascendente
-                if val_l < val_r:
-                    is_l_smaller = True
-            else: # Descendente
-                if val_l > val_r:
-                    is_l_smaller = True
-                    
-            if is_l_smaller:
-                arr[k] = L[i]
-                i += 1
+    principal, auxiliar = (keys, arr, 0), (buffer, buffer, n)
+    passadas = (len(corridas) - 1).bit_length() # ceil(log2(corridas))
+    if passadas % 2 == 1:
+        # Número ímpar de passadas: começa do buffer para terminar em (keys, arr)
+        _copiar(principal, auxiliar, 0, 0, n)
+        principal, auxiliar = auxiliar, principal
+
+    # Passadas de mesclagem: corridas adjacentes são mescladas de src para dst
+    src, dst = principal, auxiliar
+    while len(corridas) > 1:
+        novas = []
+        for r in range(0, len(corridas) - 1, 2):
+            lo = corridas[r]
+            mid = corridas[r + 1]
+            hi = corridas[r + 2] if r + 2 < len(corridas) else n
+            _mesclar(src, dst, lo, mid, hi, menor)
+            novas.append(lo)
+        if len(corridas) % 2 == 1:
+            # Corrida ímpar no final: apenas copia para o destino
+            _copiar(src, dst, corridas[-1], corridas[-1], n)
+            novas.append(corridas[-1])
+        corridas = novas
+        src, dst = dst, src
+    return arr
+
+def _detectar_corridas(keys, arr, n, menor):
+    """Encontra corridas naturais em (keys, arr) (invertendo as descendentes) e retorna seus inícios."""
+    corridas = []
+    lo = 0
+    while lo < n:
+        hi = lo + 1
+        if hi < n:
+            if menor(keys[hi], keys[lo]):
+                # Corrida estritamente descendente: inverter mantém a estabilidade
+                while hi + 1 < n and menor(keys[hi + 1], keys[hi]):
+                    hi += 1
+                _inverter_faixa(keys, arr, lo, hi)
             else:
-                arr[k] = R[j]
-                j += 1
-            k += 1
+                while hi + 1 < n and not menor(keys[hi + 1], keys[hi]):
+                    hi += 1
+            hi += 1
+        # Corridas curtas são estendidas até MIN_RUN com Insertion Sort binário
+        fim = min(lo + MIN_RUN, n)
+        if hi < fim:
+            _insertion_sort_binario(keys, arr, lo, hi, fim, menor)
+            hi = fim
+        corridas.append(lo)
+        lo = hi
+    return corridas
 
-        # Copia os elementos restantes de L[]
-        while i < len(L):
-            arr[k] = L[i]
-            i += 1
-            k += 1
+def _inverter_faixa(keys, arr, lo, hi):
+    """Inverte keys[lo..hi] e arr[lo..hi] sem alocar."""
+    _contar("trocas", (hi - lo + 1) // 2)
+    while lo < hi:
+        keys[lo], keys[hi] = keys[hi], keys[lo]
+        arr[lo], arr[hi] = arr[hi], arr[lo]
+        lo += 1
+        hi -= 1
 
-        # Copia os elementos restantes de R[]
-        while j < len(R):
-            arr[k] = R[j]
+def _insertion_sort_binario(keys, arr, lo, ordenado_ate, fim, menor):
+    """Insere keys/arr[ordenado_ate:fim] na faixa já ordenada [lo:ordenado_ate] (estável)."""
+    for i in range(ordenado_ate, fim):
+        k, v = keys[i], arr[i]
+        # Busca binária pela posição após todas as chaves <= k
+        esq, dir = lo, i
+        while esq < dir:
+            meio = (esq + dir) // 2
+            if menor(k, keys[meio]):
+                dir = meio
+            else:
+                esq = meio + 1
+        # Desloca o bloco uma posição à direita (no máximo MIN_RUN itens)
+        for j in range(i, esq, -1):
+            keys[j] = keys[j - 1]
+            arr[j] = arr[j - 1]
+        keys[esq] = k
+        arr[esq] = v
+
+def _copiar(src, dst, i, k, fim):
+    """Copia as posições [i, ...) de src para [k, fim) de dst (chaves e itens), sem fatias temporárias."""
+    sk, sv, so = src
+    dk, dv, do = dst
+    for k in range(k, fim):
+        dk[k] = sk[i]
+        dv[do + k] = sv[so + i]
+        i += 1
+
+def _mesclar(src, dst, lo, mid, hi, menor):
+    """Mescla src[lo:mid] e src[mid:hi] em dst[lo:hi] (chaves e itens)."""
+    sk, sv, so = src
+    dk, dv, do = dst
+    if not menor(sk[mid], sk[mid - 1]):
+        # As duas corridas já estão em ordem: cópia direta
+        _copiar(src, dst, lo, lo, hi)
+        return
+    i, j, k = lo, mid, lo
+    ki, kj = sk[i], sk[j]
+    while True:
+        if menor(kj, ki):
+            dk[k] = kj
+            dv[do + k] = sv[so + j]
+            k += 1
             j += 1
+            if j == hi:
+                break
+            kj = sk[j]
+        else: # Empate fica com a esquerda (estável)
+            dk[k] = ki
+            dv[do + k] = sv[so + i]
             k += 1
-            
-    return arr
+            i += 1
+            if i == mid:
+                break
+            ki = sk[i]
+    # Copia o que restou de uma das metades
+    if i < mid:
+        _copiar(src, dst, i, k, hi)
+    else:
+        _copiar(src, dst, j, k, hi)
 
 def heap_sort(arr, key=lambda x: x, reverse=False):
-    n = len(arr)
+    keys = _calcular_chaves(arr, key)
+    _heap_sort_faixa(arr, keys, 0, len(arr), reverse)
+    return arr
 
-    # 1. Função auxiliar para manter a propriedade Max-Heap (ou Min-Heap invertido)
-    def heapify(items, n, i):
+def _heapify(items, keys, lo, n, i, compare):
+    """Mantém a propriedade de heap a partir de i, na faixa items[lo:lo + n] (e keys).
+
+    compare(val_pai, val_filho) retorna True se o filho deve subir acima do pai
+    (operator.lt = Max-Heap, operator.gt = Min-Heap).
+    """
+    c = instrumentacao.ativo
+    while True:
         root = i       # Inicializa a raiz
         left = 2 * i + 1
         right = 2 * i + 2
-        
-        # Define a condição de comparação
-        def compare(idx1, idx2):
-            val1 = key(items[idx1])
-            val2 = key(items[idx2])
-            
-            if not reverse: # Max-Heap (para ordem ascendente)
-                return val1 < val2 # Retorna True se val2 for maior (ou igual)
-            else: # Min-Heap (para ordem descendente)
-                return val1 > val2 # Retorna True se val2 for menor (ou igual)
 
         # Encontra o maior (ou menor, se reverse=True) entre a raiz e os filhos
         # Verifica o filho esquerdo
-        if left < n and compare(root, left):
+        if left < n and compare(keys[lo + root], keys[lo + left]):
             root = left
 
         # Verifica o filho direito
-        if right < n and compare(root, right):
+        if right < n and compare(keys[lo + root], keys[lo + right]):
             root = right
 
-        # Troca se a raiz não for mais a maior (ou menor)
-        if root != i:
-            items[i], items[root] = items[root], items[i]
-            # Chama recursivamente o heapify na subárvore afetada
-            heapify(items, n, root)
+        # Para se a raiz já for a maior (ou menor)
+        if root == i:
+            return
+        a, b = lo + i, lo + root
+        items[a], items[b] = items[b], items[a]
+        keys[a], keys[b] = keys[b], keys[a]
+        if c is not None:
+            c["trocas"] += 1
+        # Continua descendo na subárvore afetada
+        i = root
+
+def _heap_sort_faixa(arr, keys, lo, hi, reverse):
+    """Heap Sort sobre a faixa arr[lo:hi], com as chaves pré-calculadas em keys[lo:hi]."""
+    n = hi - lo
+    # Max-Heap para ordem ascendente, Min-Heap para descendente
+    compare = operator.gt if reverse else operator.lt
+    _contar("trocas", max(n - 1, 0)) # Trocas da fase de extração
 
-    # 2. Construir o heap (reorganizar o array)
+    # 1. Construir o heap (reorganizar o array)
     # Começa do último nó pai e vai até a raiz
     for i in range(n // 2 - 1, -1, -1):
-        heapify(arr, n, i)
+        _heapify(arr, keys, lo, n, i, compare)
 
-    # 3. Extrair elementos um por um
+    # 2. Extrair elementos um por um
     for i in range(n - 1, 0, -1):
         # Troca o elemento atual (raiz do heap) com o último elemento
-        arr[i], arr[0] = arr[0], arr[i] 
+        arr[lo + i], arr[lo] = arr[lo], arr[lo + i]
+        keys[lo + i], keys[lo] = keys[lo], keys[lo + i]
         # Chama heapify na heap reduzida (excluindo o elemento extraído)
-        heapify(arr, i, 0)
-        
+        _heapify(arr, keys, lo, i, 0, compare)
+
+# --- INTROSORT (implementação de quick_sort) ---
+# Quick Sort robusto a entradas adversárias (já ordenadas, invertidas,
+# muitas chaves repetidas): pivô por mediana de três / ninther de Tukey,
+# partição em três vias (bandeira holandesa), pilha explícita em vez de
+# recursão, fallback para Heap Sort quando a profundidade passa de 2·log2(n)
+# e Insertion Sort em fatias pequenas. O resultado é estável.
+
+LIMIAR_INSERCAO = 16 # Fatias até este tamanho usam Insertion Sort
+LIMIAR_NINTHER = 40  # A partir deste tamanho o pivô é o ninther (mediana de 3 medianas)
+
+def _mediana_de_tres(keys, a, b, c, menor):
+    """Retorna o índice (entre a, b, c) cuja chave é a mediana das três."""
+    ka, kb, kc = keys[a], keys[b], keys[c]
+    if menor(ka, kb):
+        if menor(kb, kc):
+            return b
+        return c if menor(ka, kc) else a
+    if menor(ka, kc):
+        return a
+    return c if menor(kb, kc) else b
+
+def _escolher_pivo(keys, lo, hi, menor):
+    """Chave do pivô: mediana de três em fatias médias, ninther em fatias grandes."""
+    meio = (lo + hi) // 2
+    if hi - lo + 1 < LIMIAR_NINTHER:
+        return keys[_mediana_de_tres(keys, lo, meio, hi, menor)]
+    passo = (hi - lo + 1) // 8
+    m1 = _mediana_de_tres(keys, lo, lo + passo, lo + 2 * passo, menor)
+    m2 = _mediana_de_tres(keys, meio - passo, meio, meio + passo, menor)
+    m3 = _mediana_de_tres(keys, hi - 2 * passo, hi - passo, hi, menor)
+    return keys[_mediana_de_tres(keys, m1, m2, m3, menor)]
+
+def _particao_tres_vias(keys, perm, lo, hi, pivo, menor):
+    """Particiona [lo, hi] em < pivo, == pivo e > pivo. Retorna (lt, gt) do bloco igual."""
+    lt, i, gt = lo, lo, hi
+    c = instrumentacao.ativo
+    while i <= gt:
+        k = keys[i]
+        if menor(k, pivo):
+            keys[lt], keys[i] = k, keys[lt]
+            perm[lt], perm[i] = perm[i], perm[lt]
+            lt += 1
+            i += 1
+            if c is not None:
+                c["trocas"] += 1
+        elif menor(pivo, k):
+            keys[gt], keys[i] = k, keys[gt]
+            perm[gt], perm[i] = perm[i], perm[gt]
+            gt -= 1
+            if c is not None:
+                c["trocas"] += 1
+        else:
+            i += 1
+    return lt, gt
+
+def _insertion_sort_faixa(keys, perm, lo, hi, menor):
+    """Insertion Sort (estável) sobre a faixa fechada [lo, hi]."""
+    c = instrumentacao.ativo
+    for i in range(lo + 1, hi + 1):
+        k, p = keys[i], perm[i]
+        j = i - 1
+        while j >= lo and menor(k, keys[j]):
+            keys[j + 1] = keys[j]
+            perm[j + 1] = perm[j]
+            j -= 1
+            if c is not None:
+                c["trocas"] += 1 # Cada deslocamento equivale a uma troca
+        keys[j + 1] = k
+        perm[j + 1] = p
+
+def introsort(arr, key=lambda x: x, reverse=False):
+    n = len(arr)
+    if n < 2:
+        return arr
+    keys = _calcular_chaves(arr, key)
+    perm = list(range(n)) # Posições originais, ordenadas junto com as chaves
+    _contar("alocacoes_buffer")
+    menor = operator.gt if reverse else operator.lt
+    profundidade_max = 2 * int(math.log2(n))
+
+    # Pilha explícita de faixas (lo, hi, profundidade); empilha sempre o lado
+    # maior e continua no menor, de modo que a pilha tem no máximo O(log n) itens.
+    pilha = [(0, n - 1, 0)]
+    while pilha:
+        lo, hi, profundidade = pilha.pop()
+        while hi - lo + 1 > LIMIAR_INSERCAO:
+            if profundidade > profundidade_max:
+                # Muitas partições ruins: Heap Sort garante O(n log n) nesta faixa
+                _heap_sort_faixa(perm, keys, lo, hi + 1, reverse)
+                break
+            profundidade += 1
+            pivo = _escolher_pivo(keys, lo, hi, menor)
+            lt, gt = _particao_tres_vias(keys, perm, lo, hi, pivo, menor)
+            if lt - lo < hi - gt:
+                pilha.append((gt + 1, hi, profundidade))
+                hi = lt - 1
+            else:
+                pilha.append((lo, lt - 1, profundidade))
+                lo = gt + 1
+        else:
+            _insertion_sort_faixa(keys, perm, lo, hi, menor)
+
+    # Estabilidade: chaves iguais são contíguas; cada bloco volta à ordem original
+    inicio = 0
+    for i in range(1, n + 1):
+        if i == n or menor(keys[i - 1], keys[i]):
+            if i - inicio > 1:
+                perm[inicio:i] = sorted(perm[inicio:i])
+            inicio = i
+
+    arr[:] = [arr[i] for i in perm]
+    return arr
+
+# --- SELEÇÃO PARCIAL (top-k e n-ésimo elemento) ---
+# Para consultas como "50 melhores avaliações" não é preciso ordenar tudo:
+# - top_k mantém um heap limitado a k itens (mesmo _heapify do Heap Sort): O(n log k);
+# - nth_element é um quickselect com a partição do introsort: O(n) esperado,
+#   com fallback para Heap Sort na faixa restante (introselect).
+
+def _pior_asc(pai, filho):
+    """Max-Heap do 'pior' item em ordem ascendente: chave maior, ou igual e mais tardia."""
+    return pai < filho
+
+def _pior_desc(pai, filho):
+    """Idem para ordem descendente: chave menor, ou igual e mais tardia."""
+    return filho[0] < pai[0] or (filho[0] == pai[0] and filho[1] > pai[1])
+
+def top_k(arr, k, key=lambda x: x, reverse=False):
+    """Retorna os k primeiros itens de sorted(arr, key=key, reverse=reverse), na ordem.
+
+    Não altera `arr`. Empates seguem a ordem original (como em sorted()).
+    """
+    n = len(arr)
+    if k <= 0:
+        return []
+    if k >= n:
+        return merge_sort(list(arr), key=key, reverse=reverse)
+
+    # Heap com os k melhores vistos até agora; a raiz é o pior deles.
+    # Chaves são pares (chave, índice) para desempatar pela posição original.
+    compare = _pior_desc if reverse else _pior_asc
+    # As chaves são calculadas sob demanda (só k ficam guardadas), e não com _calcular_chaves
+    key = _instrumentar_key(key)
+    _contar("alocacoes_buffer")
+    itens = arr[:k]
+    keys = [(key(x), i) for i, x in enumerate(itens)]
+    for i in range(k // 2 - 1, -1, -1):
+        _heapify(itens, keys, 0, k, i, compare)
+
+    for i in range(k, n):
+        x = arr[i]
+        valor = key(x)
+        pior = keys[0][0]
+        # Só entra se for estritamente melhor: em empate, o item anterior vence
+        if (valor > pior) if reverse else (valor < pior):
+            itens[0] = x
+            keys[0] = (valor, i)
+            _heapify(itens, keys, 0, k, 0, compare)
+
+    # Extração (como no Heap Sort): o pior vai para o fim a cada passo
+    for i in range(k - 1, 0, -1):
+        itens[i], itens[0] = itens[0], itens[i]
+        keys[i], keys[0] = keys[0], keys[i]
+        _heapify(itens, keys, 0, i, 0, compare)
+    return itens
+
+def nth_element(arr, n, key=lambda x: x, reverse=False):
+    """Reorganiza `arr` (no lugar) para que arr[n] seja o item da posição n da lista ordenada.
+
+    Itens antes de n não vêm depois dele na ordem, e os após n não vêm antes.
+    Retorna arr[n]. Levanta IndexError se n estiver fora da lista.
+    """
+    tamanho = len(arr)
+    if not 0 <= n < tamanho:
+        raise IndexError("nth_element: índice fora da lista")
+    keys = _calcular_chaves(arr, key)
+    perm = list(range(tamanho))
+    _contar("alocacoes_buffer")
+    menor = operator.gt if reverse else operator.lt
+    profundidade_max = 2 * int(math.log2(tamanho))
+
+    lo, hi, profundidade = 0, tamanho - 1, 0
+    while hi - lo + 1 > LIMIAR_INSERCAO:
+        if profundidade > profundidade_max:
+            _heap_sort_faixa(perm, keys, lo, hi + 1, reverse)
+            break
+        profundidade += 1
+        pivo = _escolher_pivo(keys, lo, hi, menor)
+        lt, gt = _particao_tres_vias(keys, perm, lo, hi, pivo, menor)
+        # Continua apenas no lado que contém a posição n
+        if n < lt:
+            hi = lt - 1
+        elif n > gt:
+            lo = gt + 1
+        else:
+            break # n caiu no bloco igual ao pivô: já está na posição final
+    else:
+        _insertion_sort_faixa(keys, perm, lo, hi, menor)
+
+    arr[:] = [arr[i] for i in perm]
+    return arr[n]
+
+# --- ORDENAÇÃO SEM COMPARAÇÕES (Counting / Radix Sort LSD) ---
+# As chaves de `criterios` têm domínios limitados: preço e avaliação com 2 casas
+# decimais, 5 categorias, datas em uma janela de 1 ano. radix_sort converte
+# cada chave para um inteiro que preserva a ordem e ordena em O(n) passadas:
+# - float com até MAX_CASAS_DECIMAIS casas -> inteiro em ponto fixo (x * 10^d);
+# - datetime -> microssegundos desde 1970;
+# - demais chaves (ex.: strings de categoria) -> código no dicionário ordenado
+#   dos valores distintos (barato quando há poucos valores distintos).
+# Amplitude pequena usa uma única passada de Counting Sort; caso contrário,
+# Radix Sort LSD com dígitos de até 16 bits. Com NumPy instalado, cada passada
+# é um argsort estável vetorizado sobre um dígito de 16 bits.
+
+MAX_CASAS_DECIMAIS = 6
+LIMIAR_NUMPY = 2048 # Abaixo disso as passadas em Python puro são mais rápidas
+
+def _inteiros_ordenaveis(keys, casas_decimais=None):
+    """Converte as chaves para inteiros com a mesma ordem, ou None se não for possível."""
+    primeiro = keys[0]
+    if isinstance(primeiro, datetime.datetime):
+        if not all(isinstance(k, datetime.datetime) for k in keys):
+            return None
+        return [para_microssegundos(k) for k in keys]
+    if isinstance(primeiro, (int, float)) and not isinstance(primeiro, bool):
+        if not all(isinstance(k, (int, float)) for k in keys):
+            return None
+        if all(isinstance(k, int) for k in keys) and casas_decimais is None:
+            return list(keys)
+        candidatas = range(MAX_CASAS_DECIMAIS + 1) if casas_decimais is None else [casas_decimais]
+        for d in candidatas:
+            escala = 10 ** d
+            try:
+                inteiros = [round(k * escala) for k in keys]
+            except (OverflowError, ValueError): # inf / nan
+                return None
+            # Só vale se a conversão for exata (k == inteiro / 10^d) e cabível em um double
+            if all(i / escala == k and abs(i) < 2 ** 53 for i, k in zip(inteiros, keys)):
+                return inteiros
+        return None
+    try:
+        distintos = sorted(set(keys))
+    except TypeError: # Chaves não hasheáveis ou não comparáveis entre si
+        return None
+    codigo = {valor: i for i, valor in enumerate(distintos)}
+    return [codigo[k] for k in keys]
+
+def _radix_python(valores, bits):
+    """Permutação estável que ordena `valores` (inteiros >= 0 com até `bits` bits)."""
+    n = len(valores)
+    if bits <= 16 and (1 << bits) <= max(2 * n, 256):
+        # Amplitude pequena: uma única passada de Counting Sort
+        baldes = [[] for _ in range(1 << bits)]
+        _contar("alocacoes_buffer")
+        for i, v in enumerate(valores):
+            baldes[v].append(i)
+        return list(itertools.chain.from_iterable(baldes))
+    # Dígitos de 8 a 16 bits, do tamanho aproximado de n
+    largura = min(16, max(8, n.bit_length()))
+    mascara = (1 << largura) - 1
+    ordem = range(n)
+    for deslocamento in range(0, bits, largura):
+        baldes = [[] for _ in range(1 << largura)]
+        _contar("alocacoes_buffer")
+        for i in ordem:
+            baldes[(valores[i] >> deslocamento) & mascara].append(i)
+        ordem = list(itertools.chain.from_iterable(baldes))
+    return list(ordem)
+
+def _numpy():
+    """Importa o NumPy sob demanda: é opcional e não pesa no import deste módulo."""
+    try:
+        import numpy
+    except ImportError: # Sem NumPy: radix_sort usa as passadas em Python puro
+        return None
+    return numpy
+
+def _radix_numpy(np, valores, bits):
+    """Versão vetorizada: uma passada de argsort estável por dígito de 16 bits."""
+    v = np.asarray(valores, dtype=np.uint64)
+    ordem = np.arange(len(v))
+    for deslocamento in range(0, max(bits, 1), 16):
+        digito = ((v[ordem] >> np.uint64(deslocamento)) & np.uint64(0xFFFF)).astype(np.uint16)
+        ordem = ordem[np.argsort(digito, kind="stable")]
+    return ordem.tolist()
+
+def radix_sort(arr, key=lambda x: x, reverse=False, casas_decimais=None):
+    """Ordenação estável sem comparações para chaves de domínio limitado.
+
+    `casas_decimais` força a escala das chaves float (ex.: 2 para preços);
+    por padrão ela é detectada. Chaves que não podem ser mapeadas para
+    inteiros caem no merge_sort (comparações).
+    """
+    n = len(arr)
+    if n < 2:
+        return arr
+    # Sem comparações: as chaves não são envolvidas (a detecção de tipo precisa do valor)
+    keys = _calcular_chaves(arr, key, instrumentar_comparacoes=False)
+    inteiros = _inteiros_ordenaveis(keys, casas_decimais)
+    if inteiros is None:
+        # Cai no merge_sort reaproveitando as chaves (sem chamar key de novo)
+        c = instrumentacao.ativo
+        if c is not None:
+            keys = [ChaveInstrumentada(k, c) for k in keys]
+            c["alocacoes_buffer"] += 1
+        return _merge_sort_chaves(arr, keys, reverse)
+
+    minimo, maximo = min(inteiros), max(inteiros)
+    if reverse:
+        # Espelha os valores: a ordem estável ascendente do espelho é a descendente
+        valores = [maximo - v for v in inteiros]
+    else:
+        valores = [v - minimo for v in inteiros]
+    bits = (maximo - minimo).bit_length()
+
+    np = _numpy() if n >= LIMIAR_NUMPY and bits <= 64 else None
+    if np is not None:
+        ordem = _radix_numpy(np, valores, bits)
+    else:
+        ordem = _radix_python(valores, bits)
+    arr[:] = [arr[i] for i in ordem]
     return arr
 
 # --- FUNÇÃO DE MEDIÇÃO E VERIFICAÇÃO ---
 # Objetivo -> Medir tempo e verificar corretude
+# Medição única (didática). Para mediana/IQR, distribuições, memória e
+# comparação com baseline, use benchmark_ordenacao.py.
 def medir_tempo_e_verificar(algoritmo, dados_originais, chave, reverso):
     # 1. Copia dos dados (fundamental para testes justos!)
     dados_para_ordenar = list(dados_originais)
@@ -240,6 +735,7 @@ algoritmos = {
     "Quick Sort": quick_sort,
     "Merge Sort": merge_sort,
     "Heap Sort": heap_sort,
+    "Radix Sort": radix_sort,
 }
 
 # Requisito 3: Critérios de Ordenação
@@ -253,36 +749,327 @@ criterios = {
     "Categoria (Alfa)":    (lambda p: p.categoria, False),
 }
 
-# Estrutura para armazenar os resultados (Algoritmo: {Critério: Tempo})
-resultados_tempos = {alg: {} for alg in algoritmos.keys()}
+# --- BENCHMARK (executado apenas via linha de comando) ---
+def executar_benchmark(dataset_original, algoritmos_sel=None, criterios_sel=None):
+    """Executa cada algoritmo sobre cada critério e imprime a tabela resumo.
 
-print("\n--- INICIANDO TESTE DE DESEMPENHO ---")
-for nome_alg, alg_func in algoritmos.items():
-    print(f"\nTestando {nome_alg}...")
-    
+    Retorna o dicionário {Algoritmo: {Critério: Tempo}}.
+    """
+    if algoritmos_sel is None:
+        algoritmos_sel = algoritmos
+    if criterios_sel is None:
+        criterios_sel = criterios
+
+    # Estrutura para armazenar os resultados (Algoritmo: {Critério: Tempo})
+    resultados_tempos = {alg: {} for alg in algoritmos_sel.keys()}
+
+    print("\n--- INICIANDO TESTE DE DESEMPENHO ---")
+    for nome_alg, alg_func in algoritmos_sel.items():
+        print(f"\nTestando {nome_alg}...")
+
+        for nome_crit, (key, rev) in criterios_sel.items():
+            tempo = medir_tempo_e_verificar(alg_func, dataset_original, key, rev)
+
+            if tempo is not None:
+                resultados_tempos[nome_alg][nome_crit] = tempo
+                # Imprime o resultado formatado
+                print(f"  > {nome_crit:<20}: {tempo:.6f} segundos")
+
+    print("\n--- TESTE CONCLUÍDO ---")
+    imprimir_tabela(resultados_tempos, list(criterios_sel.keys()))
+    return resultados_tempos
+
+def imprimir_tabela(resultados_tempos, criterio_nomes):
+    """Exibe a tabela de resultados finais (tempos em segundos)."""
+    print("\nTABELA RESUMO DE TEMPOS DE EXECUÇÃO (em segundos):")
+    # Formata o cabeçalho
+    header = "{:<15}".format("Algoritmo") + "".join(["{:>16}".format(nome) for nome in criterio_nomes])
+    print(header)
+    print("-" * (15 + 16 * len(criterio_nomes)))
+
+    # Formata as linhas de dados
+    for alg, tempos in resultados_tempos.items():
+        line = "{:<15}".format(alg)
+        for nome_crit in criterio_nomes:
+            tempo = tempos.get(nome_crit, 'N/A')
+            line += "{:>16}".format(f"{tempo:.6f}" if tempo != 'N/A' else 'N/A')
+        print(line)
+
+# --- BENCHMARK DO CACHE DE CHAVES (decorate-sort-undecorate) ---
+# Versões anteriores ao cache (ordenacao_referencia.py), para medir o "antes"
+VERSOES_SEM_CACHE = {
+    "Bubble Sort": referencia.bubble_sort,
+    "Quick Sort": referencia.quick_sort,
+    "Merge Sort": referencia.merge_sort,
+    "Heap Sort": referencia.heap_sort,
+}
+
+def medir_chamadas_de_chave(algoritmo, dados_originais, chave, reverso):
+    """Conta as chamadas de key de um algoritmo e mede seu tempo (em execuções separadas).
+
+    Retorna (chamadas, tempo).
+    """
+    chamadas = 0
+
+    def chave_contada(x):
+        nonlocal chamadas
+        chamadas += 1
+        return chave(x)
+
+    algoritmo(list(dados_originais), key=chave_contada, reverse=reverso)
+
+    dados_para_ordenar = list(dados_originais)
+    inicio = time.perf_counter()
+    algoritmo(dados_para_ordenar, key=chave, reverse=reverso)
+    tempo = time.perf_counter() - inicio
+    return chamadas, tempo
+
+def executar_benchmark_chaves(dataset_original, algoritmos_sel=None, criterios_sel=None):
+    """Chamadas de key e tempo de cada algoritmo com cache vs. a sua versão anterior (sem cache).
+
+    Só entram os algoritmos que existiam antes do cache (VERSOES_SEM_CACHE).
+    """
+    if algoritmos_sel is None:
+        algoritmos_sel = algoritmos
+    if criterios_sel is None:
+        criterios_sel = criterios
+
+    print("\nCHAMADAS DE KEY E TEMPO: com cache vs. versão anterior (sem cache)")
+    print("{:<15}{:<22}{:>12}{:>12}{:>14}{:>14}".format(
+        "Algoritmo", "Critério", "Keys c/", "Keys s/", "Tempo c/ (s)", "Tempo s/ (s)"))
+    print("-" * 89)
+    for nome_alg, alg_func in algoritmos_sel.items():
+        anterior = VERSOES_SEM_CACHE.get(nome_alg)
+        if anterior is None:
+            continue
+        for nome_crit, (key, rev) in criterios_sel.items():
+            chamadas, tempo = medir_chamadas_de_chave(alg_func, dataset_original, key, rev)
+            try:
+                chamadas_antes, tempo_antes = medir_chamadas_de_chave(anterior, dataset_original, key, rev)
+                colunas_antes = [chamadas_antes, f"{tempo_antes:.6f}"]
+            except RecursionError: # Quick Sort anterior com muitas chaves iguais
+                colunas_antes = ["Recursion", "-"]
+            print("{:<15}{:<22}{:>12}{:>12}{:>14.6f}{:>14}".format(
+                nome_alg, nome_crit, chamadas, colunas_antes[0], tempo, colunas_antes[1]))
+
+# --- BENCHMARK DE ENTRADAS ADVERSÁRIAS (Quick Sort clássico vs. introsort) ---
+DISTRIBUICOES_ADVERSARIAS = ("aleatória", "ordenada", "invertida", "poucos únicos", "órgão de tubo")
+N_MAX_QUICK_SORT_CLASSICO = 10000 # Acima disso o Quick Sort clássico pode levar O(n^2)
+
+def gerar_entrada_adversaria(n, distribuicao):
+    """Gera (produtos, key) no formato pedido. 'poucos únicos' ordena por categoria (5 valores)."""
+    produtos = gerar_produtos(n)
+    key = lambda p: p.preco
+    if distribuicao == "ordenada":
+        produtos.sort(key=key)
+    elif distribuicao == "invertida":
+        produtos.sort(key=key, reverse=True)
+    elif distribuicao == "poucos únicos":
+        key = lambda p: p.categoria
+    elif distribuicao == "órgão de tubo":
+        produtos.sort(key=key)
+        produtos = produtos[0::2] + produtos[1::2][::-1]
+    return produtos, key
+
+def executar_benchmark_adversario(tamanhos, distribuicoes=DISTRIBUICOES_ADVERSARIAS):
+    """Mede o Quick Sort clássico (referência) e quick_sort/introsort; ns/(n·log2 n) constante indica O(n log n)."""
+    print("\nENTRADAS ADVERSÁRIAS: tempo (s) e ns por n·log2(n)")
+    print("{:<16}{:>10}{:>14}{:>12}{:>14}{:>12}".format(
+        "Distribuição", "n", "QS clássico", "ns/nlogn", "quick_sort", "ns/nlogn"))
+    print("-" * 78)
+    for distribuicao in distribuicoes:
+        for n in tamanhos:
+            dados, key = gerar_entrada_adversaria(n, distribuicao)
+            nlogn = n * max(math.log2(n), 1)
+            colunas = []
+            for alg in (referencia.quick_sort, quick_sort):
+                if alg is referencia.quick_sort and n > N_MAX_QUICK_SORT_CLASSICO:
+                    colunas += ["-", "-"]
+                    continue
+                try:
+                    inicio = time.perf_counter()
+                    alg(list(dados), key=key)
+                    tempo = time.perf_counter() - inicio
+                except RecursionError:
+                    colunas += ["Recursion", "-"]
+                    continue
+                colunas += [f"{tempo:.6f}", f"{tempo * 1e9 / nlogn:.1f}"]
+            print("{:<16}{:>10}{:>14}{:>12}{:>14}{:>12}".format(distribuicao, n, *colunas))
+
+# --- BENCHMARK DO MERGE SORT (corridas naturais e buffer reutilizável) ---
+def gerar_entrada_quase_ordenada(n, fracao_trocas=0.01):
+    """Produtos ordenados por preço com uma fração de trocas aleatórias."""
+    produtos = sorted(gerar_produtos(n), key=lambda p: p.preco)
+    for _ in range(int(n * fracao_trocas)):
+        i, j = random.randrange(n), random.randrange(n)
+        produtos[i], produtos[j] = produtos[j], produtos[i]
+    return produtos
+
+def executar_benchmark_merge(n, repeticoes=5):
+    """Tempo médio e pico de memória do merge_sort por distribuição, com e sem buffer reutilizado."""
+    key = lambda p: p.preco
+    entradas = {
+        "aleatória": gerar_produtos(n),
+        "quase ordenada": gerar_entrada_quase_ordenada(n),
+        "ordenada": sorted(gerar_produtos(n), key=key),
+        "invertida": sorted(gerar_produtos(n), key=key, reverse=True),
+    }
+    print(f"\nMERGE SORT BOTTOM-UP (n={n}, {repeticoes} repetições)")
+    print("{:<16}{:>14}{:>16}{:>16}{:>16}".format(
+        "Distribuição", "Tempo (s)", "Pico (KiB)", "Tempo c/ buf", "Pico c/ buf"))
+    print("-" * 78)
+    for nome, dados in entradas.items():
+        colunas = []
+        for buffer in (None, [None] * (2 * n)):
+            inicio = time.perf_counter()
+            for _ in range(repeticoes):
+                merge_sort(list(dados), key=key, buffer=buffer)
+            tempo = (time.perf_counter() - inicio) / repeticoes
+            # Pico de memória medido em uma execução à parte (tracemalloc distorce o tempo)
+            copia = list(dados)
+            tracemalloc.start()
+            merge_sort(copia, key=key, buffer=buffer)
+            _, pico = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            colunas += [f"{tempo:.6f}", f"{pico / 1024:.1f}"]
+        print("{:<16}{:>14}{:>16}{:>16}{:>16}".format(nome, *colunas))
+
+# --- BENCHMARK DE MEMÓRIA (Produto vs. ProdutoCompacto) ---
+def medir_memoria_produtos(n, classe):
+    """Bytes retidos por gerar_produtos(n, classe), medidos com tracemalloc."""
+    gc.collect()
+    tracemalloc.start()
+    produtos = gerar_produtos(n, classe)
+    retido, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return produtos, retido
+
+def executar_benchmark_memoria(n):
+    """Compara a memória por registro das duas representações e confere os critérios."""
+    print(f"\nMEMÓRIA POR REGISTRO (n={n})")
+    print("{:<18}{:>14}{:>14}".format("Classe", "Total (MiB)", "Bytes/reg."))
+    print("-" * 46)
+    estado = random.getstate()
+    amostras = {}
+    for classe in (Produto, ProdutoCompacto):
+        random.setstate(estado) # Mesmos dados nas duas representações
+        produtos, retido = medir_memoria_produtos(n, classe)
+        amostras[classe.__name__] = produtos[:1000]
+        print("{:<18}{:>14.1f}{:>14.1f}".format(classe.__name__, retido / 2**20, retido / max(n, 1)))
+        del produtos
+
+    # Os mesmos lambdas de `criterios` produzem a mesma ordem nas duas formas
     for nome_crit, (key, rev) in criterios.items():
-        tempo = medir_tempo_e_verificar(alg_func, dataset_original, key, rev)
-        
-        if tempo is not None:
-            resultados_tempos[nome_alg][nome_crit] = tempo
-            # Imprime o resultado formatado
-            print(f"  > {nome_crit:<20}: {tempo:.6f} segundos")
-
-print("\n--- TESTE CONCLUÍDO ---")
-
-# Exibição da Tabela de Resultados Finais
-print("\nTABELA RESUMO DE TEMPOS DE EXECUÇÃO (em segundos):")
-# Obtém a lista de nomes dos critérios para o cabeçalho
-criterio_nomes = list(criterios.keys())
-# Formata o cabeçalho
-header = "{:<15}".format("Algoritmo") + "".join(["{:>16}".format(nome) for nome in criterio_nomes])
-print(header)
-print("-" * (15 + 16 * len(criterio_nomes)))
-
-# Formata as linhas de dados
-for alg, tempos in resultados_tempos.items():
-    line = "{:<15}".format(alg)
-    for nome_crit in criterio_nomes:
-        tempo = tempos.get(nome_crit, 'N/A')
-        line += "{:>16}".format(f"{tempo:.6f}" if tempo != 'N/A' else 'N/A')
-    print(line)
+        ordens = [[p.nome for p in sorted(amostra, key=key, reverse=rev)] for amostra in amostras.values()]
+        if ordens[0] != ordens[1]:
+            raise AssertionError(f"ProdutoCompacto divergiu de Produto em {nome_crit}.")
+
+# --- BENCHMARK DE SELEÇÃO PARCIAL ---
+def executar_benchmark_topk(dataset_original, ks, criterios_sel=None):
+    """top_k e nth_element vs. ordenação completa (merge_sort) seguida de fatia."""
+    if criterios_sel is None:
+        criterios_sel = criterios
+    n = len(dataset_original)
+    print(f"\nSELEÇÃO PARCIAL (n={n}): tempos em segundos")
+    print("{:<22}{:>8}{:>14}{:>14}{:>14}{:>12}".format(
+        "Critério", "k", "Sort+fatia", "top_k", "nth_element", "Speedup"))
+    print("-" * 84)
+    for nome_crit, (key, rev) in criterios_sel.items():
+        inicio = time.perf_counter()
+        ordenada = merge_sort(list(dataset_original), key=key, reverse=rev)
+        tempo_sort = time.perf_counter() - inicio
+        for k in ks:
+            inicio = time.perf_counter()
+            melhores = top_k(dataset_original, k, key=key, reverse=rev)
+            tempo_topk = time.perf_counter() - inicio
+            if [key(p) for p in melhores] != [key(p) for p in ordenada[:k]]:
+                raise AssertionError(f"top_k divergiu da ordenação em {nome_crit} (k={k}).")
+
+            dados = list(dataset_original)
+            inicio = time.perf_counter()
+            alvo = nth_element(dados, min(k, n) - 1, key=key, reverse=rev)
+            tempo_nth = time.perf_counter() - inicio
+            if key(alvo) != key(ordenada[min(k, n) - 1]):
+                raise AssertionError(f"nth_element divergiu da ordenação em {nome_crit} (k={k}).")
+            print("{:<22}{:>8}{:>14.6f}{:>14.6f}{:>14.6f}{:>12.1f}".format(
+                nome_crit, k, tempo_sort, tempo_topk, tempo_nth, tempo_sort / tempo_topk))
+
+# --- LINHA DE COMANDO ---
+def selecionar(tabela, nomes, rotulo, parser):
+    """Filtra uma tabela (algoritmos/critérios) pelos nomes pedidos (sem diferenciar maiúsculas)."""
+    if not nomes:
+        return tabela
+    por_nome = {nome.casefold(): nome for nome in tabela}
+    selecionados = {}
+    for nome in nomes:
+        chave = por_nome.get(nome.casefold())
+        if chave is None:
+            parser.error(f"{rotulo} desconhecido: {nome!r}. Opções: {', '.join(tabela)}")
+        selecionados[chave] = tabela[chave]
+    return selecionados
+
+def _adicionar_opcoes_dataset(sub_parser):
+    sub_parser.add_argument("-n", type=int, default=N_PRODUTOS, help=f"Número de produtos (padrão: {N_PRODUTOS}).")
+    sub_parser.add_argument("--seed", type=int, default=None, help="Semente do gerador aleatório.")
+    sub_parser.add_argument("--algoritmos", nargs="+", metavar="NOME",
+                            help=f"Algoritmos a testar. Opções: {', '.join(algoritmos)}.")
+    sub_parser.add_argument("--criterios", nargs="+", metavar="NOME",
+                            help=f"Critérios a testar. Opções: {', '.join(criterios)}.")
+
+def _criar_parser():
+    parser = argparse.ArgumentParser(description="Algoritmos de ordenação sobre a classe Produto.")
+    sub = parser.add_subparsers(dest="comando")
+    bench = sub.add_parser("bench", help="Executa o benchmark de tempos (padrão).")
+    _adicionar_opcoes_dataset(bench)
+    chaves = sub.add_parser("chaves", help="Conta chamadas de key (cache decorate-sort-undecorate).")
+    _adicionar_opcoes_dataset(chaves)
+    adversario = sub.add_parser("adversario", help="Quick Sort clássico vs. quick_sort (introsort) em entradas adversárias.")
+    adversario.add_argument("--tamanhos", nargs="+", type=int, default=[1000, 10000, 100000],
+                            help="Tamanhos de entrada (padrão: 1000 10000 100000).")
+    adversario.add_argument("--seed", type=int, default=None, help="Semente do gerador aleatório.")
+    topk = sub.add_parser("topk", help="top_k / nth_element vs. ordenação completa.")
+    _adicionar_opcoes_dataset(topk)
+    topk.add_argument("-k", nargs="+", type=int, default=[10, 50, 100, 1000],
+                      help="Valores de k (padrão: 10 50 100 1000).")
+    memoria = sub.add_parser("memoria", help="Memória por registro: Produto vs. ProdutoCompacto.")
+    memoria.add_argument("-n", type=int, default=1000000, help="Número de produtos (padrão: 1000000).")
+    memoria.add_argument("--seed", type=int, default=None, help="Semente do gerador aleatório.")
+    merge = sub.add_parser("merge", help="Merge Sort: corridas naturais e reutilização de buffer.")
+    merge.add_argument("-n", type=int, default=100000, help="Número de produtos (padrão: 100000).")
+    merge.add_argument("--seed", type=int, default=None, help="Semente do gerador aleatório.")
+    return parser
+
+def main(argv=None):
+    parser = _criar_parser()
+    if argv is None:
+        argv = sys.argv[1:]
+    if not argv:
+        argv = ["bench"]
+    args = parser.parse_args(argv)
+
+    if args.seed is not None:
+        random.seed(args.seed)
+    if args.comando == "adversario":
+        executar_benchmark_adversario(args.tamanhos)
+        return
+    if args.comando == "memoria":
+        executar_benchmark_memoria(args.n)
+        return
+    if args.comando == "merge":
+        executar_benchmark_merge(args.n)
+        return
+
+    algoritmos_sel = selecionar(algoritmos, args.algoritmos, "Algoritmo", parser)
+    criterios_sel = selecionar(criterios, args.criterios, "Critério", parser)
+    print(f"Configuração: Gerando {args.n} produtos.")
+    dataset_original = gerar_produtos(args.n)
+
+    if args.comando == "bench":
+        executar_benchmark(dataset_original, algoritmos_sel, criterios_sel)
+    elif args.comando == "chaves":
+        executar_benchmark_chaves(dataset_original, algoritmos_sel, criterios_sel)
+    elif args.comando == "topk":
+        executar_benchmark_topk(dataset_original, args.k, criterios_sel)
+
+if __name__ == "__main__":
+    main()
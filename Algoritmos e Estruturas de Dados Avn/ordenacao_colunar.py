@@ -0,0 +1,213 @@
+import argparse
+import datetime
+import random
+import time
+
+import numpy as np
+
+from ordenacao import Produto, algoritmos, criterios, de_microssegundos, gerar_produtos, para_microssegundos
+
+# Ordenação colunar (struct-of-arrays) para grandes catálogos de Produto.
+# Cada atributo vira um array NumPy e a ordenação é um argsort vetorizado
+# (estável), sem nenhuma chamada de key em Python por elemento.
+
+# Datas são armazenadas como int64: microssegundos desde 1970-01-01 (ordenacao.para_microssegundos)
+
+COLUNAS = ("nome", "preco", "avaliacao", "data_adicao", "categoria")
+
+# Critérios de ordenacao.criterios expressos como (coluna, reverso)
+CRITERIOS_COLUNAS = {
+    "Preço (Asc)":         ("preco", False),
+    "Preço (Desc)":        ("preco", True),
+    "Avaliação (Asc)":     ("avaliacao", False),
+    "Avaliação (Desc)":    ("avaliacao", True),
+    "Data (Mais Recente)": ("data_adicao", True),
+    "Data (Mais Antigo)":  ("data_adicao", False),
+    "Categoria (Alfa)":    ("categoria", False),
+}
+
+class ProdutoTable:
+    """Catálogo de produtos em colunas NumPy.
+
+    `categoria` é codificada por dicionário: `categoria_codigos[i]` indexa
+    `categorias`, que é mantida em ordem alfabética e sem repetições (ordenar
+    os códigos equivale a ordenar as strings). Um dicionário fora de ordem ou
+    com repetições é recodificado no construtor.
+    """
+
+    def __init__(self, nome, preco, avaliacao, data_adicao, categoria_codigos, categorias):
+        self.nome = np.asarray(nome, dtype=str)
+        self.preco = np.asarray(preco, dtype=np.float64)
+        self.avaliacao = np.asarray(avaliacao, dtype=np.float64)
+        self.data_adicao = np.asarray(data_adicao, dtype=np.int64)
+        self.categoria_codigos = np.asarray(categoria_codigos, dtype=np.int32)
+        self.categorias = np.asarray(categorias, dtype=str)
+
+        n = len(self.preco)
+        for coluna in (self.nome, self.avaliacao, self.data_adicao, self.categoria_codigos):
+            if len(coluna) != n:
+                raise ValueError("Todas as colunas devem ter o mesmo tamanho.")
+        if n and (self.categoria_codigos.min() < 0 or self.categoria_codigos.max() >= len(self.categorias)):
+            raise ValueError("categoria_codigos deve indexar `categorias`.")
+        if np.any(self.categorias[:-1] >= self.categorias[1:]):
+            # Fora de ordem ou com repetições: recodifica a partir das strings
+            categorias, codigos = np.unique(self.categorias[self.categoria_codigos], return_inverse=True)
+            self.categorias = categorias
+            self.categoria_codigos = codigos.astype(np.int32)
+
+    @classmethod
+    def from_produtos(cls, produtos):
+        """Converte uma lista de Produto para o formato colunar."""
+        categorias, codigos = np.unique([p.categoria for p in produtos], return_inverse=True)
+        return cls(
+            [p.nome for p in produtos],
+            [p.preco for p in produtos],
+            [p.avaliacao for p in produtos],
+            [para_microssegundos(p.data_adicao) for p in produtos],
+            codigos,
+            categorias,
+        )
+
+    def __len__(self):
+        return len(self.preco)
+
+    def __getitem__(self, i):
+        """Materializa o i-ésimo registro como um Produto."""
+        return Produto(
+            str(self.nome[i]),
+            float(self.preco[i]),
+            float(self.avaliacao[i]),
+            de_microssegundos(self.data_adicao[i]),
+            str(self.categorias[self.categoria_codigos[i]]),
+        )
+
+    def __repr__(self):
+        return f"ProdutoTable({len(self)} produtos, {len(self.categorias)} categorias)"
+
+    def produtos(self, ordem=None):
+        """Materializa todos os registros (na ordem da permutação `ordem`, se dada)."""
+        indices = range(len(self)) if ordem is None else ordem
+        return [self[i] for i in indices]
+
+    def _coluna_ordenavel(self, coluna, reverso):
+        """Array numérico cuja ordem ascendente é a ordem pedida para a coluna."""
+        if coluna == "categoria":
+            valores = self.categoria_codigos
+        elif coluna == "nome":
+            # Strings não podem ser negadas: usa os códigos do dicionário ordenado
+            _, valores = np.unique(self.nome, return_inverse=True)
+        elif coluna in COLUNAS:
+            valores = getattr(self, coluna)
+        else:
+            raise ValueError(f"Coluna desconhecida: {coluna!r}. Opções: {', '.join(COLUNAS)}.")
+        return -valores if reverso else valores
+
+    def sort_by(self, criterio, reverse=None, materializar=False):
+        """Ordena (de forma estável) e retorna a permutação ou uma VisaoOrdenada.
+
+        `criterio` pode ser um nome de `criterios` ("Preço (Asc)"), uma coluna
+        ("preco") ou uma lista de colunas / pares (coluna, reverso) para
+        ordenação por várias chaves (a primeira é a principal). `reverse`
+        substitui o sentido de um critério único (None mantém o do critério) e,
+        para várias chaves, reverse=True inverte o sentido de todas.
+        """
+        if isinstance(criterio, str):
+            coluna, reverso = CRITERIOS_COLUNAS.get(criterio, (criterio, False))
+            chaves = [(coluna, reverso if reverse is None else reverse)]
+        else:
+            chaves = [(c, False) if isinstance(c, str) else tuple(c) for c in criterio]
+            if reverse:
+                chaves = [(coluna, not reverso) for coluna, reverso in chaves]
+
+        if len(chaves) == 1:
+            coluna, reverso = chaves[0]
+            ordem = np.argsort(self._coluna_ordenavel(coluna, reverso), kind="stable")
+        else:
+            # lexsort usa a ÚLTIMA chave como principal
+            ordem = np.lexsort([self._coluna_ordenavel(c, r) for c, r in reversed(chaves)])
+
+        if materializar:
+            return VisaoOrdenada(self, ordem)
+        return ordem
+
+class VisaoOrdenada:
+    """Visão preguiçosa de uma ProdutoTable em uma ordem: cria Produtos só quando acessados."""
+
+    def __init__(self, tabela, ordem):
+        self.tabela = tabela
+        self.ordem = ordem
+
+    def __len__(self):
+        return len(self.ordem)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return VisaoOrdenada(self.tabela, self.ordem[i])
+        return self.tabela[self.ordem[i]]
+
+    def __iter__(self):
+        for i in self.ordem:
+            yield self.tabela[i]
+
+    def __repr__(self):
+        return f"VisaoOrdenada({len(self)} de {len(self.tabela)} produtos)"
+
+# --- GERAÇÃO VETORIZADA ---
+def gerar_tabela_produtos(n, seed=None):
+    """Versão vetorizada de gerar_produtos: preenche a ProdutoTable diretamente."""
+    rng = np.random.default_rng(seed)
+    agora = para_microssegundos(datetime.datetime.now())
+    dias = rng.integers(0, 366, size=n)
+    segundos = rng.integers(0, 86401, size=n)
+    return ProdutoTable(
+        np.char.add("Produto", np.arange(n).astype(str)),
+        np.round(rng.uniform(10, 1000, size=n), 2),
+        np.round(rng.uniform(0, 5, size=n), 2),
+        agora - (dias * 86400 + segundos) * 1_000_000,
+        rng.integers(0, 5, size=n),
+        ["Categoria" + str(i) for i in range(1, 6)],
+    )
+
+# --- BENCHMARK ---
+N_MAX_BUBBLE_SORT = 5000 # Bubble Sort é O(n^2): ignorado acima deste tamanho
+
+def executar_benchmark_colunar(n, seed=None):
+    """Compara ProdutoTable.sort_by com os algoritmos de ordenacao.py, critério a critério."""
+    if seed is not None:
+        random.seed(seed)
+    produtos = gerar_produtos(n)
+
+    inicio = time.perf_counter()
+    tabela = ProdutoTable.from_produtos(produtos)
+    print(f"Conversão para ProdutoTable: {time.perf_counter() - inicio:.6f} s (n={n})")
+    inicio = time.perf_counter()
+    gerar_tabela_produtos(n, seed)
+    print(f"Geração vetorizada:          {time.perf_counter() - inicio:.6f} s")
+
+    nomes = ["NumPy argsort"] + [nome for nome in algoritmos if nome != "Bubble Sort" or n <= N_MAX_BUBBLE_SORT]
+    print("\nTEMPOS POR CRITÉRIO (em segundos):")
+    print("{:<22}".format("Critério") + "".join("{:>16}".format(nome) for nome in nomes))
+    print("-" * (22 + 16 * len(nomes)))
+    for nome_crit, (key, rev) in criterios.items():
+        inicio = time.perf_counter()
+        ordem = tabela.sort_by(nome_crit)
+        colunas = [f"{time.perf_counter() - inicio:.6f}"]
+
+        # Verificação: mesma sequência de chaves que sorted()
+        esperado = [key(p) for p in sorted(produtos, key=key, reverse=rev)]
+        if [key(produtos[i]) for i in ordem] != esperado:
+            raise AssertionError(f"sort_by({nome_crit!r}) divergiu de sorted().")
+
+        for nome_alg in nomes[1:]:
+            dados = list(produtos)
+            inicio = time.perf_counter()
+            algoritmos[nome_alg](dados, key=key, reverse=rev)
+            colunas.append(f"{time.perf_counter() - inicio:.6f}")
+        print("{:<22}".format(nome_crit) + "".join("{:>16}".format(c) for c in colunas))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ordenação colunar (NumPy) vs. algoritmos de ordenacao.py.")
+    parser.add_argument("-n", type=int, default=100000, help="Número de produtos (padrão: 100000).")
+    parser.add_argument("--seed", type=int, default=None, help="Semente do gerador aleatório.")
+    args = parser.parse_args()
+    executar_benchmark_colunar(args.n, args.seed)
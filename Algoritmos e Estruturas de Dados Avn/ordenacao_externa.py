@@ -0,0 +1,238 @@
+import argparse
+import csv
+import datetime
+import heapq
+import io
+import os
+import random
+import struct
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from ordenacao import Produto, criterios, de_microssegundos, merge_sort, para_microssegundos
+
+# Ordenação externa (out-of-core) para conjuntos maiores que a memória:
+# 1. lê os registros em fluxo (CSV ou formato binário compacto);
+# 2. acumula um lote até o orçamento de memória, ordena e grava uma "corrida"
+#    (run) ordenada em um arquivo temporário;
+# 3. mescla as corridas com heapq.merge (k-way, estável), lendo e gravando em
+#    fluxo: a memória usada é ~ um registro por corrida + buffers de E/S.
+
+MEMORIA_PADRAO = 64 * 1024 * 1024 # Orçamento padrão por lote: 64 MiB
+MAX_ARQUIVOS_MESCLA = 64 # Corridas abertas ao mesmo tempo; acima disso mescla em várias passadas
+TAMANHO_BUFFER = 1024 * 1024 # Buffer de E/S por arquivo
+
+# --- FORMATOS DE REGISTRO ---
+CAMPOS_CSV = ["nome", "preco", "avaliacao", "data_adicao", "categoria"]
+
+# Binário: preco (f64), avaliacao (f64), data em µs desde 1970 (i64),
+# tamanho da categoria (u8), tamanho do nome (u16), seguidos dos bytes UTF-8.
+CABECALHO_BIN = struct.Struct("<ddqBH")
+
+def escrever_csv(produtos, arquivo):
+    escritor = csv.writer(arquivo)
+    escritor.writerow(CAMPOS_CSV)
+    for p in produtos:
+        escritor.writerow([p.nome, repr(p.preco), repr(p.avaliacao), p.data_adicao.isoformat(), p.categoria])
+
+def ler_csv(arquivo):
+    leitor = csv.reader(arquivo)
+    next(leitor, None) # Cabeçalho
+    for nome, preco, avaliacao, data, categoria in leitor:
+        yield Produto(nome, float(preco), float(avaliacao), datetime.datetime.fromisoformat(data), categoria)
+
+def escrever_bin(produtos, arquivo):
+    empacotar = CABECALHO_BIN.pack
+    for p in produtos:
+        nome = p.nome.encode()
+        categoria = p.categoria.encode()
+        arquivo.write(empacotar(p.preco, p.avaliacao, para_microssegundos(p.data_adicao),
+                                len(categoria), len(nome)))
+        arquivo.write(categoria)
+        arquivo.write(nome)
+
+def ler_bin(arquivo):
+    tamanho = CABECALHO_BIN.size
+    desempacotar = CABECALHO_BIN.unpack
+    while True:
+        cabecalho = arquivo.read(tamanho)
+        if not cabecalho:
+            return
+        if len(cabecalho) < tamanho:
+            raise ValueError("Registro binário truncado.")
+        preco, avaliacao, micros, n_cat, n_nome = desempacotar(cabecalho)
+        categoria = arquivo.read(n_cat).decode()
+        nome = arquivo.read(n_nome).decode()
+        yield Produto(nome, preco, avaliacao, de_microssegundos(micros), categoria)
+
+FORMATOS = {
+    # formato: (modo de abertura binário?, escritor, leitor)
+    "csv": (False, escrever_csv, ler_csv),
+    "bin": (True, escrever_bin, ler_bin),
+}
+
+def _abrir(caminho, formato, modo, buffer):
+    binario = FORMATOS[formato][0]
+    if binario:
+        return open(caminho, modo + "b", buffering=buffer)
+    return open(caminho, modo, newline="", encoding="utf-8", buffering=buffer)
+
+def ler_arquivo(caminho, formato="csv", buffer=TAMANHO_BUFFER):
+    """Itera sobre os produtos de um arquivo, sem carregá-lo inteiro."""
+    with _abrir(caminho, formato, "r", buffer) as arquivo:
+        yield from FORMATOS[formato][2](arquivo)
+
+def escrever_arquivo(produtos, caminho, formato="csv", buffer=TAMANHO_BUFFER):
+    with _abrir(caminho, formato, "w", buffer) as arquivo:
+        FORMATOS[formato][1](produtos, arquivo)
+
+# --- ESTIMATIVA DE MEMÓRIA ---
+def _tamanho_produto(p):
+    """Bytes aproximados de um Produto na memória (objeto + __dict__ + atributos + chave)."""
+    return (sys.getsizeof(p) + sys.getsizeof(p.__dict__)
+            + sum(sys.getsizeof(v) for v in p.__dict__.values())
+            + 4 * 8) # Referências: lista do lote + chaves e buffer (2 posições) do merge_sort
+
+# --- ORDENAÇÃO EXTERNA ---
+def _novo_temporario(dir_temp, temporarios):
+    """Cria um arquivo de corrida vazio e o registra em `temporarios` antes de qualquer escrita."""
+    descritor, caminho = tempfile.mkstemp(suffix=".run", dir=dir_temp)
+    os.close(descritor)
+    temporarios.append(caminho)
+    return caminho
+
+def _gravar_corrida(lote, key, reverse, algoritmo, caminho):
+    algoritmo(lote, key=key, reverse=reverse)
+    escrever_arquivo(lote, caminho, "bin")
+    return caminho
+
+def _mesclar_corridas(caminhos, key, reverse, destino, formato, memoria_max):
+    """k-way merge em fluxo das corridas (em ordem, para manter a estabilidade)."""
+    # Os buffers de E/S (uma entrada por corrida + a saída) também cabem no orçamento
+    buffer = max(io.DEFAULT_BUFFER_SIZE, min(TAMANHO_BUFFER, memoria_max // (len(caminhos) + 1)))
+    fluxos = [ler_arquivo(c, "bin", buffer) for c in caminhos]
+    try:
+        escrever_arquivo(heapq.merge(*fluxos, key=key, reverse=reverse), destino, formato, buffer)
+    finally:
+        for fluxo in fluxos:
+            fluxo.close()
+
+def external_sort(entrada, saida, key=lambda x: x, reverse=False, memoria_max=MEMORIA_PADRAO,
+                  formato_entrada="csv", formato_saida=None, dir_temp=None, algoritmo=merge_sort):
+    """Ordena o arquivo `entrada` para `saida` usando ~memoria_max bytes de memória.
+
+    Mesma semântica de key=/reverse= das funções de ordenacao.py; o resultado é
+    estável se `algoritmo` for estável (merge_sort é). Retorna o número de
+    corridas geradas na primeira fase.
+    """
+    if formato_saida is None:
+        formato_saida = formato_entrada
+    temporarios = [] # Todos os arquivos temporários criados; o finally remove os que restarem
+    corridas = []
+    lote = []
+    limite = None
+    try:
+        # Fase 1: corridas ordenadas dentro do orçamento de memória
+        for produto in ler_arquivo(entrada, formato_entrada):
+            if limite is None:
+                limite = max(1, memoria_max // _tamanho_produto(produto))
+            lote.append(produto)
+            if len(lote) >= limite:
+                corridas.append(_gravar_corrida(lote, key, reverse, algoritmo, _novo_temporario(dir_temp, temporarios)))
+                lote = []
+        if lote or not corridas:
+            corridas.append(_gravar_corrida(lote, key, reverse, algoritmo, _novo_temporario(dir_temp, temporarios)))
+            lote = []
+        total_corridas = len(corridas)
+
+        # Fase 2: mescla em passadas de até MAX_ARQUIVOS_MESCLA corridas
+        while len(corridas) > MAX_ARQUIVOS_MESCLA:
+            novas = []
+            for i in range(0, len(corridas), MAX_ARQUIVOS_MESCLA):
+                grupo = corridas[i:i + MAX_ARQUIVOS_MESCLA]
+                caminho = _novo_temporario(dir_temp, temporarios)
+                _mesclar_corridas(grupo, key, reverse, caminho, "bin", memoria_max)
+                for c in grupo:
+                    os.remove(c)
+                novas.append(caminho)
+            corridas = novas
+        _mesclar_corridas(corridas, key, reverse, saida, formato_saida, memoria_max)
+        return total_corridas
+    finally:
+        for c in temporarios:
+            if os.path.exists(c):
+                os.remove(c)
+
+# --- BENCHMARK ---
+def iterar_produtos(n):
+    """Gera produtos em fluxo (mesmas distribuições de ordenacao.gerar_produtos)."""
+    agora = datetime.datetime.now()
+    for i in range(n):
+        yield Produto(
+            "Produto" + str(i),
+            round(random.uniform(10, 1000), 2),
+            round(random.uniform(0, 5), 2),
+            agora - datetime.timedelta(days=random.randint(0, 365), seconds=random.randint(0, 86400)),
+            "Categoria" + str(random.randint(1, 5)),
+        )
+
+def verificar_ordenado(caminho, formato, key, reverse):
+    """Confere, em fluxo, que cada registro respeita a ordem do anterior. Retorna a contagem."""
+    anterior = None
+    contagem = 0
+    for p in ler_arquivo(caminho, formato):
+        k = key(p)
+        if anterior is not None and (k > anterior if reverse else k < anterior):
+            raise AssertionError(f"Arquivo fora de ordem no registro {contagem}.")
+        anterior = k
+        contagem += 1
+    return contagem
+
+def executar_benchmark_externo(n, memoria_max, formato, nome_crit, seed=None, dir_temp=None):
+    """Gera n produtos em disco e os ordena com um orçamento de memória menor que o dataset."""
+    if seed is not None:
+        random.seed(seed)
+    key, rev = criterios[nome_crit]
+    with tempfile.TemporaryDirectory(dir=dir_temp) as pasta:
+        entrada = os.path.join(pasta, "entrada." + formato)
+        saida = os.path.join(pasta, "saida." + formato)
+        escrever_arquivo(iterar_produtos(n), entrada, formato)
+        amostra = next(ler_arquivo(entrada, formato))
+        tamanho_dataset = n * _tamanho_produto(amostra)
+
+        print(f"\nORDENAÇÃO EXTERNA (n={n}, formato={formato}, critério={nome_crit})")
+        print(f"Arquivo de entrada:        {os.path.getsize(entrada) / 2**20:.1f} MiB")
+        print(f"Dataset estimado em RAM:   {tamanho_dataset / 2**20:.1f} MiB")
+        print(f"Orçamento de memória:      {memoria_max / 2**20:.1f} MiB "
+              f"({tamanho_dataset / memoria_max:.1f}x menor que o dataset)")
+
+        tracemalloc.start()
+        inicio = time.perf_counter()
+        corridas = external_sort(entrada, saida, key=key, reverse=rev, memoria_max=memoria_max,
+                                 formato_entrada=formato, dir_temp=pasta)
+        tempo = time.perf_counter() - inicio
+        _, pico = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        contagem = verificar_ordenado(saida, formato, key, rev)
+        if contagem != n:
+            raise AssertionError(f"Saída com {contagem} registros, esperado {n}.")
+        print(f"Corridas geradas:          {corridas}")
+        print(f"Tempo:                     {tempo:.3f} s")
+        print(f"Pico de memória (Python):  {pico / 2**20:.1f} MiB")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ordenação externa (out-of-core) de produtos.")
+    parser.add_argument("-n", type=int, default=200000, help="Número de produtos (padrão: 200000).")
+    parser.add_argument("--memoria-mb", type=float, default=16, help="Orçamento de memória por lote em MiB (padrão: 16).")
+    parser.add_argument("--formato", choices=sorted(FORMATOS), default="bin", help="Formato dos arquivos (padrão: bin).")
+    parser.add_argument("--criterio", default="Preço (Asc)", help=f"Opções: {', '.join(criterios)}.")
+    parser.add_argument("--seed", type=int, default=None, help="Semente do gerador aleatório.")
+    parser.add_argument("--dir-temp", default=None, help="Diretório para os arquivos temporários.")
+    args = parser.parse_args()
+    if args.criterio not in criterios:
+        parser.error(f"Critério desconhecido: {args.criterio!r}.")
+    executar_benchmark_externo(args.n, int(args.memoria_mb * 2**20), args.formato, args.criterio,
+                               args.seed, args.dir_temp)
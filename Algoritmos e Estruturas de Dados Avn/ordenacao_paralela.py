@@ -0,0 +1,127 @@
+import argparse
+import heapq
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from ordenacao import algoritmos, criterios, gerar_produtos, merge_sort
+
+# Ordenação paralela (multi-core) para entradas grandes:
+# 1. as chaves são calculadas uma vez no processo principal;
+# 2. a lista de chaves é dividida em blocos contíguos, ordenados em um
+#    ProcessPoolExecutor (só chaves e o deslocamento do bloco são enviados,
+#    nunca os objetos Produto);
+# 3. os workers devolvem só os índices globais, em ordem; o processo principal
+#    os mescla com um heap (k-way merge), consultando a lista de chaves que já tem.
+
+LIMIAR_PARALELO = 100000 # Abaixo disso o custo do pool supera o ganho: caminho serial
+
+def _ordenar_bloco(chaves, deslocamento, reverse, algoritmo):
+    """Executado no worker: ordena um bloco de chaves e devolve os índices globais em ordem."""
+    indices = list(range(len(chaves)))
+    if algoritmo is None:
+        indices.sort(key=chaves.__getitem__, reverse=reverse)
+    else:
+        algoritmo(indices, key=chaves.__getitem__, reverse=reverse)
+    return [deslocamento + i for i in indices]
+
+def _ordenar_serial(arr, key, reverse, algoritmo):
+    if algoritmo is None:
+        arr.sort(key=key, reverse=reverse)
+        return arr
+    return algoritmo(arr, key=key, reverse=reverse)
+
+def parallel_sort(arr, key=lambda x: x, reverse=False, workers=None, algoritmo=merge_sort,
+                  executor=None, limiar=LIMIAR_PARALELO):
+    """Ordena `arr` (no lugar) usando vários processos.
+
+    - workers: número de processos (padrão: os.cpu_count()).
+    - algoritmo: função de ordenacao.py usada em cada bloco e no caminho serial
+      (padrão: merge_sort; None = list.sort). Deve ser uma função de módulo
+      (enviada por pickle aos workers).
+    - executor: ProcessPoolExecutor já criado, para reutilizar o pool entre chamadas.
+    - limiar: abaixo deste tamanho (ou com 1 worker) usa o caminho serial.
+
+    O resultado é estável se o algoritmo dos blocos for estável (merge_sort e
+    list.sort são). A mesclagem final roda em Python (~1 µs por item), então o
+    ganho aparece quando ordenar os blocos custa mais que isso por item: com
+    list.sort (em C) o caminho serial costuma ser mais rápido.
+    """
+    n = len(arr)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if n < limiar or workers <= 1:
+        return _ordenar_serial(arr, key, reverse, algoritmo)
+
+    chaves = [key(x) for x in arr]
+    tamanho_bloco = -(-n // workers) # Divisão com arredondamento para cima
+    proprio = executor is None
+    if proprio:
+        executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+        futuros = [
+            executor.submit(_ordenar_bloco, chaves[ini:ini + tamanho_bloco], ini, reverse, algoritmo)
+            for ini in range(0, n, tamanho_bloco)
+        ]
+        blocos = [f.result() for f in futuros]
+    finally:
+        if proprio:
+            executor.shutdown()
+
+    # k-way merge com heap: heapq.merge é estável entre blocos (o bloco anterior vence empates)
+    mesclado = heapq.merge(*blocos, key=chaves.__getitem__, reverse=reverse)
+    arr[:] = [arr[i] for i in mesclado]
+    return arr
+
+# --- BENCHMARK DE ESCALABILIDADE ---
+def executar_benchmark_paralelo(n, workers_lista, nome_crit="Preço (Asc)", nome_alg="Merge Sort", seed=None):
+    """Tempo e speedup do parallel_sort por número de workers (1 worker = caminho serial)."""
+    if seed is not None:
+        random.seed(seed)
+    key, rev = criterios[nome_crit]
+    algoritmo = algoritmos[nome_alg] if nome_alg != "list.sort" else None
+    produtos = gerar_produtos(n)
+    esperado = [key(p) for p in sorted(produtos, key=key, reverse=rev)]
+
+    print(f"\nPARALLEL SORT (n={n}, critério={nome_crit}, blocos={nome_alg}, CPUs={os.cpu_count()})")
+    print("{:>8}{:>14}{:>12}".format("Workers", "Tempo (s)", "Speedup"))
+    print("-" * 34)
+    base = None
+    for workers in workers_lista:
+        # O pool é criado fora da medição: o benchmark mede a ordenação, não o fork
+        with ProcessPoolExecutor(max_workers=max(workers, 1)) as executor:
+            dados = list(produtos)
+            inicio = time.perf_counter()
+            parallel_sort(dados, key=key, reverse=rev, workers=workers,
+                          algoritmo=algoritmo, executor=executor, limiar=0)
+            tempo = time.perf_counter() - inicio
+        if [key(p) for p in dados] != esperado:
+            raise AssertionError(f"parallel_sort com {workers} workers divergiu de sorted().")
+        if base is None:
+            base = tempo
+        print("{:>8}{:>14.6f}{:>12.2f}".format(workers, tempo, base / tempo))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ordenação paralela com ProcessPoolExecutor.")
+    parser.add_argument("-n", type=int, default=1000000, help="Número de produtos (padrão: 1000000).")
+    parser.add_argument("--workers", nargs="+", type=int, default=None,
+                        help="Números de workers a testar (padrão: 1 2 4 ... até os.cpu_count()).")
+    parser.add_argument("--criterio", default="Preço (Asc)", help=f"Opções: {', '.join(criterios)}.")
+    parser.add_argument("--algoritmo", default="Merge Sort",
+                        help=f"Algoritmo dos blocos (padrão: Merge Sort). Opções: list.sort, {', '.join(algoritmos)}.")
+    parser.add_argument("--seed", type=int, default=None, help="Semente do gerador aleatório.")
+    args = parser.parse_args()
+
+    workers_lista = args.workers
+    if workers_lista is None:
+        workers_lista, w = [], 1
+        while w < (os.cpu_count() or 1):
+            workers_lista.append(w)
+            w *= 2
+        workers_lista.append(os.cpu_count() or 1)
+    if args.criterio not in criterios:
+        parser.error(f"Critério desconhecido: {args.criterio!r}.")
+    if args.algoritmo != "list.sort" and args.algoritmo not in algoritmos:
+        parser.error(f"Algoritmo desconhecido: {args.algoritmo!r}.")
+    executar_benchmark_paralelo(args.n, workers_lista, args.criterio, args.algoritmo, args.seed)
@@ -0,0 +1,184 @@
+# Versões originais (anteriores ao cache de chaves) de bubble_sort, quick_sort,
+# merge_sort e heap_sort, mantidas sem alterações como referência: chamam
+# key() a cada comparação, e o quick_sort é o Lomuto recursivo com pivô no fim
+# (O(n^2) e RecursionError em entradas ordenadas ou com muitas chaves iguais).
+# Usadas pelos benchmarks `chaves` e `adversario` de ordenacao.py para medir o
+# "antes" diretamente; para ordenar, use as funções de ordenacao.py.
+
+def bubble_sort(arr, key=lambda x: x, reverse=False):
+    n = len(arr)
+    # Loop principal para passar por toda a lista
+    for i in range(n - 1):
+        swapped = False
+        # Loop para as comparações e trocas
+        for j in range(0, n - i - 1):
+            # Obtém os valores de comparação
+            val_j = key(arr[j])
+            val_j1 = key(arr[j + 1])
+            
+            # Condição de troca
+            should_swap = False
+            if not reverse: # Ascendente (padrão)
+                if val_j > val_j1:
+                    should_swap = True
+            else: # Descendente
+                if val_j < val_j1:
+                    should_swap = True
+            
+            if should_swap:
+                arr[j], arr[j + 1] = arr[j + 1], arr[j] # Troca
+                swapped = True
+        
+        # Se nenhuma troca ocorreu em um passo, a lista está ordenada
+        if not swapped:
+            break
+    return arr
+
+
+def quick_sort(arr, key=lambda x: x, reverse=False):
+    # Função auxiliar para particionamento (Lomuto ou Hoare)
+    def partition(items, low, high):
+        # Escolhe o pivo como o elemento mais à direita
+        pivot_val = key(items[high])
+        i = low - 1  # Índice do menor elemento
+
+        for j in range(low, high):
+            current_val = key(items[j])
+            
+            # Condição de partição
+            should_swap = False
+            if not reverse: # Ascendente
+                if current_val <= pivot_val:
+                    should_swap = True
+            else: # Descendente
+                if current_val >= pivot_val:
+                    should_swap = True
+
+            if should_swap:
+                i += 1
+                items[i], items[j] = items[j], items[i] # Troca
+
+        # Troca o pivo (items[high]) com o elemento items[i + 1]
+        items[i + 1], items[high] = items[high], items[i + 1]
+        return i + 1
+
+    # Função auxiliar recursiva
+    def _quick_sort(items, low, high):
+        if low < high:
+            # pi é o índice de partição, items[pi] está no lugar certo
+            pi = partition(items, low, high)
+
+            # Ordena recursivamente os elementos antes e depois da partição
+            _quick_sort(items, low, pi - 1)
+            _quick_sort(items, pi + 1, high)
+
+    # Execução principal
+    _quick_sort(arr, 0, len(arr) - 1)
+    return arr
+
+def merge_sort(arr, key=lambda x: x, reverse=False):
+    if len(arr) > 1:
+        mid = len(arr) // 2
+        L = arr[:mid]  # Metade esquerda
+        R = arr[mid:]  # Metade direita
+
+        # Chamada recursiva em ambas as metades
+        merge_sort(L, key=key, reverse=reverse)
+        merge_sort(R, key=key, reverse=reverse)
+
+        i = j = k = 0
+
+        # Mesclagem (Merge)
+        while i < len(L) and j < len(R):
+            val_l = key(L[i])
+            val_r = key(R[j])
+            
+            # Condição de comparação
+            is_l_smaller = False
+            if not reverse: # Ascendente
+                if val_l < val_r:
+                    is_l_smaller = True
+            else: # Descendente
+                if val_l > val_r:
+                    is_l_smaller = True
+                    
+            if is_l_smaller:
+                arr[k] = L[i]
+                i += 1
+            else:
+                arr[k] = R[j]
+                j += 1
+            k += 1
+
+        # Copia os elementos restantes de L[]
+        while i < len(L):
+            arr[k] = L[i]
+            i += 1
+            k += 1
+
+        # Copia os elementos restantes de R[]
+        while j < len(R):
+            arr[k] = R[j]
+            j += 1
+            k += 1
+            
+    return arr
+
+def heap_sort(arr, key=lambda x: x, reverse=False):
+    n = len(arr)
+
+    # 1. Função auxiliar para manter a propriedade Max-Heap (ou Min-Heap invertido)
+    def heapify(items, n, i):
+        root = i       # Inicializa a raiz
+        left = 2 * i + 1
+        right = 2 * i + 2
+        
+        # Define a condição de comparação
+        def compare(idx1, idx2):
+            val1 = key(items[idx1])
+            val2 = key(items[idx2])
+            
+            if not reverse: # Max-Heap (para ordem ascendente)
+                return val1 < val2 # Retorna True se val2 for maior (ou igual)
+            else: # Min-Heap (para ordem descendente)
+                return val1 > val2 # Retorna True se val2 for menor (ou igual)
+
+        # Encontra o maior (ou menor, se reverse=True) entre a raiz e os filhos
+        # Verifica o filho esquerdo
+        if left < n and compare(root, left):
+            root = left
+
+        # Verifica o filho direito
+        if right < n and compare(root, right):
+            root = right
+
+        # Troca se a raiz não for mais a maior (ou menor)
+        if root != i:
+            items[i], items[root] = items[root], items[i]
+            # Chama recursivamente o heapify na subárvore afetada
+            heapify(items, n, root)
+
+    # 2. Construir o heap (reorganizar o array)
+    # Começa do último nó pai e vai até a raiz
+    for i in range(n // 2 - 1, -1, -1):
+        heapify(arr, n, i)
+
+    # 3. Extrair elementos um por um
+    for i in range(n - 1, 0, -1):
+        # Troca o elemento atual (raiz do heap) com o último elemento
+        arr[i], arr[0] = arr[0], arr[i] 
+        # Chama heapify na heap reduzida (excluindo o elemento extraído)
+        heapify(arr, i, 0)
+        
+    return arr
+
+# --- Testes de Validação ---
+if __name__ == "__main__":
+    import random
+
+    print("--- TESTE 1: Mesma ordem de chaves que sorted() ---")
+    dados = [random.randint(0, 100) for _ in range(500)]
+    for algoritmo in (bubble_sort, quick_sort, merge_sort, heap_sort):
+        for reverso in (False, True):
+            assert algoritmo(list(dados), reverse=reverso) == sorted(dados, reverse=reverso), f"Teste 1 falhou: {algoritmo.__name__}"
+    print("Teste 1: Sucesso.")